@@ -7,6 +7,7 @@ import json
 
 from django.apps import apps
 from django.conf import settings
+from django.core.cache import cache
 from django.db.models import Q
 from django.http import QueryDict
 from django.test import Client, TestCase
@@ -66,6 +67,7 @@ class BaseTestCase(TestCase):  # pylint:disable=R0902,R0904
         This function will be called before the start of every test
         """
         settings.ROOT_URLCONF = "training.urls"
+        cache.clear()
         self.client = Client()
         self.faker = Faker()
 
@@ -356,3 +358,59 @@ class BaseTestCase(TestCase):  # pylint:disable=R0902,R0904
                     value
                 ) or self.get_error_message(key, value, current_value, validation_parameter)
                 self.assertFormError(form, key, error_message)
+
+
+class ReportsBaseTestCase(BaseTestCase):
+    """
+    This class helps us to follow DRY principles in Reports module testing
+    """
+
+    testcase_server_name = env("REPORTS_TESTCASE_SERVER_NAME")
+
+    def setUp(self):
+        """
+        This function will be called before the start of every test
+        """
+        super().setUp()
+        settings.ROOT_URLCONF = "reports.urls"
+
+    def create_expected_efficiency(self, user, expected_efficiency=8, **kwargs):
+        """
+        This function is responsible for creating the expected efficiency of a user
+        """
+        return baker.make(
+            "hubble.ExpectedUserEfficiency",
+            user=user,
+            updated_by=user,
+            expected_efficiency=expected_efficiency,
+            effective_from=kwargs.pop("effective_from", datetime.date(2000, 1, 1)),
+            effective_to=kwargs.pop("effective_to", None),
+            **kwargs,
+        )
+
+    def create_timesheet_entry(self, user, team, entry_date, **kwargs):
+        """
+        This function is responsible for creating a timesheet entry of a user
+        """
+        return baker.make(
+            "hubble.TimesheetEntry",
+            user=user,
+            team=team,
+            entry_date=entry_date,
+            working_hours=kwargs.pop("working_hours", 8),
+            approved_hours=kwargs.pop("approved_hours", 8),
+            authorized_hours=kwargs.pop("authorized_hours", 6),
+            billed_hours=kwargs.pop("billed_hours", 4),
+            **kwargs,
+        )
+
+    def make_datatable_request(self, url_pattern, data=None):
+        """
+        This function is responsible for requesting a page of an ajax datatable
+        """
+        return self.client.post(
+            url_pattern,
+            {"draw": 1, "start": 0, "length": 10, **(data or {})},
+            SERVER_NAME=self.testcase_server_name,
+            HTTP_ACCEPT="application/json",
+        )
@@ -14,6 +14,58 @@ ENVIRONMENT_DEVELOPMENT = "Development"
 ENVIRONMENT_PRODUCTION = "Production"
 ENVIRONMENT_TESTING = "Testing"
 
+REPORT_CACHE_TIMEOUT = 60 * 60 * 24
+REPORT_DATA_VERSION_TIMEOUT = 30
+# The last good result of every report draw is kept this long to be served
+# when the draw can't be computed in time
+REPORT_STALE_CACHE_TIMEOUT = 60 * 60 * 24 * 7
+
+COUNT_STRATEGY_EXACT = "exact"
+COUNT_STRATEGY_CACHED = "cached"
+COUNT_STRATEGY_ESTIMATE = "estimate"
+# The total counts of the datatables are kept for this many seconds
+COUNT_CACHE_TIMEOUT = 60 * 5
+
+# The holiday calendars of the batches are kept for this many seconds, they are
+# also rebuilt whenever a trainee holiday of the batch is written
+HOLIDAY_CALENDAR_CACHE_TIMEOUT = 60 * 60 * 24
+
+# The cursors of the keyset paginated datatables are kept for this many seconds
+KEYSET_CURSOR_TIMEOUT = 60 * 30
+
+REPORT_JOB_STATUS_PENDING = "Pending"
+REPORT_JOB_STATUS_RUNNING = "Running"
+REPORT_JOB_STATUS_COMPLETED = "Completed"
+REPORT_JOB_STATUS_FAILED = "Failed"
+REPORT_JOB_STATUSES = [
+    (REPORT_JOB_STATUS_PENDING, REPORT_JOB_STATUS_PENDING),
+    (REPORT_JOB_STATUS_RUNNING, REPORT_JOB_STATUS_RUNNING),
+    (REPORT_JOB_STATUS_COMPLETED, REPORT_JOB_STATUS_COMPLETED),
+    (REPORT_JOB_STATUS_FAILED, REPORT_JOB_STATUS_FAILED),
+]
+# A running job whose worker has not sent a heartbeat within this many seconds
+# is considered abandoned by its worker and picked up again
+REPORT_JOB_STALE_TIMEOUT = 60 * 10
+# The rows of a report job are fetched and rendered in chunks of this size,
+# the worker sending a heartbeat after each chunk
+REPORT_JOB_CHUNK_SIZE = 500
+# Every statement of a report job is cancelled after this many milliseconds.
+# It has to stay below the stale timeout, so that no statement can keep a
+# worker silent long enough for its job to be picked up again
+REPORT_JOB_STATEMENT_TIMEOUT = 1000 * 60 * 5
+
+# Maximum number of reports which can be requested in a single batch
+REPORT_BATCH_MAX_SIZE = 10
+
+# The groupings of the pivot report when none are requested, the empty one
+# being the grand total
+PIVOT_DEFAULT_GROUPINGS = ["team", "month", "project", ""]
+PIVOT_MAX_GROUPINGS = 8
+
+# A month is closed, and its reports never change, once this many days have
+# passed after the end of the month, which leaves time for late timesheets
+REPORT_MONTH_CLOSE_DAYS = 10
+
 PRESENT_TYPE_REMOTE = "Remote"
 PRESENT_TYPE_IN_PERSON = "In-Person"
 PRESENT_TYPES = [
@@ -0,0 +1,118 @@
+"""
+Module contains the database router which sends the reads of the reports
+app to the read replica
+"""
+import contextlib
+import contextvars
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError, connections
+
+REPLICA_DATABASE = "replica"
+# The models which are only read by the reports app
+REPLICA_MODELS = {
+    "hubble.timesheetentry",
+    "hubble.expecteduserefficiency",
+    "hubble.team",
+    "hubble.project",
+}
+
+replica_reads = contextvars.ContextVar("replica_reads", default=False)
+
+
+@contextlib.contextmanager
+def use_replica():
+    """
+    Routes the reads of the replica models to the read replica within the block
+    """
+    token = replica_reads.set(True)
+    try:
+        yield
+    finally:
+        replica_reads.reset(token)
+
+
+def replica_lag():
+    """
+    Returns the replication lag of the replica in seconds, or None if the
+    replica can't be reached. A replica which has replayed everything it
+    received is not lagging, even if the primary has been idle for a while
+    """
+    try:
+        with connections[REPLICA_DATABASE].cursor() as cursor:
+            cursor.execute(
+                """
+                SELECT CASE
+                    WHEN NOT pg_is_in_recovery()
+                        OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+                    ELSE COALESCE(
+                        EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0
+                    )
+                END
+                """
+            )
+            return float(cursor.fetchone()[0])
+    except DatabaseError:
+        logging.warning("The read replica is not available", exc_info=True)
+        return None
+
+
+def replica_available():
+    """
+    Returns whether the replica can serve the reads, i.e. it is configured,
+    reachable and its lag is within REPLICA_MAX_LAG seconds. The result is
+    memoized for REPLICA_CHECK_INTERVAL seconds
+    """
+    if REPLICA_DATABASE not in settings.DATABASES:
+        return False
+    available = cache.get("replica-available")
+    if available is None:
+        lag = replica_lag()
+        available = lag is not None and lag <= settings.REPLICA_MAX_LAG
+        cache.set("replica-available", available, settings.REPLICA_CHECK_INTERVAL)
+    return available
+
+
+class ReplicaRouter:
+    """
+    Routes the reads of the reports app to the read replica and everything
+    else, including every write, to the primary database
+    """
+
+    def db_for_read(self, model, **hints):  # pylint: disable=unused-argument
+        """
+        Returns the replica for the replica models while the reads of the
+        reports app are being served and the replica is healthy. Reads within
+        a transaction of the primary stay on the primary, so that they see
+        the uncommitted writes of the transaction
+        """
+        if (
+            replica_reads.get()
+            and model._meta.label_lower in REPLICA_MODELS  # pylint: disable=protected-access
+            and not connections["default"].in_atomic_block
+            and replica_available()
+        ):
+            return REPLICA_DATABASE
+        return None
+
+    def db_for_write(self, model, **hints):  # pylint: disable=unused-argument
+        """
+        Every write goes to the primary database
+        """
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):  # pylint: disable=unused-argument
+        """
+        The replica holds the same data as the primary, so the relations are allowed
+        """
+        return True
+
+    def allow_migrate(
+        self, db, app_label, model_name=None, **hints
+    ):  # pylint: disable=unused-argument
+        """
+        The replica is migrated through the replication of the primary
+        """
+        return db != REPLICA_DATABASE
@@ -0,0 +1,116 @@
+"""
+Module contains the query guard which bounds the statements of a view with a
+statement timeout and cancels them once the client has gone away
+"""
+import contextlib
+import socket
+import threading
+
+from django.db import OperationalError, connections
+
+# The SQLSTATE of a statement cancelled by a timeout or a cancel request
+QUERY_CANCELED = "57014"
+
+
+def is_query_canceled(error):
+    """
+    Checks whether the database error was raised by a cancelled statement
+    """
+    return isinstance(error, OperationalError) and (
+        getattr(error.__cause__, "pgcode", None) == QUERY_CANCELED
+    )
+
+
+def client_disconnected(client_socket):
+    """
+    Checks whether the client has closed its side of the socket, without
+    consuming anything it has sent
+    """
+    try:
+        return client_socket.recv(1, socket.MSG_PEEK | socket.MSG_DONTWAIT) == b""
+    except BlockingIOError:
+        return False
+    except OSError:
+        return True
+
+
+class QueryGuard:
+    """
+    Execute wrapper which sets the statement timeout of every postgres
+    connection used within the block and resets it afterwards. Statements run
+    within a transaction are wrapped in a savepoint, so that a cancelled
+    statement doesn't abort the surrounding transaction.
+
+    When the socket of the client is given, a watchdog thread polls it and
+    cancels the running statement as soon as the client disconnects
+    """
+
+    def __init__(self, timeout, client_socket=None, check_interval=0.5):
+        self.timeout = timeout
+        self.client_socket = client_socket
+        self.check_interval = check_interval
+        self.connections = {}
+        self.disconnected = False
+        self.stopped = threading.Event()
+        self.watchdog = None
+        self.wrappers = None
+
+    def __call__(self, execute, sql, params, many, context):
+        """
+        Wraps the execution of every query of the block
+        """
+        connection = context["connection"]
+        if connection.vendor != "postgresql":
+            return execute(sql, params, many, context)
+        if connection.alias not in self.connections:
+            self.execute(connection, "SET statement_timeout = %s", [int(self.timeout)])
+            self.connections[connection.alias] = connection
+        if not connection.in_atomic_block:
+            return execute(sql, params, many, context)
+        self.execute(connection, "SAVEPOINT query_guard")
+        try:
+            result = execute(sql, params, many, context)
+        except OperationalError:
+            self.execute(connection, "ROLLBACK TO SAVEPOINT query_guard")
+            raise
+        self.execute(connection, "RELEASE SAVEPOINT query_guard")
+        return result
+
+    @staticmethod
+    def execute(connection, sql, params=None):
+        """
+        Executes a statement of the guard on a cursor of its own, bypassing the
+        execute wrappers and leaving the result of the wrapped cursor intact
+        """
+        with connection.connection.cursor() as cursor:
+            cursor.execute(sql, params)
+
+    def watch(self):
+        """
+        Cancels the running statements once the client has disconnected
+        """
+        while not self.stopped.wait(self.check_interval):
+            if client_disconnected(self.client_socket):
+                self.disconnected = True
+                for connection in list(self.connections.values()):
+                    if connection.connection is not None:
+                        connection.connection.cancel()
+                return
+
+    def __enter__(self):
+        self.wrappers = contextlib.ExitStack()
+        for connection in connections.all():
+            self.wrappers.enter_context(connection.execute_wrapper(self))
+        if self.client_socket is not None:
+            self.watchdog = threading.Thread(target=self.watch, daemon=True)
+            self.watchdog.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stopped.set()
+        if self.watchdog is not None:
+            self.watchdog.join()
+        self.wrappers.close()
+        for connection in self.connections.values():
+            if connection.connection is not None and not connection.needs_rollback:
+                self.execute(connection, "RESET statement_timeout")
@@ -2,17 +2,53 @@
 Module contains the custom configuration for the Django ajax datatable
 """
 import datetime
+import hashlib
+import json
+import sys
 
 from ajax_datatable import AjaxDatatableView  # pylint: disable=no-name-in-module
+from ajax_datatable.filters import build_column_filter
+from django.conf import settings
 from django.contrib.auth.mixins import AccessMixin
-from django.http import HttpResponseForbidden
-
+from django.core.cache import cache
+from django.core.exceptions import FieldDoesNotExist
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import OperationalError, transaction
+from django.db.models import CharField, F, Max, Q, QuerySet, TextField
+from django.http import (
+    HttpResponse,
+    HttpResponseBadRequest,
+    HttpResponseForbidden,
+    JsonResponse,
+)
+from django.utils import timezone
+
+from core.constants import (
+    COUNT_CACHE_TIMEOUT,
+    COUNT_STRATEGY_ESTIMATE,
+    COUNT_STRATEGY_EXACT,
+    KEYSET_CURSOR_TIMEOUT,
+    REPORT_CACHE_TIMEOUT,
+    REPORT_DATA_VERSION_TIMEOUT,
+    REPORT_STALE_CACHE_TIMEOUT,
+)
+from core.query_guard import QueryGuard, is_query_canceled
+from core.working_days import MORNING_END, WorkingDayCalendar
 from hubble.models import (
+    CurrencyRate,
+    ExpectedUserEfficiency,
     InternDetail,
+    ProjectResource,
+    ReportWatermark,
+    SearchMirror,
+    SubBatch,
     SubBatchTaskTimeline,
     TimelineTask,
+    TimesheetEntry,
     TraineeHoliday,
 )
+from hubble.models.capacity_calendar import CALENDAR_WATERMARK
+from hubble.models.daily_efficiency_rollup import ROLLUP_WATERMARK
 
 
 class CustomDatatable(AjaxDatatableView):  # pragma: no cover
@@ -22,6 +58,24 @@ class CustomDatatable(AjaxDatatableView):  # pragma: no cover
     """
 
     show_column_filters = False
+    # Opt-in keyset (seek) pagination, see `get_keyset_response_dict`
+    keyset_pagination = False
+    # The strategy of counting the records, see `count_records`
+    count_strategy = COUNT_STRATEGY_EXACT
+    estimate_count_threshold = 100000
+
+    def request_digest(self, request, ignored_params, *extra):
+        """
+        Returns a digest of the view and its normalized request parameters,
+        leaving out the given parameters
+        """
+        params = sorted(
+            (key, request.REQUEST.getlist(key))
+            for key in request.REQUEST
+            if key not in ignored_params
+        )
+        digest = hashlib.sha256(json.dumps([*extra, params], default=str).encode()).hexdigest()
+        return f"{self.__class__.__module__}.{self.__class__.__name__}:{digest}"
 
     # It is used to ommit 'arguments-differ'.In this case, the
     # `get_table_row_id` method in the `CustomDatatable` class has a different
@@ -56,9 +110,321 @@ class CustomDatatable(AjaxDatatableView):  # pragma: no cover
         columns in a row"""
         return row.get(column, None)
 
-    def prepare_results(self, request, qs):
+    def read_parameters(self, query_dict):
+        """This function reads the "All" length (-1) as a page holding every
+        row, since the ajax datatable pages it with the `count()` of the
+        queryset, which a list of dictionaries doesn't have"""
+        params = super().read_parameters(query_dict)
+        if params["length"] == -1:
+            params["length"] = sys.maxsize
+        return params
+
+    def prepare_queryset(self, params, qs):
+        """This function is responsible for searching and sorting the rows
+        when a list of dictionaries is given instead of a queryset"""
+        # The queryset before the search is kept for the total count
+        self.initial_queryset = qs
+        if not isinstance(qs, list):
+            return super().prepare_queryset(params, qs)
+        searches = [
+            (column["name"], term)
+            for column in self.column_specs
+            if "search_value" in params and column["searchable"]
+            for term in self.search_terms(params["search_value"])
+        ]
+        if searches:
+            qs = [row for row in qs if self.row_matches(row, searches)]
+        for column_link in params["column_links"]:
+            if column_link.searchable and column_link.search_value:
+                searches = [
+                    (column_link.name, term)
+                    for term in self.search_terms(column_link.search_value)
+                ]
+                qs = [row for row in qs if self.row_matches(row, searches)]
+        # Sorting from the last order to the first one keeps the earlier
+        # orders as the primary keys, since the sort is stable
+        for order in reversed(params["orders"]):
+            name = order.column_link.name
+            qs = sorted(
+                qs,
+                key=lambda row, name=name: (row.get(name) is None, row.get(name)),
+                reverse=not order.ascending,
+            )
+        return qs
+
+    def search_terms(self, search_value):
+        """This function splits the search value into the terms which are
+        searched for, with the `search_value_seperator` of the view"""
+        separator = getattr(self, "search_value_seperator", "") or self.search_values_separator
+        if separator and separator in search_value:
+            terms = [term.strip() for term in search_value.split(separator)]
+            return [term for term in terms if term] or [search_value]
+        return [search_value]
+
+    def filter_queryset_all_columns(self, search_value, qs):
+        """This function searches the value over every searchable column"""
+        columns = [column["name"] for column in self.column_specs if column["searchable"]]
+        return self.search_queryset(columns, search_value, qs, True)
+
+    def filter_queryset_by_column(self, column_name, search_value, qs):
+        """This function searches the value over the given column"""
+        return self.search_queryset([column_name], search_value, qs, False)
+
+    def search_queryset(self, column_names, search_value, qs, global_filtering):
+        """This function filters the queryset with the rows matching any of
+        the search terms in any of the columns. The columns of the unmanaged
+        tables which are mirrored are searched through the mirror"""
+        terms = self.search_terms(search_value)
+        search_filters = Q()
+        for column_name in column_names:
+            column_obj = self.column_obj(column_name)
+            column_spec = self.column_spec_by_name(column_name)
+            column_filter = self.get_mirror_filter(column_obj, column_spec, terms)
+            if column_filter is None:
+                column_filter = build_column_filter(
+                    column_name,
+                    column_obj,
+                    column_spec,
+                    terms if len(terms) > 1 else terms[0],
+                    global_filtering,
+                )
+            if column_filter:
+                search_filters |= column_filter
+        return qs.filter(search_filters)
+
+    def get_mirror_filter(self, column_obj, column_spec, terms):
+        """This function returns the filter on the ids of the rows of the
+        search mirror matching the terms, when the column is a text column of
+        a mirrored table searched with `icontains`, otherwise None"""
+        if column_spec["lookup_field"] != "__icontains" or column_obj.has_choices_available:
+            return None
+        *relations, field_name = column_obj.get_field_search_path().split("__")
+        model = self.model
+        try:
+            for relation in relations:
+                model = model._meta.get_field(relation).related_model
+            field = model._meta.get_field(field_name)
+        except (AttributeError, FieldDoesNotExist):
+            return None
+        source = SearchMirror.objects.source_for(model, field_name)
+        if not source or not isinstance(field, (CharField, TextField)):
+            return None
+        if not SearchMirror.objects.is_ready(source):
+            return None
+        lookup = "__".join([*relations, "in"]) if relations else "pk__in"
+        return Q(**{lookup: SearchMirror.objects.matching(source, terms)})
+
+    def get_response_dict(self, request, paginator, draw_idx, start_pos):
+        """This function is responsible for counting the records with the
+        count strategy of the view and for preparing the page, with the
+        keyset pagination when it is enabled"""
+        records_total = self.count_records(request, paginator)
+        if (
+            self.keyset_pagination
+            and self.get_keyset_ordering(paginator.object_list) is not None
+            and request.REQUEST.get("length") != "-1"
+            and start_pos < paginator.count
+        ):
+            response = self.get_keyset_response_dict(request, paginator, draw_idx, start_pos)
+        else:
+            response = super().get_response_dict(request, paginator, draw_idx, start_pos)
+        response["recordsTotal"] = records_total
+        return response
+
+    def count_records(self, request, paginator):
+        """This function counts the records with the count strategy of the
+        view. The filtered count is stored on the paginator, and the total
+        count, i.e. the count before the search, is returned.
+
+        - exact: a COUNT of the filtered queryset, used for both counts
+        - cached: the total is cached per filter set, and the filtered count
+          is only run while a search is active
+        - estimate: like cached, but the total comes from the planner
+          estimate when it is above `estimate_count_threshold`
+        """
+        queryset = paginator.object_list
+        if self.count_strategy == COUNT_STRATEGY_EXACT or not isinstance(queryset, QuerySet):
+            return paginator.count
+        cache_key = self.get_count_cache_key(request)
+        records_total = cache.get(cache_key)
+        if records_total is None:
+            initial_queryset = self.initial_queryset.order_by()
+            if self.count_strategy == COUNT_STRATEGY_ESTIMATE:
+                records_total = self.estimate_count(initial_queryset)
+                if records_total < self.estimate_count_threshold:
+                    records_total = initial_queryset.count()
+            else:
+                records_total = initial_queryset.count()
+            cache.set(cache_key, records_total, COUNT_CACHE_TIMEOUT)
+        if not self.is_search_active(request):
+            # Paginator.count is a cached property, so the COUNT is skipped
+            paginator.count = records_total
+        return records_total
+
+    def get_count_cache_key(self, request):
+        """This function returns the cache key of the total count of the
+        filter set. Views can add a data version through `get_count_version`"""
+        ignored_params = {"draw", "_", "start", "length", "csrfmiddlewaretoken"}
+        ignored_params.update(
+            key
+            for key in request.REQUEST
+            if key.startswith(("search[", "order[")) or key.endswith("[search][value]")
+        )
+        digest = self.request_digest(request, ignored_params, self.get_count_version())
+        return f"datatable-count:{digest}"
+
+    def get_count_version(self):
+        """This function returns the version of the data which is counted"""
+        return None
+
+    @staticmethod
+    def is_search_active(request):
+        """This function returns whether the global, a column or a date range
+        search is given"""
+        return any(
+            value
+            for key, value in request.REQUEST.items()
+            if key in ("search[value]", "date_from", "date_to") or key.endswith("[search][value]")
+        )
+
+    @staticmethod
+    def estimate_count(queryset):
+        """This function returns the number of rows which the planner
+        estimates for the queryset, without running it"""
+        plan = json.loads(queryset.explain(format="json"))
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    def get_keyset_response_dict(self, request, paginator, draw_idx, start_pos):
+        """This function is responsible for the keyset pagination of the queryset.
+
+        The datatables.net requests only carry the offset of the page, so the
+        ordering values of the last row of every served page are remembered as
+        the cursor of the next page. A page with a known cursor is fetched
+        with a seek filter on the ordering columns plus pk instead of an
+        OFFSET, so deep pages cost the same as the first one. Pages without a
+        cursor, e.g. when jumping to the last page, fall back to the OFFSET"""
+        queryset = paginator.object_list
+        ordering = self.get_keyset_ordering(queryset)
+        length = paginator.per_page
+        queryset, names = self.annotate_keyset_values(queryset.order_by(*ordering), ordering)
+        cursor = cache.get(self.get_keyset_cursor_key(request, start_pos)) if start_pos else None
+        if cursor is not None:
+            rows = list(queryset.filter(self.get_keyset_filter(ordering, cursor))[:length])
+        else:
+            rows = list(queryset[start_pos : start_pos + length])
+        if rows:
+            try:
+                cursor = [self.get_keyset_value(rows[-1], name) for name in names]
+            except AttributeError:
+                # The rows which don't carry their ordering values are left to the OFFSET
+                cursor = None
+            if cursor is not None:
+                cache.set(
+                    self.get_keyset_cursor_key(request, start_pos + length),
+                    cursor,
+                    KEYSET_CURSOR_TIMEOUT,
+                )
+        return {
+            "draw": draw_idx,
+            "recordsTotal": paginator.count,
+            "recordsFiltered": paginator.count,
+            "data": self.prepare_results(request, rows),
+        }
+
+    @staticmethod
+    def annotate_keyset_values(queryset, ordering):
+        """This function returns the queryset along with the names under which
+        its rows carry the ordering values. The dict rows of a values()
+        queryset only carry the selected fields, so the other ordering fields,
+        e.g. `project__name`, are annotated under names of their own"""
+        names = [field.lstrip("-") for field in ordering]
+        if queryset._fields is None:  # pylint: disable=protected-access
+            return queryset, names
+        missing = {
+            f"keyset_{index}": F(name)
+            for index, name in enumerate(names)
+            if name not in queryset._fields  # pylint: disable=protected-access
+        }
+        names = [
+            f"keyset_{index}" if f"keyset_{index}" in missing else name
+            for index, name in enumerate(names)
+        ]
+        return queryset.annotate(**missing), names
+
+    @staticmethod
+    def get_keyset_ordering(queryset):
+        """This function returns the ordering of the queryset with the pk as
+        the last tie breaker, or None if it can't be used as a cursor"""
+        if not isinstance(queryset, QuerySet):
+            return None
+        ordering = list(queryset.query.order_by or queryset.model._meta.ordering)
+        if not all(isinstance(field, str) and field != "?" for field in ordering):
+            return None
+        if not {"pk", "-pk", "id", "-id"} & set(ordering):
+            ordering.append("pk")
+        return ordering
+
+    def get_keyset_cursor_key(self, request, start_pos):
+        """This function returns the cache key of the cursor of the page which
+        starts at the given offset"""
+        digest = self.request_digest(
+            request, ("draw", "_", "start", "csrfmiddlewaretoken"), request.user.pk
+        )
+        return f"datatable-cursor:{digest}:{start_pos}"
+
+    @staticmethod
+    def get_keyset_value(row, field):
+        """This function returns the value of a (related) ordering field of a row"""
+        if isinstance(row, dict):
+            return row[field]
+        for name in field.split("__"):
+            row = getattr(row, name)
+            if row is None:
+                return None
+        return row
+
+    @staticmethod
+    def get_keyset_filter(ordering, cursor):
+        """This function returns the filter of the rows which come after the
+        cursor, i.e. (a > a0) OR (a = a0 AND b > b0) OR ...
+
+        Postgres sorts the NULLs last in an ascending and first in a descending
+        order, so the NULLs come after any value of an ascending column, and
+        any value comes after a NULL of a descending column"""
+        keyset_filter = Q()
+        for index, field in enumerate(ordering):
+            name = field.lstrip("-")
+            descending = field.startswith("-")
+            if cursor[index] is None:
+                if not descending:
+                    continue
+                condition = Q(**{f"{name}__isnull": False})
+            else:
+                condition = Q(**{f"{name}__{'lt' if descending else 'gt'}": cursor[index]})
+                if not descending:
+                    condition |= Q(**{f"{name}__isnull": True})
+            for previous_field, previous_value in zip(ordering[:index], cursor):
+                previous_name = previous_field.lstrip("-")
+                if previous_value is None:
+                    condition &= Q(**{f"{previous_name}__isnull": True})
+                else:
+                    condition &= Q(**{previous_name: previous_value})
+            keyset_filter |= condition
+        return keyset_filter
+
+    @staticmethod
+    def row_matches(row, searches):
+        """This function returns whether any of the (column, value) searches
+        is contained in the row, case insensitively"""
+        return any(
+            str(value).lower() in str(row.get(column, "")).lower() for column, value in searches
+        )
+
+    def prepare_results(self, request, qs, offset=0):
         """This function is responsible for preparing the json data which
-        should be returned as response when the datatable is called
+        should be returned as response when the datatable is called. The
+        offset is the position of the first row, when the rows are prepared
+        in chunks
         """
         json_data = []
         columns = [c["name"] for c in self.column_specs]
@@ -66,7 +432,7 @@ class CustomDatatable(AjaxDatatableView):  # pragma: no cover
             func = getattr(self, "render_dict_column")
         else:
             func = getattr(self, "render_column")
-        for i, cur_object in enumerate(qs):
+        for i, cur_object in enumerate(qs, offset):
             retdict = {
                 # fieldname: '<div class="field-%s">%s</div>'
                 # % (fieldname, self.render_column(cur_object, fieldname))
@@ -89,6 +455,135 @@ class CustomDatatable(AjaxDatatableView):  # pragma: no cover
         return json_data
 
 
+def report_data_version():
+    """
+    Returns the version of the data behind the reports, which moves whenever
+    a timesheet entry, an expected efficiency, a resource rate or a currency
+    rate is updated or the rollup or the capacity calendar is refreshed. The
+    `updated_at` columns are not indexed, so the version is memoized for a
+    few seconds instead of being computed on every draw
+    """
+    version = cache.get("report-data-version")
+    if version is None:
+        version = "|".join(
+            str(value)
+            for value in (
+                TimesheetEntry.objects.aggregate(latest=Max("updated_at"))["latest"],
+                ExpectedUserEfficiency.objects.with_trashed().aggregate(latest=Max("updated_at"))[
+                    "latest"
+                ],
+                ProjectResource.objects.with_trashed().aggregate(latest=Max("updated_at"))[
+                    "latest"
+                ],
+                CurrencyRate.objects.aggregate(latest=Max("updated_at"))["latest"],
+                ReportWatermark.get_value(ROLLUP_WATERMARK),
+                ReportWatermark.get_value(CALENDAR_WATERMARK),
+            )
+        )
+        cache.set("report-data-version", version, REPORT_DATA_VERSION_TIMEOUT)
+    return version
+
+
+class CachedDatatable(CustomDatatable):  # pragma: no cover
+    """
+    This class caches the json response of every draw, keyed by the report,
+    the filter, search, ordering and page parameters and the data version,
+    so that the same draw is answered without running the aggregation again.
+
+    The statements of a draw are bounded by a statement timeout and cancelled
+    when the client disconnects. A draw which times out is answered with the
+    last good result of the same parameters, flagged as stale
+    """
+
+    cache_timeout = REPORT_CACHE_TIMEOUT
+    # Parameters which change on every draw without changing its result
+    cache_ignored_params = ("draw", "_", "csrfmiddlewaretoken")
+    # Milliseconds, REPORT_STATEMENT_TIMEOUT when not set
+    statement_timeout = None
+
+    def get_cache_key(self, request):
+        """
+        Returns the cache key of the draw from the normalized request parameters
+        """
+        digest = self.request_digest(request, self.cache_ignored_params, report_data_version())
+        return f"report-datatable:{digest}"
+
+    def get_stale_cache_key(self, request):
+        """
+        Returns the cache key of the last good result of the draw, which
+        doesn't depend on the data version
+        """
+        digest = self.request_digest(request, self.cache_ignored_params)
+        return f"report-datatable-last:{digest}"
+
+    def get_count_version(self):
+        """
+        The total counts are cached along with the version of the report data
+        """
+        return report_data_version()
+
+    def get_query_guard(self, request):
+        """
+        Returns the guard of the statements of the draw. The socket of the
+        client is only exposed by gunicorn
+        """
+        return QueryGuard(
+            self.statement_timeout or settings.REPORT_STATEMENT_TIMEOUT,
+            request.META.get("gunicorn.socket"),
+        )
+
+    def json_response(self, request, response_dict, cache_status):
+        """
+        Returns the given draw as a json response for the current draw counter
+        """
+        try:
+            response_dict["draw"] = int(request.REQUEST["draw"])
+        except (KeyError, ValueError):
+            return HttpResponseBadRequest()
+        response = HttpResponse(
+            json.dumps(response_dict, cls=DjangoJSONEncoder),
+            content_type="application/json",
+        )
+        response["X-Cache"] = cache_status
+        return response
+
+    def get(self, request, *args, **kwargs):
+        """
+        Returns the cached draw when available, otherwise prepares the draw
+        and caches it. The `X-Cache` header tells whether the cache was hit
+        or a stale result is served
+        """
+        cache_key = self.get_cache_key(request)
+        response_dict = cache.get(cache_key)
+        if response_dict is not None:
+            return self.json_response(request, response_dict, "HIT")
+
+        guard = self.get_query_guard(request)
+        try:
+            with guard:
+                response = super().get(request, *args, **kwargs)
+        except OperationalError as error:
+            if not is_query_canceled(error):
+                raise
+            if guard.disconnected:
+                # Nobody is waiting for the answer anymore
+                return HttpResponse(status=499)
+            response_dict = cache.get(self.get_stale_cache_key(request))
+            if response_dict is None:
+                return JsonResponse(
+                    {"error": "The report took too long, please narrow down the filters"},
+                    status=503,
+                )
+            return self.json_response(request, {**response_dict, "stale": True}, "STALE")
+        if response.status_code != 200:
+            return response
+        response_dict = json.loads(response.content)
+        cache.set(cache_key, response_dict, self.cache_timeout)
+        cache.set(self.get_stale_cache_key(request), response_dict, REPORT_STALE_CACHE_TIMEOUT)
+        response["X-Cache"] = "MISS"
+        return response
+
+
 class ValidateAuthorizationMixin(AccessMixin):
     """Mixin that validates user authorization"""
 
@@ -124,118 +619,159 @@ def validate_authorization():  # pragma: no cover
     return decorator
 
 
-def update_expected_end_date_of_intern_details(sub_batch):
+def update_expected_end_date_of_intern_details(sub_batch, expected_completion=None):
     """
     Updates the expected completion date of intern details based on the
-    latest sub-batch task timeline
+    latest sub-batch task timeline, unless the date is given
     """
-    expected_completion_day = (
-        SubBatchTaskTimeline.objects.filter(sub_batch_id=sub_batch).order_by("-order").first()
-    )
+    if expected_completion is None:
+        expected_completion = (
+            SubBatchTaskTimeline.objects.filter(sub_batch_id=sub_batch)
+            .order_by("-order")
+            .first()
+            .end_date
+        )
     InternDetail.objects.filter(sub_batch_id=sub_batch).update(
-        expected_completion=expected_completion_day.end_date
+        expected_completion=expected_completion
     )
 
 
-def is_leave_day(holidays, start_date):
-    """
-    Checks if a given date is a leave day (holiday or Sunday)
-    """
-    return (start_date.date() in holidays) or (start_date.date().weekday() == 6)
-
-
-def calculate_duration_for_task(holidays, start_date, is_half_day, number_of_days):
+def calculate_duration_for_task(
+    holidays, start_date, is_half_day, number_of_days, calendar=None
+):  # pylint: disable=too-many-arguments
     """
     Calculates the start and end date/time for a task, taking into
-    account holidays, half-day status, and the number of days
+    account holidays, half-day status, and the number of days. The working
+    day calendar of the holidays can be given to schedule several tasks
     """
-    if start_date.time() == datetime.time(hour=18, minute=0):
-        start_date += datetime.timedelta(1)
-        start_date = start_date.replace(hour=9, minute=0)
+    calendar = calendar or WorkingDayCalendar(holidays)
+    return calendar.schedule(start_date, is_half_day, number_of_days)
 
-    while is_leave_day(holidays, start_date):
-        start_date += datetime.timedelta(1)
-
-    if is_half_day:
-        start_date_time = datetime.datetime.combine(start_date, datetime.time(hour=14, minute=0))
-    else:
-        start_date_time = datetime.datetime.combine(start_date, datetime.time(hour=9, minute=0))
 
-    having_half_day_at_end = False
-    end_time = datetime.time(hour=18, minute=0)
+def schedule_timeline_for_sub_batch(sub_batch, user=None, is_create=True, from_order=None):
+    """
+    Schedules the timeline for a sub-batch based on the holiday of the batch.
+    The computed schedule is written with a single bulk query along with the
+    expected completion of the interns, within one transaction. When
+    rescheduling, only the tasks whose dates have changed are written.
 
-    if (not is_half_day and (number_of_days % 1 == 0.5)) or (
-        is_half_day and (number_of_days % 1 != 0.5)
-    ):
-        having_half_day_at_end = True
-        end_time = datetime.time(hour=13, minute=0)
-
-    total_num_days = 0
-    if is_half_day:
-        total_num_days += 0.5
-        end_date = start_date
-        start_date += datetime.timedelta(1)
-
-    while total_num_days != number_of_days:
-        if is_leave_day(holidays, start_date):
-            start_date += datetime.timedelta(1)
-            continue
-
-        if number_of_days - total_num_days == 0.5:
-            total_num_days += 0.5
-            end_date = start_date
-            continue
-
-        total_num_days += 1
-        end_date = start_date
-        start_date += datetime.timedelta(1)
-    return {
-        "start_date_time": start_date_time,
-        "end_date_time": datetime.datetime.combine(end_date, end_time),
-        "ends_afternoon": having_half_day_at_end,
-    }
-
-
-def schedule_timeline_for_sub_batch(sub_batch, user=None, is_create=True):
-    """
-    Schedules the timeline for a sub-batch based on the holiday of the batch
-    """
-    holidays = list(
-        TraineeHoliday.objects.filter(batch_id=sub_batch.batch.id).values_list(
-            "date_of_holiday", flat=True
-        )
-    )
+    A reschedule with `from_order` resumes from the stored end of the task
+    preceding that order and only recomputes the tasks from that order
+    """
+    calendar = TraineeHoliday.objects.calendar(sub_batch.batch_id)
+    holidays = calendar.holidays
     start_date = datetime.datetime.strptime(str(sub_batch.start_date), "%Y-%m-%d")
     is_half_day = False
-    order = 0
+    # The end of the timeline stays at the preceding task when no task follows it
+    value_end_date = None
     if is_create:
-        for task in TimelineTask.objects.filter(timeline=sub_batch.timeline.id):
-            values = calculate_duration_for_task(holidays, start_date, is_half_day, task.days)
-
-            order += 1
-            SubBatchTaskTimeline.objects.create(
+        tasks = [
+            SubBatchTaskTimeline(
                 name=task.name,
                 days=task.days,
                 sub_batch=sub_batch,
                 present_type=task.present_type,
                 task_type=task.task_type,
-                start_date=values["start_date_time"],
-                end_date=values["end_date_time"],
                 created_by=user,
                 order=order,
             )
-            start_date = values["end_date_time"]
-            is_half_day = values["ends_afternoon"]
-        value_end_date = values["end_date_time"]
-
+            for order, task in enumerate(
+                TimelineTask.objects.filter(timeline=sub_batch.timeline.id), start=1
+            )
+        ]
     else:
-        for task in SubBatchTaskTimeline.objects.filter(sub_batch=sub_batch).order_by("order"):
-            values = calculate_duration_for_task(holidays, start_date, is_half_day, task.days)
-            start_date = values["end_date_time"]
-            is_half_day = values["ends_afternoon"]
+        tasks = SubBatchTaskTimeline.objects.filter(sub_batch=sub_batch).order_by("order")
+        previous_task = None
+        if from_order is not None:
+            previous_task = (
+                SubBatchTaskTimeline.objects.filter(sub_batch=sub_batch, order__lt=from_order)
+                .order_by("-order")
+                .first()
+            )
+        # A preceding task which has never been scheduled has no end to resume
+        # from, in which case the whole timeline is scheduled again
+        if previous_task and previous_task.end_date:
+            tasks = tasks.filter(order__gte=from_order)
+            start_date = value_end_date = previous_task.end_date
+            is_half_day = previous_task.end_date.time() == MORNING_END
+        tasks = list(tasks)
+
+    changed_tasks = []
+    for task in tasks:
+        values = calculate_duration_for_task(
+            holidays, start_date, is_half_day, task.days, calendar
+        )
+        start_date = values["end_date_time"]
+        is_half_day = values["ends_afternoon"]
+        if (task.start_date, task.end_date) != (
+            values["start_date_time"],
+            values["end_date_time"],
+        ):
             task.start_date = values["start_date_time"]
             task.end_date = values["end_date_time"]
-            task.save()
+            task.updated_at = timezone.now()
+            changed_tasks.append(task)
         value_end_date = values["end_date_time"]
-    update_expected_end_date_of_intern_details(sub_batch.id)
+
+    with transaction.atomic():
+        if is_create:
+            SubBatchTaskTimeline.objects.bulk_create(tasks)
+        elif changed_tasks:
+            SubBatchTaskTimeline.objects.bulk_update(
+                changed_tasks, ["start_date", "end_date", "updated_at"]
+            )
+        if value_end_date is not None:
+            update_expected_end_date_of_intern_details(sub_batch.id, value_end_date)
     return value_end_date
+
+
+def reschedule_timelines_for_batch(batch_id):
+    """
+    Reschedules the timelines of every sub-batch of a batch after a change of
+    its holidays. The holiday calendar is loaded once, the schedules of all the
+    sub-batches are computed in memory and the changed tasks are written
+    along with the expected completion of the interns within one transaction.
+
+    Returns the previous and the new end date of every sub-batch with a timeline
+    """
+    calendar = TraineeHoliday.objects.calendar(batch_id)
+    start_dates = dict(SubBatch.objects.filter(batch_id=batch_id).values_list("id", "start_date"))
+    timelines = {}
+    for task in SubBatchTaskTimeline.objects.filter(sub_batch_id__in=start_dates).order_by(
+        "sub_batch_id", "order"
+    ):
+        timelines.setdefault(task.sub_batch_id, []).append(task)
+
+    changed_tasks, summary = [], {}
+    for sub_batch_id, tasks in timelines.items():
+        start_date = datetime.datetime.combine(start_dates[sub_batch_id], datetime.time.min)
+        is_half_day = False
+        previous_end_date = tasks[-1].end_date
+        for task in tasks:
+            values = calendar.schedule(start_date, is_half_day, task.days)
+            start_date = values["end_date_time"]
+            is_half_day = values["ends_afternoon"]
+            if (task.start_date, task.end_date) != (
+                values["start_date_time"],
+                values["end_date_time"],
+            ):
+                task.start_date = values["start_date_time"]
+                task.end_date = values["end_date_time"]
+                task.updated_at = timezone.now()
+                changed_tasks.append(task)
+        summary[sub_batch_id] = {
+            "previous_end_date": previous_end_date,
+            "end_date": start_date,
+            "shifted": start_date != previous_end_date,
+        }
+
+    with transaction.atomic():
+        SubBatchTaskTimeline.objects.bulk_update(
+            changed_tasks, ["start_date", "end_date", "updated_at"]
+        )
+        for sub_batch_id, sub_batch_summary in summary.items():
+            if sub_batch_summary["shifted"]:
+                update_expected_end_date_of_intern_details(
+                    sub_batch_id, sub_batch_summary["end_date"]
+                )
+    return summary
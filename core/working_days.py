@@ -0,0 +1,80 @@
+"""
+Module contains the working day calendar of a batch, which resolves the
+schedule of a timeline task with offsets into the working days instead of
+walking through the calendar one day at a time
+"""
+import datetime
+
+import numpy as np
+
+# Monday to Saturday are working days for the trainees
+WORKING_WEEKMASK = "1111110"
+DAY_START = datetime.time(hour=9, minute=0)
+DAY_END = datetime.time(hour=18, minute=0)
+AFTERNOON_START = datetime.time(hour=14, minute=0)
+MORNING_END = datetime.time(hour=13, minute=0)
+
+
+class WorkingDayCalendar:
+    """
+    Keeps the holidays of a batch as the sorted array of a numpy business day
+    calendar, so that the n-th working day after a day is found by a binary
+    search over the holidays
+    """
+
+    def __init__(self, holidays):
+        self.holidays = frozenset(holidays)
+        self.busdaycalendar = np.busdaycalendar(
+            weekmask=WORKING_WEEKMASK,
+            holidays=np.array(sorted(self.holidays), dtype="datetime64[D]"),
+        )
+
+    def __reduce__(self):
+        # The numpy calendar can't be pickled, so the calendar is cached as its holidays
+        return (self.__class__, (sorted(self.holidays),))
+
+    def is_leave_day(self, day):
+        """
+        Checks whether the given day is a holiday or a Sunday
+        """
+        return day in self.holidays or day.weekday() == 6
+
+    def working_day(self, day, offset=0):
+        """
+        Returns the working day which comes `offset` working days after the
+        given day, or after the next working day when the day is a leave day
+        """
+        return np.busday_offset(
+            np.datetime64(day, "D"), offset, roll="forward", busdaycal=self.busdaycalendar
+        ).astype(datetime.date)
+
+    def schedule(self, start_date, is_half_day, number_of_days):
+        """
+        Returns the start and end date/time of a task of the given number of
+        days, starting at the given date/time, in the afternoon when the
+        previous task ended in the morning.
+
+        A working day is made of a morning and an afternoon slot. The task
+        takes `2 * number_of_days` slots from its first slot, so the day of
+        its last slot is an offset into the working days
+        """
+        if number_of_days <= 0 or (2 * number_of_days) % 1 != 0:
+            raise ValueError("The number of days must be a positive multiple of 0.5")
+        if start_date.time() == DAY_END:
+            start_date += datetime.timedelta(1)
+        first_day = self.working_day(start_date.date())
+
+        first_slot = 1 if is_half_day else 0
+        last_slot = first_slot + int(2 * number_of_days) - 1
+        # The task ends in the morning when its last slot is a morning slot
+        having_half_day_at_end = last_slot % 2 == 0
+        return {
+            "start_date_time": datetime.datetime.combine(
+                first_day, AFTERNOON_START if is_half_day else DAY_START
+            ),
+            "end_date_time": datetime.datetime.combine(
+                self.working_day(first_day, last_slot // 2),
+                MORNING_END if having_half_day_at_end else DAY_END,
+            ),
+            "ends_afternoon": having_half_day_at_end,
+        }
@@ -0,0 +1,25 @@
+"""
+Replica Reads Middleware
+
+This middleware class is responsible for routing the reads of the reports
+subdomain to the read replica.
+"""
+from core.db_router import use_replica
+
+
+class ReplicaReads:
+    """
+    Middleware class for routing the reads of the reports subdomain to the replica.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        """
+        Serves the requests of the reports subdomain with the replica reads enabled
+        """
+        if getattr(request, "subdomain", None) != "reports":
+            return self.get_response(request)
+        with use_replica():
+            return self.get_response(request)
@@ -0,0 +1,119 @@
+"""
+Server Timing Middleware
+
+This middleware class is responsible for measuring where the time of every
+request goes and reporting it as a `Server-Timing` header and a log line.
+"""
+import contextlib
+import json
+import logging
+import time
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+
+class RequestTimings:
+    """
+    Collects the SQL and render timings of a request
+    """
+
+    def __init__(self):
+        self.sql_count = 0
+        self.sql_time = 0.0
+        self.render_time = 0.0
+        self.render_start = None
+        self.render_sql_start = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        """
+        Wraps the execution of every query of the request
+        """
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql_time += time.perf_counter() - start
+            self.sql_count += 1
+
+    def start_render(self):
+        """
+        Marks the start of the rendering of a template response
+        """
+        self.render_start = time.perf_counter()
+        self.render_sql_start = self.sql_time
+
+    def end_render(self, response):
+        """
+        Records the rendering time of a template response, as its post render
+        callback. The queries run by the template are left to the SQL time
+        """
+        if self.render_start is not None:
+            elapsed = time.perf_counter() - self.render_start
+            self.render_time += elapsed - (self.sql_time - self.render_sql_start)
+            self.render_start = None
+        return response
+
+
+class ServerTiming:
+    """
+    Middleware class for the per-request timings.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        """
+        Measures the request and adds the `Server-Timing` header to the response
+        """
+        timings = RequestTimings()
+        request.timings = timings
+        start = time.perf_counter()
+        with contextlib.ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(timings))
+            response = self.get_response(request)
+        total_time = time.perf_counter() - start
+
+        python_time = max(total_time - timings.sql_time - timings.render_time, 0)
+        response["Server-Timing"] = ", ".join(
+            [
+                f'sql;dur={timings.sql_time * 1000:.1f};desc="{timings.sql_count} queries"',
+                f"render;dur={timings.render_time * 1000:.1f}",
+                f"python;dur={python_time * 1000:.1f}",
+                f"total;dur={total_time * 1000:.1f}",
+            ]
+        )
+        resolver_match = getattr(request, "resolver_match", None)
+        log_level = logging.INFO
+        if timings.sql_count > settings.SQL_QUERY_BUDGET:
+            log_level = logging.WARNING
+        logger.log(
+            log_level,
+            json.dumps(
+                {
+                    "view": resolver_match.view_name if resolver_match else None,
+                    "subdomain": getattr(request, "subdomain", None),
+                    "method": request.method,
+                    "status": response.status_code,
+                    "sql_count": timings.sql_count,
+                    "sql_ms": round(timings.sql_time * 1000, 1),
+                    "render_ms": round(timings.render_time * 1000, 1),
+                    "python_ms": round(python_time * 1000, 1),
+                    "total_ms": round(total_time * 1000, 1),
+                }
+            ),
+        )
+        return response
+
+    def process_template_response(self, request, response):
+        """
+        Measures the rendering of the template responses, which happens after
+        this hook
+        """
+        request.timings.start_render()
+        response.add_post_render_callback(request.timings.end_render)
+        return response
@@ -0,0 +1,218 @@
+# Generated by Django 4.1.13 on 2026-10-19 01:03
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("hubble", "0009_merge_20231024_1649"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="client",
+            name="currency",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                to="hubble.currency",
+            ),
+        ),
+        migrations.AddField(
+            model_name="expecteduserefficiency",
+            name="user",
+            field=models.ForeignKey(
+                db_column="user_id",
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="expected_user_efficiencies",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AddField(
+            model_name="expecteduserefficiency",
+            name="updated_by",
+            field=models.ForeignKey(
+                db_column="updated_by",
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="expecteduserefficiencies_updated_by",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AddField(
+            model_name="module",
+            name="project",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="modules",
+                to="hubble.project",
+            ),
+        ),
+        migrations.AddField(
+            model_name="module",
+            name="created_by",
+            field=models.ForeignKey(
+                db_column="created_by",
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="created_modules",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AddField(
+            model_name="project",
+            name="client",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="project_clients",
+                to="hubble.client",
+            ),
+        ),
+        migrations.AddField(
+            model_name="project",
+            name="currency",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="project_currencies",
+                to="hubble.currency",
+            ),
+        ),
+        migrations.AddField(
+            model_name="project",
+            name="project_owner",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="project_owner",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AddField(
+            model_name="project",
+            name="project_manager",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="project_managers",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AddField(
+            model_name="projectresource",
+            name="user",
+            field=models.OneToOneField(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="project_resource",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AddField(
+            model_name="projectresource",
+            name="project",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="project_resources",
+                to="hubble.project",
+            ),
+        ),
+        migrations.AddField(
+            model_name="projectresource",
+            name="reporting_person",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="resource_reporting_persons",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AddField(
+            model_name="projectresource",
+            name="position",
+            field=models.ForeignKey(
+                blank=True,
+                db_column="position",
+                null=True,
+                on_delete=django.db.models.deletion.DO_NOTHING,
+                related_name="resource_positions",
+                to="hubble.projectresourceposition",
+            ),
+        ),
+        migrations.AddField(
+            model_name="task",
+            name="module",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="tasks",
+                to="hubble.module",
+            ),
+        ),
+        migrations.AddField(
+            model_name="task",
+            name="created_by",
+            field=models.ForeignKey(
+                db_column="created_by",
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="created_by",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AddField(
+            model_name="timesheetentry",
+            name="user",
+            field=models.ForeignKey(
+                db_column="user_id",
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="timesheet_entries",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AddField(
+            model_name="timesheetentry",
+            name="project",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="timesheet_entries",
+                to="hubble.project",
+            ),
+        ),
+        migrations.AddField(
+            model_name="timesheetentry",
+            name="module",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="timesheet_entries",
+                to="hubble.module",
+            ),
+        ),
+        migrations.AddField(
+            model_name="timesheetentry",
+            name="task",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="timesheet_entries",
+                to="hubble.task",
+            ),
+        ),
+        migrations.AddField(
+            model_name="timesheetentry",
+            name="team",
+            field=models.ForeignKey(
+                db_column="team_id",
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="timesheet_entries",
+                to="hubble.team",
+            ),
+        ),
+    ]
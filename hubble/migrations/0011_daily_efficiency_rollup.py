@@ -0,0 +1,81 @@
+# Generated by Django 4.1.13 on 2026-10-19 01:01
+
+import core.db
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("hubble", "0010_unmanaged_model_relations"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ReportWatermark",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("created_at", core.db.DateTimeWithoutTZField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("name", models.CharField(max_length=100, unique=True)),
+                ("value", core.db.DateTimeWithoutTZField(null=True)),
+            ],
+            options={
+                "db_table": "report_watermarks",
+            },
+        ),
+        migrations.CreateModel(
+            name="DailyEfficiencyRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("created_at", core.db.DateTimeWithoutTZField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("entry_date", models.DateField()),
+                ("authorized_hours", models.FloatField(default=0)),
+                ("billed_hours", models.FloatField(default=0)),
+                ("working_hours", models.FloatField(default=0)),
+                ("entry_count", models.IntegerField(default=0)),
+                ("expected_efficiency", models.FloatField(null=True)),
+                (
+                    "team",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="daily_efficiency_rollups",
+                        to="hubble.team",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="daily_efficiency_rollups",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "daily_efficiency_rollups",
+            },
+        ),
+        migrations.AddIndex(
+            model_name="dailyefficiencyrollup",
+            index=models.Index(fields=["entry_date", "team"], name="daily_eff_rollup_date_team"),
+        ),
+        migrations.AddConstraint(
+            model_name="dailyefficiencyrollup",
+            constraint=models.UniqueConstraint(
+                fields=("team", "user", "entry_date"), name="daily_efficiency_rollup_unique_day"
+            ),
+        ),
+    ]
@@ -0,0 +1,69 @@
+# Generated by Django 4.1.13 on 2026-10-19 01:09
+
+import core.db
+from django.conf import settings
+import django.core.serializers.json
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("hubble", "0011_daily_efficiency_rollup"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ReportJob",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("created_at", core.db.DateTimeWithoutTZField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("report", models.CharField(max_length=50)),
+                ("params", models.JSONField(default=dict)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("Pending", "Pending"),
+                            ("Running", "Running"),
+                            ("Completed", "Completed"),
+                            ("Failed", "Failed"),
+                        ],
+                        default="Pending",
+                        max_length=20,
+                    ),
+                ),
+                ("progress", models.PositiveSmallIntegerField(default=0)),
+                (
+                    "result",
+                    models.JSONField(
+                        encoder=django.core.serializers.json.DjangoJSONEncoder, null=True
+                    ),
+                ),
+                ("error", models.TextField(null=True)),
+                ("started_at", core.db.DateTimeWithoutTZField(null=True)),
+                ("completed_at", core.db.DateTimeWithoutTZField(null=True)),
+                (
+                    "created_by",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="report_jobs",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "report_jobs",
+            },
+        ),
+        migrations.AddIndex(
+            model_name="reportjob",
+            index=models.Index(fields=["status", "created_at"], name="report_job_status_created"),
+        ),
+    ]
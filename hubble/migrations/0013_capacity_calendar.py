@@ -0,0 +1,48 @@
+# Generated by Django 4.1.13 on 2026-10-19 01:24
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("hubble", "0012_report_job"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CapacityCalendar",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("day", models.DateField()),
+                ("expected_hours", models.FloatField()),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="capacity_calendar",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "capacity_calendar",
+            },
+        ),
+        migrations.AddIndex(
+            model_name="capacitycalendar",
+            index=models.Index(fields=["day", "user"], name="capacity_calendar_day_user"),
+        ),
+        migrations.AddConstraint(
+            model_name="capacitycalendar",
+            constraint=models.UniqueConstraint(
+                fields=("user", "day"), name="capacity_calendar_unique_day"
+            ),
+        ),
+    ]
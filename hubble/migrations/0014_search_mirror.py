@@ -0,0 +1,69 @@
+# Generated by Django 4.1.13 on 2026-10-19 01:28
+
+from django.db import migrations, models
+
+# The name-like columns searched by the datatables, indexed on the upper
+# cased value which the icontains lookup compares
+TRIGRAM_INDEXES = [
+    ("batches_name_trgm", "batches", "name"),
+    ("sub_batches_name_trgm", "sub_batches", "name"),
+    ("timelines_name_trgm", "timelines", "name"),
+    ("search_mirror_value_trgm", "search_mirror", "value"),
+]
+
+
+def create_trigram_indexes(apps, schema_editor):
+    """
+    Creates the trigram indexes when the pg_trgm extension is available on
+    the server, the searches fall back to sequential scans otherwise
+    """
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+        if cursor.fetchone() is None:
+            return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for name, table, column in TRIGRAM_INDEXES:
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS {name} ON {table} USING gin (UPPER({column}) gin_trgm_ops)"
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    """
+    Drops the trigram indexes, the extension is left in place
+    """
+    for name, _, _ in TRIGRAM_INDEXES:
+        schema_editor.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("hubble", "0013_capacity_calendar"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SearchMirror",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("source", models.CharField(max_length=50)),
+                ("object_id", models.BigIntegerField()),
+                ("value", models.CharField(max_length=255, null=True)),
+            ],
+            options={
+                "db_table": "search_mirror",
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="searchmirror",
+            constraint=models.UniqueConstraint(
+                fields=("source", "object_id"), name="search_mirror_unique_object"
+            ),
+        ),
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 4.1.13 on 2026-10-19 01:32
+
+import core.db
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("hubble", "0014_search_mirror"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CurrencyRate",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("created_at", core.db.DateTimeWithoutTZField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("rate", models.FloatField()),
+                ("effective_from", models.DateField()),
+                (
+                    "currency",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="rates",
+                        to="hubble.currency",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "currency_rates",
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="currencyrate",
+            constraint=models.UniqueConstraint(
+                fields=("currency", "effective_from"), name="currency_rate_unique_day"
+            ),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 4.1.13 on 2026-10-19 01:37
+
+import core.db
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("hubble", "0015_currency_rate"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ReportSnapshot",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("created_at", core.db.DateTimeWithoutTZField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("report", models.CharField(max_length=50)),
+                ("period", models.DateField()),
+                ("data", models.BinaryField()),
+                ("row_count", models.IntegerField(default=0)),
+            ],
+            options={
+                "db_table": "report_snapshots",
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="reportsnapshot",
+            constraint=models.UniqueConstraint(
+                fields=("report", "period"), name="report_snapshot_unique_period"
+            ),
+        ),
+    ]
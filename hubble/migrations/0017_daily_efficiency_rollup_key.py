@@ -0,0 +1,31 @@
+# Generated by Django 4.1.13 on 2026-10-19 02:03
+
+from django.db import migrations, models
+
+
+def reset_rollup_watermark(apps, schema_editor):
+    # The keys of the entries rolled up so far are unknown, so the next
+    # refresh of the rollup has to be a full one
+    ReportWatermark = apps.get_model("hubble", "ReportWatermark")
+    ReportWatermark.objects.filter(name="daily_efficiency_rollup").delete()
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("hubble", "0016_report_snapshot"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DailyEfficiencyRollupKey",
+            fields=[
+                ("entry_id", models.BigIntegerField(primary_key=True, serialize=False)),
+                ("user_id", models.BigIntegerField()),
+                ("entry_date", models.DateField()),
+            ],
+            options={
+                "db_table": "daily_efficiency_rollup_keys",
+            },
+        ),
+        migrations.RunPython(reset_rollup_watermark, migrations.RunPython.noop),
+    ]
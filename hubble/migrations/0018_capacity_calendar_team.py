@@ -0,0 +1,43 @@
+# Generated by Django 4.1.13 on 2026-10-19 02:43
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def reset_calendar_watermarks(apps, schema_editor):
+    # The calendar rows have no team and the dates of the holidays are
+    # unknown, so the next refresh of the calendar has to be a full one
+    ReportWatermark = apps.get_model("hubble", "ReportWatermark")
+    ReportWatermark.objects.filter(
+        name__in=["capacity_calendar", "capacity_calendar_horizon"]
+    ).delete()
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("hubble", "0017_daily_efficiency_rollup_key"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CapacityCalendarHolidayKey",
+            fields=[
+                ("holiday_id", models.BigIntegerField(primary_key=True, serialize=False)),
+                ("date_of_holiday", models.DateField()),
+            ],
+            options={
+                "db_table": "capacity_calendar_holiday_keys",
+            },
+        ),
+        migrations.AddField(
+            model_name="capacitycalendar",
+            name="team",
+            field=models.ForeignKey(
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="capacity_calendar",
+                to="hubble.team",
+            ),
+        ),
+        migrations.RunPython(reset_calendar_watermarks, migrations.RunPython.noop),
+    ]
@@ -3,8 +3,11 @@ The code is importing various classes from different modules or files
 """
 from .assessment import Assessment
 from .batch import Batch
+from .capacity_calendar import CapacityCalendar, CapacityCalendarHolidayKey
 from .client import Client
 from .currency import Currency
+from .currency_rate import CurrencyRate
+from .daily_efficiency_rollup import DailyEfficiencyRollup, DailyEfficiencyRollupKey
 from .designation import Designation
 from .expected_user_efficiency import ExpectedUserEfficiency
 from .extension import Extension
@@ -14,6 +17,10 @@ from .module import Module
 from .project import Project
 from .project_resource import ProjectResource
 from .project_resource_position import ProjectResourcePosition
+from .report_job import ReportJob
+from .report_snapshot import ReportSnapshot
+from .report_watermark import ReportWatermark
+from .search_mirror import SearchMirror
 from .sub_batch import SubBatch
 from .sub_batch_timeline_task import SubBatchTaskTimeline
 from .task import Task
@@ -0,0 +1,411 @@
+"""
+The CapacityCalendar class is a Django model that keeps the expected working
+hours of every user per working day for the reports app
+"""
+import bisect
+import datetime
+
+from django.db import models, transaction
+from django.db.models import Exists, F, FloatField, Max, OuterRef, Q, Subquery, Sum
+
+from hubble import models as hubble_models
+
+CALENDAR_WATERMARK = "capacity_calendar"
+CALENDAR_HORIZON_WATERMARK = "capacity_calendar_horizon"
+CALENDAR_BATCH_SIZE = 2000
+
+
+def calendar_horizon(today=None):
+    """
+    Returns the last day of the calendar, i.e. the end of the next year, up to
+    which the open ended expected efficiencies are expanded
+    """
+    today = today or datetime.date.today()
+    return datetime.date(today.year + 1, 12, 31)
+
+
+def is_working_day(day, holidays, is_saturday_working):
+    """
+    Checks whether the given day is a working day for a user, Sundays and the
+    organization holidays are off and Saturdays depend on the user
+    """
+    if day in holidays or day.weekday() == 6:
+        return False
+    return day.weekday() != 5 or bool(is_saturday_working)
+
+
+def team_timelines(user_ids=None):
+    """
+    Returns the days on which the team of every user changes in the
+    timesheets along with the teams, and the day of the last timesheet entry
+    of every user. The team of a day is the team of the latest entry of the
+    user on that day
+    """
+    entries = hubble_models.TimesheetEntry.objects.all()
+    if user_ids is not None:
+        entries = entries.filter(user_id__in=user_ids)
+    rows = (
+        entries.values("user_id", "entry_date", "team_id")
+        .annotate(latest=Max("id"))
+        .order_by("user_id", "entry_date", "latest")
+        .values_list("user_id", "entry_date", "team_id")
+    )
+    timelines, last_days = {}, {}
+    for user_id, entry_date, team_id in rows.iterator(chunk_size=CALENDAR_BATCH_SIZE):
+        days, teams = timelines.setdefault(user_id, ([], []))
+        if days and days[-1] == entry_date:
+            teams[-1] = team_id
+        elif not teams or teams[-1] != team_id:
+            days.append(entry_date)
+            teams.append(team_id)
+        last_days[user_id] = entry_date
+    return timelines, last_days
+
+
+def team_on(day, timeline, last_day, current_team):
+    """
+    Returns the team of a user in effect on the given day, i.e. the team of
+    their latest timesheet entry up to that day. The days after their last
+    entry and the users without entries fall back to their current team
+    """
+    if timeline is None or day > last_day:
+        return current_team
+    days, teams = timeline
+    return teams[max(bisect.bisect_right(days, day) - 1, 0)]
+
+
+def employment_end(deleted_at, is_employed, updated_at, last_day):
+    """
+    Returns the last day of employment of a user who has left, i.e. the day
+    they were deleted or, when they are only marked as no longer employed,
+    the day of their last timesheet entry. The employed users have none
+    """
+    if deleted_at is not None:
+        return deleted_at.date()
+    if is_employed is False:
+        return last_day or updated_at.date()
+    return None
+
+
+class CapacityCalendarQuerySet(models.QuerySet):
+    """
+    Provide the report query methods for the capacity calendar
+    """
+
+    def date_range(self, from_date, to_date):
+        """
+        Filters the calendar days based on the given date range
+        """
+        return self.filter(day__range=(from_date, to_date))
+
+    def user_capacity(self):
+        """
+        Annotates the calendar with the expected hours of every user
+        """
+        return (
+            self.values("user_id")
+            .annotate(expected_hours=Sum("expected_hours", output_field=FloatField()))
+            .order_by("user_id")
+        )
+
+    def daily_team_capacity(self):
+        """
+        Annotates the calendar with the expected hours of every team per day,
+        based on the team of the users on that day
+        """
+        return (
+            self.filter(team__isnull=False)
+            .values("day", "team_id")
+            .annotate(expected_hours=Sum("expected_hours", output_field=FloatField()))
+            .order_by()
+        )
+
+    def team_capacity(self):
+        """
+        Annotates the calendar with the expected hours of every team, based on
+        the team of the users on every day
+        """
+        return (
+            self.filter(team__isnull=False)
+            .values("team__name")
+            .annotate(
+                expected_hours=Sum("expected_hours", output_field=FloatField()),
+                pk=F("team_id"),
+            )
+            .order_by("team_id")
+        )
+
+
+class CapacityCalendarManager(models.Manager.from_queryset(CapacityCalendarQuerySet)):
+    """
+    Custom manager for the CapacityCalendar model
+    """
+
+    def refresh(self, full=False, today=None):
+        """
+        Rebuilds the calendar days affected by the changes since the last
+        refresh and returns the number of rows written.
+
+        Changes of the expected efficiencies or of a user rebuild every day of
+        that user, and so do the changed timesheet entries which don't match
+        the team of their day in the calendar. Changes of the holidays rebuild
+        the holiday dates of every user, along with the dates the holidays were
+        recorded on by the previous refresh, which frees the old date of a
+        moved holiday. The whole table is rebuilt with `full=True` and when the
+        horizon moves to the next year.
+        """
+        horizon = calendar_horizon(today)
+        stored_horizon = hubble_models.ReportWatermark.get_value(CALENDAR_HORIZON_WATERMARK)
+        if stored_horizon is None or stored_horizon.date() != horizon:
+            full = True
+        watermark = None if full else hubble_models.ReportWatermark.get_value(CALENDAR_WATERMARK)
+
+        sources = (
+            hubble_models.ExpectedUserEfficiency.objects.with_trashed(),
+            hubble_models.Holiday.objects.with_trashed(),
+            hubble_models.User.objects.with_trashed(),
+            hubble_models.TimesheetEntry.objects.all(),
+        )
+        latest = max(
+            (
+                value
+                for value in (
+                    source.aggregate(latest=Max("updated_at"))["latest"] for source in sources
+                )
+                if value is not None
+            ),
+            default=None,
+        )
+        if not full and (latest is None or (watermark is not None and latest <= watermark)):
+            return 0
+
+        user_ids, days = None, ()
+        rows = self.all()
+        if watermark is not None:
+            # The entries whose team is already the team of their day leave
+            # the calendar of their user as it is
+            moved_entries = (
+                hubble_models.TimesheetEntry.objects.filter(updated_at__gt=watermark)
+                .exclude(
+                    Exists(
+                        self.filter(
+                            user_id=OuterRef("user_id"),
+                            day=OuterRef("entry_date"),
+                            team_id=OuterRef("team_id"),
+                        )
+                    )
+                )
+                .values_list("user_id", flat=True)
+            )
+            user_ids = (
+                set(
+                    hubble_models.ExpectedUserEfficiency.objects.with_trashed()
+                    .filter(updated_at__gt=watermark)
+                    .values_list("user_id", flat=True)
+                )
+                | set(
+                    hubble_models.User.objects.with_trashed()
+                    .filter(updated_at__gt=watermark)
+                    .values_list("id", flat=True)
+                )
+                | set(moved_entries)
+            )
+            changed_holidays = list(
+                hubble_models.Holiday.objects.with_trashed()
+                .filter(updated_at__gt=watermark)
+                .values_list("id", "date_of_holiday")
+            )
+            days = {day for _, day in changed_holidays} | set(
+                CapacityCalendarHolidayKey.objects.filter(
+                    holiday_id__in=[holiday_id for holiday_id, _ in changed_holidays]
+                ).values_list("date_of_holiday", flat=True)
+            )
+            rows = rows.filter(Q(user_id__in=user_ids) | Q(day__in=days))
+
+        written = 0
+        with transaction.atomic():
+            rows.delete()
+            batch = []
+            for row in self.expand(horizon, user_ids, days):
+                batch.append(row)
+                if len(batch) == CALENDAR_BATCH_SIZE:
+                    written += len(self.bulk_create(batch))
+                    batch = []
+            written += len(self.bulk_create(batch))
+            if watermark is None:
+                CapacityCalendarHolidayKey.objects.all().delete()
+                CapacityCalendarHolidayKey.objects.record(
+                    hubble_models.Holiday.objects.with_trashed().values_list(
+                        "id", "date_of_holiday"
+                    )
+                )
+            else:
+                CapacityCalendarHolidayKey.objects.record(changed_holidays)
+            if latest is not None:
+                hubble_models.ReportWatermark.set_value(CALENDAR_WATERMARK, latest)
+            hubble_models.ReportWatermark.set_value(
+                CALENDAR_HORIZON_WATERMARK,
+                datetime.datetime.combine(horizon, datetime.time.min),
+            )
+        return written
+
+    def expand(self, horizon, user_ids=None, days=()):
+        """
+        Yields the calendar rows of the expected efficiency intervals, of every
+        user or only of the given users and on the given days. When several
+        intervals overlap, the one which starts last is effective like in the
+        timesheet reports. The intervals end with the employment of the user,
+        and every day is attributed to the team of the user on that day
+        """
+        efficiencies = hubble_models.ExpectedUserEfficiency.objects.filter(
+            effective_from__lte=horizon
+        )
+        if user_ids is not None:
+            changed = Q(user_id__in=user_ids)
+            if days:
+                changed |= Q(effective_from__lte=max(days)) & (
+                    Q(effective_to__gte=min(days)) | Q(effective_to__isnull=True)
+                )
+            efficiencies = efficiencies.filter(changed)
+        efficiencies = efficiencies.order_by("user_id", "effective_from").values_list(
+            "user_id", "effective_from", "effective_to", "expected_efficiency"
+        )
+        holidays = set(
+            hubble_models.Holiday.objects.filter(date_of_holiday__lte=horizon).values_list(
+                "date_of_holiday", flat=True
+            )
+        )
+        users = {
+            user_id: (is_saturday_working, team_id, deleted_at, is_employed, updated_at)
+            for user_id, is_saturday_working, team_id, deleted_at, is_employed, updated_at in (
+                hubble_models.User.objects.with_trashed().values_list(
+                    "id",
+                    "is_saturday_working",
+                    "team_id",
+                    "deleted_at",
+                    "is_employed",
+                    "updated_at",
+                )
+            )
+        }
+        # The holiday dates are rebuilt for every user, whose teams are needed then
+        timelines, last_days = team_timelines(None if days else user_ids)
+
+        calendar = {}
+        for user_id, effective_from, effective_to, expected_efficiency in efficiencies:
+            is_saturday_working, _, deleted_at, is_employed, updated_at = users[user_id]
+            last_day = min(
+                effective_to or horizon,
+                employment_end(deleted_at, is_employed, updated_at, last_days.get(user_id))
+                or horizon,
+            )
+            if user_ids is not None and user_id not in user_ids:
+                interval_days = [day for day in days if effective_from <= day <= last_day]
+            else:
+                interval_days = (
+                    effective_from + datetime.timedelta(offset)
+                    for offset in range((last_day - effective_from).days + 1)
+                )
+            for day in interval_days:
+                if is_working_day(day, holidays, is_saturday_working):
+                    calendar[user_id, day] = expected_efficiency
+
+        for (user_id, day), expected_hours in calendar.items():
+            team_id = team_on(
+                day, timelines.get(user_id), last_days.get(user_id), users[user_id][1]
+            )
+            yield self.model(
+                user_id=user_id, team_id=team_id, day=day, expected_hours=expected_hours
+            )
+
+
+class CapacityCalendarHolidayKeyManager(models.Manager):
+    """
+    Custom manager for the CapacityCalendarHolidayKey model
+    """
+
+    def record(self, holidays):
+        """
+        Stores the given `(holiday_id, date_of_holiday)` dates of the holidays,
+        updating the ones of the holidays already recorded
+        """
+        return self.bulk_create(
+            [
+                self.model(holiday_id=holiday_id, date_of_holiday=date_of_holiday)
+                for holiday_id, date_of_holiday in holidays
+            ],
+            update_conflicts=True,
+            unique_fields=["holiday_id"],
+            update_fields=["date_of_holiday"],
+        )
+
+
+class CapacityCalendar(models.Model):
+    """
+    Store the expected working hours of a user on a working day, along with
+    the team of the user on that day. Weekends and
+    holidays have no rows, which keeps the table narrow enough to be joined by
+    the reports instead of expanding the efficiency intervals on every query
+    """
+
+    user = models.ForeignKey(
+        "hubble.User",
+        models.CASCADE,
+        related_name="capacity_calendar",
+    )
+    team = models.ForeignKey(
+        "hubble.Team",
+        models.CASCADE,
+        null=True,
+        related_name="capacity_calendar",
+    )
+    day = models.DateField()
+    expected_hours = models.FloatField()
+
+    objects = CapacityCalendarManager()
+
+    class Meta:
+        """
+        Meta class for defining class behavior and properties.
+        """
+
+        db_table = "capacity_calendar"
+        constraints = [
+            models.UniqueConstraint(fields=["user", "day"], name="capacity_calendar_unique_day")
+        ]
+        indexes = [
+            models.Index(fields=["day", "user"], name="capacity_calendar_day_user"),
+        ]
+
+    @classmethod
+    def team_capacity_within(cls, window, team="team_id"):
+        """
+        Returns a subquery which sums the expected hours of the outer query's
+        team within the given `(from_date, to_date)` window
+        """
+        return Subquery(
+            cls.objects.date_range(*window)
+            .filter(team_id=OuterRef(team))
+            .values("team_id")
+            .annotate(expected_hours=Sum("expected_hours", output_field=FloatField()))
+            .values("expected_hours")
+        )
+
+
+class CapacityCalendarHolidayKey(models.Model):
+    """
+    Store the date a holiday was last applied to the capacity calendar on, so
+    that a holiday moved to another date frees its old date
+    """
+
+    holiday_id = models.BigIntegerField(primary_key=True)
+    date_of_holiday = models.DateField()
+
+    objects = CapacityCalendarHolidayKeyManager()
+
+    class Meta:
+        """
+        Meta class for defining class behavior and properties.
+        """
+
+        db_table = "capacity_calendar_holiday_keys"
@@ -0,0 +1,50 @@
+"""
+The CurrencyRate class is a Django model that keeps the exchange rates of
+the project currencies for the revenue reports
+"""
+from django.db import models
+from django.db.models import OuterRef, Subquery
+
+from core import db
+
+
+class CurrencyRate(db.BaseModel):
+    """
+    Store the value of one unit of a currency in the base currency of the
+    reports, effective from the given day until the next rate of the currency
+    """
+
+    currency = models.ForeignKey(
+        "hubble.Currency",
+        models.CASCADE,
+        related_name="rates",
+    )
+    rate = models.FloatField()
+    effective_from = models.DateField()
+
+    class Meta:
+        """
+        Meta class for defining class behavior and properties.
+        """
+
+        db_table = "currency_rates"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["currency", "effective_from"], name="currency_rate_unique_day"
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.currency_id}: {self.rate}"
+
+    @classmethod
+    def effective_rate(cls, currency="project__currency_id", day="entry_date"):
+        """
+        Returns a subquery which resolves the rate of the outer query's
+        currency which is effective on the outer query's day
+        """
+        return Subquery(
+            cls.objects.filter(currency_id=OuterRef(currency), effective_from__lte=OuterRef(day))
+            .order_by("-effective_from")
+            .values("rate")[:1]
+        )
@@ -0,0 +1,236 @@
+"""
+The DailyEfficiencyRollup class is a Django model that keeps the timesheet
+hours pre-aggregated per team, user and day for the reports app
+"""
+from django.db import models, transaction
+from django.db.models import Count, Max, Q, Sum
+
+from core import db
+from hubble import models as hubble_models
+
+ROLLUP_WATERMARK = "daily_efficiency_rollup"
+ROLLUP_BATCH_SIZE = 2000
+
+
+def chunked(values, size=ROLLUP_BATCH_SIZE):
+    """
+    Yields the given list in chunks of the given size
+    """
+    for index in range(0, len(values), size):
+        yield values[index : index + size]
+
+
+class DailyEfficiencyRollupQuerySet(models.QuerySet):
+    """
+    Provide the report query methods for the rollup table
+    """
+
+    def date_range(self, from_date, to_date):
+        """
+        Filters the rollup rows based on the given date range, skipping the
+        days which have no expected efficiency for the user
+        """
+        return self.filter(
+            entry_date__range=(from_date, to_date),
+            expected_efficiency__isnull=False,
+        )
+
+
+class DailyEfficiencyRollupManager(models.Manager.from_queryset(DailyEfficiencyRollupQuerySet)):
+    """
+    Custom manager for the DailyEfficiencyRollup model
+    """
+
+    def refresh(self, full=False):
+        """
+        Rebuilds the rollup rows of every (user, day) touched since the last
+        refresh and returns the number of rows written.
+
+        Timesheet entries are tracked through their `updated_at` column and
+        changes of the expected efficiencies rebuild every day of the user.
+        The keys an entry was last rolled up under are kept in
+        `DailyEfficiencyRollupKey`, so that the old day and user of an edited
+        entry are rebuilt along with the new ones. Hard deleted timesheet
+        entries can't be detected incrementally, so `full=True` rebuilds the
+        whole table.
+        """
+        watermark = None if full else hubble_models.ReportWatermark.get_value(ROLLUP_WATERMARK)
+        latest_entry = hubble_models.TimesheetEntry.objects.aggregate(latest=Max("updated_at"))[
+            "latest"
+        ]
+        latest_efficiency = hubble_models.ExpectedUserEfficiency.objects.with_trashed().aggregate(
+            latest=Max("updated_at")
+        )["latest"]
+        latest = max(
+            (value for value in (latest_entry, latest_efficiency) if value is not None),
+            default=None,
+        )
+        if latest is None or (watermark is not None and latest <= watermark):
+            return 0
+
+        entries = hubble_models.TimesheetEntry.objects.all()
+        rollups = self.all()
+        if watermark is not None:
+            changed_keys = list(
+                hubble_models.TimesheetEntry.objects.filter(updated_at__gt=watermark).values_list(
+                    "id", "user_id", "entry_date"
+                )
+            )
+            changed_days = {(user_id, entry_date) for _, user_id, entry_date in changed_keys}
+            for entry_ids in chunked([entry_id for entry_id, _, _ in changed_keys]):
+                changed_days.update(
+                    DailyEfficiencyRollupKey.objects.filter(entry_id__in=entry_ids).values_list(
+                        "user_id", "entry_date"
+                    )
+                )
+            changed_filter = Q(
+                user_id__in=hubble_models.ExpectedUserEfficiency.objects.with_trashed()
+                .filter(updated_at__gt=watermark)
+                .values("user_id")
+            )
+            days_by_user = {}
+            for user_id, entry_date in changed_days:
+                days_by_user.setdefault(user_id, set()).add(entry_date)
+            for user_id, days in days_by_user.items():
+                changed_filter |= Q(user_id=user_id, entry_date__in=days)
+            entries = entries.filter(changed_filter)
+            rollups = rollups.filter(changed_filter)
+
+        rows = (
+            entries.values("team_id", "user_id", "entry_date")
+            .annotate(
+                authorized=Sum("authorized_hours"),
+                billed=Sum("billed_hours"),
+                working=Sum("working_hours"),
+                entry_count=Count("id"),
+                expected_efficiency=hubble_models.ExpectedUserEfficiency.effective_efficiency(),
+            )
+            .order_by()
+        )
+
+        written = 0
+        with transaction.atomic():
+            rollups.delete()
+            batch = []
+            for row in rows.iterator(chunk_size=ROLLUP_BATCH_SIZE):
+                batch.append(
+                    self.model(
+                        team_id=row["team_id"],
+                        user_id=row["user_id"],
+                        entry_date=row["entry_date"],
+                        authorized_hours=row["authorized"],
+                        billed_hours=row["billed"],
+                        working_hours=row["working"],
+                        entry_count=row["entry_count"],
+                        expected_efficiency=row["expected_efficiency"],
+                    )
+                )
+                if len(batch) == ROLLUP_BATCH_SIZE:
+                    written += len(self.bulk_create(batch))
+                    batch = []
+            written += len(self.bulk_create(batch))
+            if watermark is None:
+                DailyEfficiencyRollupKey.objects.all().delete()
+                DailyEfficiencyRollupKey.objects.record(
+                    hubble_models.TimesheetEntry.objects.values_list(
+                        "id", "user_id", "entry_date"
+                    ).iterator(chunk_size=ROLLUP_BATCH_SIZE)
+                )
+            else:
+                # The keys rebuilt above are recorded, an entry edited since
+                # then keeps its rebuilt key so that the next refresh frees it
+                DailyEfficiencyRollupKey.objects.record(changed_keys)
+            hubble_models.ReportWatermark.set_value(ROLLUP_WATERMARK, latest)
+        return written
+
+
+class DailyEfficiencyRollupKeyManager(models.Manager):
+    """
+    Custom manager for the DailyEfficiencyRollupKey model
+    """
+
+    def record(self, keys):
+        """
+        Stores the given `(entry_id, user_id, entry_date)` keys of the
+        timesheet entries
+        """
+        batch = []
+        for entry_id, user_id, entry_date in keys:
+            batch.append(self.model(entry_id=entry_id, user_id=user_id, entry_date=entry_date))
+            if len(batch) == ROLLUP_BATCH_SIZE:
+                self.upsert(batch)
+                batch = []
+        self.upsert(batch)
+
+    def upsert(self, keys):
+        """
+        Inserts the given keys, updating the ones of the entries already recorded
+        """
+        return self.bulk_create(
+            keys,
+            update_conflicts=True,
+            unique_fields=["entry_id"],
+            update_fields=["user_id", "entry_date"],
+        )
+
+
+class DailyEfficiencyRollup(db.BaseModel):
+    """
+    Store the authorized, billed and working hours of a user in a team for a
+    day along with the expected efficiency which is effective on that day
+    """
+
+    team = models.ForeignKey(
+        "hubble.Team",
+        models.CASCADE,
+        related_name="daily_efficiency_rollups",
+    )
+    user = models.ForeignKey(
+        "hubble.User",
+        models.CASCADE,
+        related_name="daily_efficiency_rollups",
+    )
+    entry_date = models.DateField()
+    authorized_hours = models.FloatField(default=0)
+    billed_hours = models.FloatField(default=0)
+    working_hours = models.FloatField(default=0)
+    entry_count = models.IntegerField(default=0)
+    expected_efficiency = models.FloatField(null=True)
+
+    objects = DailyEfficiencyRollupManager()
+
+    class Meta:
+        """
+        Meta class for defining class behavior and properties.
+        """
+
+        db_table = "daily_efficiency_rollups"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["team", "user", "entry_date"],
+                name="daily_efficiency_rollup_unique_day",
+            )
+        ]
+        indexes = [
+            models.Index(fields=["entry_date", "team"], name="daily_eff_rollup_date_team"),
+        ]
+
+
+class DailyEfficiencyRollupKey(models.Model):
+    """
+    Store the user and the day a timesheet entry was last rolled up under.
+    The team of a day is rebuilt along with the day, so it isn't kept
+    """
+
+    entry_id = models.BigIntegerField(primary_key=True)
+    user_id = models.BigIntegerField()
+    entry_date = models.DateField()
+
+    objects = DailyEfficiencyRollupKeyManager()
+
+    class Meta:
+        """
+        Meta class for defining class behavior and properties.
+        """
+
+        db_table = "daily_efficiency_rollup_keys"
@@ -3,6 +3,7 @@ The ExpectedUserEfficiency class is a Django model that represents the
 expected efficiency of a user with the required fields
 """
 from django.db import models
+from django.db.models import Exists, OuterRef, Q, Subquery
 
 from core import db
 
@@ -36,3 +37,34 @@ class ExpectedUserEfficiency(db.SoftDeleteWithBaseModel):
 
         managed = False
         db_table = "expected_user_efficiencies"
+
+    @classmethod
+    def effective_on(cls, user="user_id", day="entry_date"):
+        """
+        Returns the expected efficiencies which are effective for the outer
+        query's user on the outer query's day
+        """
+        return cls.objects.filter(
+            user_id=OuterRef(user), effective_from__lte=OuterRef(day)
+        ).filter(Q(effective_to__gte=OuterRef(day)) | Q(effective_to__isnull=True))
+
+    @classmethod
+    def effective_efficiency(cls, user="user_id", day="entry_date"):
+        """
+        Returns a subquery which resolves the one expected efficiency that is
+        effective for the outer query's user on the outer query's day
+        """
+        return Subquery(
+            cls.effective_on(user, day)
+            .order_by("-effective_from")
+            .values("expected_efficiency")[:1]
+        )
+
+    @classmethod
+    def has_effective_efficiency(cls, user="user_id", day="entry_date"):
+        """
+        Returns an `EXISTS` subquery which checks whether an expected efficiency
+        is effective for the outer query's user on the outer query's day, which
+        the database runs as a semi join instead of a subquery per row
+        """
+        return Exists(cls.effective_on(user, day))
@@ -3,8 +3,11 @@ The ProjectResource class is a Django model that represents project
 resources and their attributes
 """
 from django.db import models
+from django.db.models import F, FloatField, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce, Greatest, Least, Round
 
 from core import db
+from hubble import models as hubble_models
 
 
 class ProjectResource(db.SoftDeleteWithBaseModel):
@@ -56,3 +59,87 @@ class ProjectResource(db.SoftDeleteWithBaseModel):
 
         managed = False
         db_table = "project_resources"
+
+    @classmethod
+    def effective_rate(cls, user="user_id", project="project_id", day="entry_date"):
+        """
+        Returns a subquery which resolves the hourly rate of the outer query's
+        user on the outer query's project, allotted on the outer query's day
+        """
+        return Subquery(
+            cls.objects.filter(
+                user_id=OuterRef(user),
+                project_id=OuterRef(project),
+                charge_by_hour__isnull=False,
+            )
+            .filter(Q(allotted_from__lte=OuterRef(day)) | Q(allotted_from__isnull=True))
+            .filter(Q(removed_on__gte=OuterRef(day)) | Q(removed_on__isnull=True))
+            .order_by(F("allotted_from").desc(nulls_last=True))
+            .values("charge_by_hour")[:1]
+        )
+
+    @classmethod
+    def utilisation_hours(cls, from_date, to_date):
+        """
+        Returns the planned and actual hours of every resource allotted within
+        the date range. The allocation window of the resource is clipped to
+        the range and joined with the capacity calendar of the user for the
+        planned hours, and with the timesheets of the user on the project for
+        the actual hours
+        """
+        window = {
+            "day__gte": OuterRef("window_from"),
+            "day__lte": OuterRef("window_to"),
+        }
+        expected_hours = (
+            hubble_models.CapacityCalendar.objects.filter(user_id=OuterRef("user_id"), **window)
+            .values("user_id")
+            .annotate(total=Sum("expected_hours"))
+            .values("total")
+        )
+        actual_hours = (
+            hubble_models.TimesheetEntry.objects.filter(
+                user_id=OuterRef("user_id"),
+                project_id=OuterRef("project_id"),
+                entry_date__gte=OuterRef("window_from"),
+                entry_date__lte=OuterRef("window_to"),
+            )
+            .values("user_id")
+            .annotate(total=Sum("authorized_hours"))
+            .values("total")
+        )
+        return (
+            cls.objects.filter(
+                user__isnull=False,
+                project__isnull=False,
+                utilisation__isnull=False,
+            )
+            .filter(Q(allotted_from__lte=to_date) | Q(allotted_from__isnull=True))
+            .filter(Q(removed_on__gte=from_date) | Q(removed_on__isnull=True))
+            .annotate(
+                window_from=Greatest(
+                    Coalesce("allotted_from", Value(from_date)), Value(from_date)
+                ),
+                window_to=Least(Coalesce("removed_on", Value(to_date)), Value(to_date)),
+            )
+            .annotate(
+                expected_hours=Coalesce(Subquery(expected_hours), 0, output_field=FloatField()),
+                actual_hours=Coalesce(Subquery(actual_hours), 0, output_field=FloatField()),
+            )
+            .annotate(
+                planned_hours=Round(
+                    F("expected_hours") * F("utilisation") / 100.0, 2, output_field=FloatField()
+                ),
+            )
+            .values(
+                "user_id",
+                "project_id",
+                "utilisation",
+                "expected_hours",
+                "planned_hours",
+                "actual_hours",
+                user_name=F("user__name"),
+                project_name=F("project__name"),
+            )
+            .order_by("user__name", "project__name")
+        )
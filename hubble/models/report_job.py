@@ -0,0 +1,123 @@
+"""
+The ReportJob class is a Django model that stores the report requests which
+are computed in the background by the report job worker
+"""
+import datetime
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models, transaction
+from django.db.models import Q
+
+from core import db
+from core.constants import (
+    REPORT_JOB_STALE_TIMEOUT,
+    REPORT_JOB_STATUS_PENDING,
+    REPORT_JOB_STATUS_RUNNING,
+    REPORT_JOB_STATUSES,
+)
+
+
+class ReportJobManager(models.Manager):
+    """
+    Custom manager for the ReportJob model
+    """
+
+    def claim_next(self):
+        """
+        Marks the oldest pending job as running and returns it, or None if
+        there is nothing to do. Locked rows are skipped, so that several
+        workers can poll the same table
+        """
+        stale_before = datetime.datetime.now() - datetime.timedelta(
+            seconds=REPORT_JOB_STALE_TIMEOUT
+        )
+        with transaction.atomic():
+            job = (
+                self.select_for_update(skip_locked=True)
+                .filter(
+                    Q(status=REPORT_JOB_STATUS_PENDING)
+                    | Q(status=REPORT_JOB_STATUS_RUNNING, updated_at__lt=stale_before)
+                )
+                .order_by("created_at")
+                .first()
+            )
+            if job is not None:
+                job.status = REPORT_JOB_STATUS_RUNNING
+                job.progress = 0
+                job.started_at = datetime.datetime.now()
+                job.save(update_fields=["status", "progress", "started_at", "updated_at"])
+        return job
+
+
+class ReportJob(db.BaseModel):
+    """
+    Store the parameters, the progress and the result of a report which is
+    computed in the background
+    """
+
+    report = models.CharField(max_length=50)
+    params = models.JSONField(default=dict)
+    status = models.CharField(
+        max_length=20, choices=REPORT_JOB_STATUSES, default=REPORT_JOB_STATUS_PENDING
+    )
+    progress = models.PositiveSmallIntegerField(default=0)
+    result = models.JSONField(null=True, encoder=DjangoJSONEncoder)
+    error = models.TextField(null=True)
+    started_at = db.DateTimeWithoutTZField(null=True)
+    completed_at = db.DateTimeWithoutTZField(null=True)
+    created_by = models.ForeignKey(
+        "hubble.User",
+        models.CASCADE,
+        related_name="report_jobs",
+    )
+
+    objects = ReportJobManager()
+
+    class Meta:
+        """
+        Meta class for defining class behavior and properties.
+        """
+
+        db_table = "report_jobs"
+        indexes = [
+            models.Index(fields=["status", "created_at"], name="report_job_status_created"),
+        ]
+
+    def __str__(self):
+        return f"{self.report} ({self.status})"
+
+    def owned_jobs(self):
+        """
+        Returns the queryset of the job as long as it is still run by the
+        worker which claimed it, so that a worker whose job has been reclaimed
+        in the meantime writes nothing
+        """
+        return ReportJob.objects.filter(
+            pk=self.pk, status=REPORT_JOB_STATUS_RUNNING, started_at=self.started_at
+        )
+
+    def heartbeat(self, progress):
+        """
+        Stores the progress of the job, in percent, which also marks the job
+        as alive. Returns False if the job has been reclaimed by another worker
+        """
+        self.progress = progress
+        return bool(
+            self.owned_jobs().update(progress=progress, updated_at=datetime.datetime.now())
+        )
+
+    def finish(self):
+        """
+        Stores the status, the result or the error of the finished job. Returns
+        False if the job has been reclaimed by another worker
+        """
+        return bool(
+            self.owned_jobs().update(
+                status=self.status,
+                progress=self.progress,
+                result=self.result,
+                error=self.error,
+                completed_at=self.completed_at,
+                updated_at=datetime.datetime.now(),
+            )
+        )
@@ -0,0 +1,77 @@
+"""
+The ReportSnapshot class is a Django model that keeps the frozen result of a
+report for a closed month
+"""
+import json
+import zlib
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+
+from core import db
+
+
+class ReportSnapshotManager(models.Manager):
+    """
+    Custom manager for the ReportSnapshot model
+    """
+
+    def freeze(self, report, period, rows, replace=False):
+        """
+        Stores the rows of the report for the month which starts on the given
+        day and returns the snapshot along with whether it has been written.
+        The snapshots are immutable, so an existing one is only overwritten
+        with `replace=True`
+        """
+        data = zlib.compress(json.dumps(rows, cls=DjangoJSONEncoder).encode())
+        if not replace:
+            snapshot, created = self.get_or_create(
+                report=report,
+                period=period,
+                defaults={"data": data, "row_count": len(rows)},
+            )
+            return snapshot, created
+        snapshot, _ = self.update_or_create(
+            report=report,
+            period=period,
+            defaults={"data": data, "row_count": len(rows)},
+        )
+        return snapshot, True
+
+    def thaw(self, report, period):
+        """
+        Returns the rows of the report for the month which starts on the given
+        day, or None when the month has not been frozen
+        """
+        data = self.filter(report=report, period=period).values_list("data", flat=True).first()
+        if data is None:
+            return None
+        return json.loads(zlib.decompress(data))
+
+
+class ReportSnapshot(db.BaseModel):
+    """
+    Store the rows of a report for a closed month as compressed JSON
+    """
+
+    report = models.CharField(max_length=50)
+    period = models.DateField()
+    data = models.BinaryField()
+    row_count = models.IntegerField(default=0)
+
+    objects = ReportSnapshotManager()
+
+    class Meta:
+        """
+        Meta class for defining class behavior and properties.
+        """
+
+        db_table = "report_snapshots"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["report", "period"], name="report_snapshot_unique_period"
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.report} ({self.period:%Y-%m})"
@@ -0,0 +1,41 @@
+"""
+The ReportWatermark class is a Django model that remembers how far the
+report rollups have been refreshed
+"""
+from django.db import models
+
+from core import db
+
+
+class ReportWatermark(db.BaseModel):
+    """
+    Store the last source timestamp consumed by an incremental report refresh
+    """
+
+    name = models.CharField(max_length=100, unique=True)
+    value = db.DateTimeWithoutTZField(null=True)
+
+    class Meta:
+        """
+        Meta class for defining class behavior and properties.
+        """
+
+        db_table = "report_watermarks"
+
+    def __str__(self):
+        return str(self.name)
+
+    @classmethod
+    def get_value(cls, name):
+        """
+        Returns the stored watermark for the given name, or None if the
+        refresh has never run
+        """
+        return cls.objects.filter(name=name).values_list("value", flat=True).first()
+
+    @classmethod
+    def set_value(cls, name, value):
+        """
+        Stores the watermark for the given name
+        """
+        cls.objects.update_or_create(name=name, defaults={"value": value})
@@ -0,0 +1,158 @@
+"""
+The SearchMirror class is a Django model that keeps a local copy of the
+name-like columns of the unmanaged hubble tables, so that they can be
+searched through a trigram index
+"""
+from django.core.cache import cache
+from django.db import models, transaction
+from django.db.models import Max, Q
+
+from hubble import models as hubble_models
+
+# The mirrored sources, as the model and the column which is copied
+SEARCH_MIRROR_SOURCES = {
+    "users": ("User", "name"),
+    "teams": ("Team", "name"),
+    "projects": ("Project", "name"),
+}
+SEARCH_MIRROR_BATCH_SIZE = 2000
+# The mirror is checked against its source at most once per interval while searching
+SEARCH_MIRROR_CHECK_INTERVAL = 30
+
+
+def watermark_name(source):
+    """
+    Returns the name of the watermark of a mirrored source
+    """
+    return f"search_mirror:{source}"
+
+
+def ready_cache_key(source):
+    """
+    Returns the cache key of the readiness of the mirror of a source
+    """
+    return f"search-mirror-ready:{source}"
+
+
+class SearchMirrorQuerySet(models.QuerySet):
+    """
+    Provide the search query methods for the mirror
+    """
+
+    def matching(self, source, terms):
+        """
+        Returns the ids of the source rows whose value contains any of the
+        given terms, case insensitively. The predicates are pushed down to
+        the trigram index of the mirror
+        """
+        terms_filter = Q()
+        for term in terms:
+            terms_filter |= Q(value__icontains=term)
+        return self.filter(terms_filter, source=source).values("object_id")
+
+
+class SearchMirrorManager(models.Manager.from_queryset(SearchMirrorQuerySet)):
+    """
+    Custom manager for the SearchMirror model
+    """
+
+    @staticmethod
+    def source_for(model, field_name):
+        """
+        Returns the mirrored source of the given model and column, if any
+        """
+        for source, (model_name, mirrored_field) in SEARCH_MIRROR_SOURCES.items():
+            if model.__name__ == model_name and field_name == mirrored_field:
+                return source
+        return None
+
+    def is_ready(self, source):
+        """
+        Checks whether the mirror of the source is up to date, i.e. its
+        watermark has caught up with the latest change of the source. The
+        mirror is only written by the `refresh_search_mirror` command, and the
+        searches fall back to the source column while it is behind
+        """
+        ready = cache.get(ready_cache_key(source))
+        if ready is None:
+            model_name, _ = SEARCH_MIRROR_SOURCES[source]
+            watermark = hubble_models.ReportWatermark.get_value(watermark_name(source))
+            latest = (
+                getattr(hubble_models, model_name)
+                .objects.with_trashed()
+                .aggregate(latest=Max("updated_at"))["latest"]
+            )
+            ready = watermark is not None and (latest is None or latest <= watermark)
+            cache.set(ready_cache_key(source), ready, SEARCH_MIRROR_CHECK_INTERVAL)
+        return ready
+
+    def refresh(self, sources=None, full=False):
+        """
+        Copies the rows of the sources changed since the last refresh into
+        the mirror and returns the number of rows written. The rows are
+        tracked through their `updated_at` column, so hard deleted rows are
+        only dropped by a refresh with `full=True`
+        """
+        written = 0
+        for source in sources or SEARCH_MIRROR_SOURCES:
+            model_name, field_name = SEARCH_MIRROR_SOURCES[source]
+            rows = getattr(hubble_models, model_name).objects.with_trashed()
+            watermark = (
+                None if full else hubble_models.ReportWatermark.get_value(watermark_name(source))
+            )
+            latest = rows.aggregate(latest=Max("updated_at"))["latest"]
+            if latest is None or (watermark is not None and latest <= watermark):
+                continue
+            if watermark is not None:
+                rows = rows.filter(updated_at__gt=watermark)
+
+            with transaction.atomic():
+                if watermark is None:
+                    self.filter(source=source).delete()
+                batch = []
+                for object_id, value in rows.values_list("id", field_name).iterator(
+                    chunk_size=SEARCH_MIRROR_BATCH_SIZE
+                ):
+                    batch.append(self.model(source=source, object_id=object_id, value=value))
+                    if len(batch) == SEARCH_MIRROR_BATCH_SIZE:
+                        written += len(self.upsert(batch))
+                        batch = []
+                written += len(self.upsert(batch))
+                hubble_models.ReportWatermark.set_value(watermark_name(source), latest)
+            cache.delete(ready_cache_key(source))
+        return written
+
+    def upsert(self, rows):
+        """
+        Inserts the given mirror rows, updating the value of the existing ones
+        """
+        return self.bulk_create(
+            rows,
+            update_conflicts=True,
+            unique_fields=["source", "object_id"],
+            update_fields=["value"],
+        )
+
+
+class SearchMirror(models.Model):
+    """
+    Store the value of a name-like column of a row of an unmanaged table
+    """
+
+    source = models.CharField(max_length=50)
+    object_id = models.BigIntegerField()
+    value = models.CharField(max_length=255, null=True)
+
+    objects = SearchMirrorManager()
+
+    class Meta:
+        """
+        Meta class for defining class behavior and properties.
+        """
+
+        db_table = "search_mirror"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["source", "object_id"], name="search_mirror_unique_object"
+            )
+        ]
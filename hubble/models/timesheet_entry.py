@@ -1,14 +1,77 @@
 """
 The TimesheetEntry class is a model that represents a timesheet entry
 """
-from django.db import models
-from django.db.models import Case, CharField, F, FloatField, Func, Q, Sum, Value, When
-from django.db.models.functions import Coalesce, Round
-from django.utils import timezone
+from django.db import connections, models
+from django.db.models import (
+    Avg,
+    Case,
+    CharField,
+    F,
+    FloatField,
+    Func,
+    Q,
+    Sum,
+    Value,
+    When,
+)
+from django.db.models.functions import Coalesce, NullIf, Round
 
 from core import db
 
-from . import Module, Project, Task
+from . import (
+    CapacityCalendar,
+    CurrencyRate,
+    ExpectedUserEfficiency,
+    Module,
+    Project,
+    ProjectResource,
+    Task,
+)
+
+# The dimensions and the measures of the pivot, see `TimesheetCustomQuerySet.pivot`
+PIVOT_DIMENSIONS = {
+    "team": F("team__name"),
+    "project": F("project__name"),
+    "user": F("user__name"),
+    "month": Func(F("entry_date"), Value("YYYY-MM"), function="to_char", output_field=CharField()),
+}
+PIVOT_MEASURES = {
+    "authorized_hours": F("authorized_hours"),
+    "billed_hours": F("billed_hours"),
+    "working_hours": F("working_hours"),
+    "expected_hours": F("effective_efficiency"),
+}
+
+
+# The compared date windows, see `TimesheetCustomQuerySet.window_comparison`
+COMPARISON_WINDOWS = ("current", "previous")
+
+
+def window_filters(current, previous):
+    """
+    Returns the filter of every compared window, by the name of the window
+    """
+    return {
+        name: Q(entry_date__range=window)
+        for name, window in zip(COMPARISON_WINDOWS, (current, previous))
+    }
+
+
+def comparison_deltas(name):
+    """
+    Returns the absolute and the percentage change of a compared measure from
+    the previous window to the current one. The percentage is null when the
+    measure of the previous window is zero
+    """
+    delta = F(f"{name}_current") - F(f"{name}_previous")
+    return {
+        f"{name}_delta": Round(delta, 2, output_field=FloatField()),
+        f"{name}_delta_pct": Round(
+            100.0 * delta / NullIf(F(f"{name}_previous"), Value(0.0)),
+            2,
+            output_field=FloatField(),
+        ),
+    }
 
 
 class TimesheetCustomQuerySet(models.QuerySet):
@@ -16,71 +79,67 @@ class TimesheetCustomQuerySet(models.QuerySet):
     Provide custom query method for the model
     """
 
+    def with_expected_efficiency(self):
+        """
+        Annotates the timesheets with the one expected efficiency of the user
+        which is effective on the entry date
+        """
+        if "effective_efficiency" in self.query.annotations:
+            return self
+        return self.annotate(effective_efficiency=ExpectedUserEfficiency.effective_efficiency())
+
     def date_range(self, from_date, to_date):
         """
         Filters the timesheets based on the given date range and the
         effective date range of the user's expected efficiency
         """
-        return self.filter(
-            Q(
-                entry_date__range=(
-                    F("user__expected_user_efficiencies__effective_from"),
-                    Coalesce(
-                        F("user__expected_user_efficiencies__effective_to"),
-                        timezone.now(),
-                    ),
-                )
-            )
-            & Q(entry_date__range=(from_date, to_date))
+        # Resolving the effective efficiency through a LIMIT 1 subquery keeps the
+        # join 1:1 instead of fanning out to every efficiency row of the user.
+        # The rows are filtered with a semi join, so that the subquery is only
+        # resolved once per row where the annotation is selected or aggregated
+        return self.with_expected_efficiency().filter(
+            ExpectedUserEfficiency.has_effective_efficiency(),
+            entry_date__range=(from_date, to_date),
         )
 
     def efficiency_fields(self):
         """
         Annotates the timesheets with efficiency-related fields
         """
-        return self.annotate(
-            capacity=Coalesce(
-                Sum(F("user__expected_user_efficiencies__expected_efficiency")),
-                0,
-                output_field=FloatField(),
-            ),
-            efficiency=Coalesce(Sum(F("authorized_hours")), 0, output_field=FloatField()),
-            productivity=Coalesce(Sum(F("billed_hours")), 0, output_field=FloatField()),
-            efficiency_gap=Coalesce(
-                Round(
-                    100
-                    * (
-                        (
-                            Sum(F("user__expected_user_efficiencies__expected_efficiency"))
-                            - Sum(F("authorized_hours"))
-                        )
-                        / Sum("user__expected_user_efficiencies__expected_efficiency")
+        # The sums are aliased once and the fields are computed over the aliases
+        return (
+            self.with_expected_efficiency()
+            .alias(
+                expected_sum=Sum(F("effective_efficiency")),
+                authorized_total=Sum(F("authorized_hours")),
+                billed_total=Sum(F("billed_hours")),
+            )
+            .annotate(
+                capacity=Coalesce(F("expected_sum"), 0, output_field=FloatField()),
+                efficiency=Coalesce(F("authorized_total"), 0, output_field=FloatField()),
+                productivity=Coalesce(F("billed_total"), 0, output_field=FloatField()),
+                efficiency_gap=Coalesce(
+                    Round(
+                        100 * ((F("expected_sum") - F("authorized_total")) / F("expected_sum")),
+                        2,
                     ),
-                    2,
+                    0,
+                    output_field=FloatField(),
                 ),
-                0,
-                output_field=FloatField(),
-            ),
-            productivity_gap=Coalesce(
-                Round(
-                    100
-                    * (
-                        (
-                            Sum(F("user__expected_user_efficiencies__expected_efficiency"))
-                            - Sum(F("billed_hours"))
-                        )
-                        / Sum("user__expected_user_efficiencies__expected_efficiency")
+                productivity_gap=Coalesce(
+                    Round(
+                        100 * ((F("expected_sum") - F("billed_total")) / F("expected_sum")),
+                        2,
                     ),
-                    2,
+                    0,
+                    output_field=FloatField(),
                 ),
-                0,
-                output_field=FloatField(),
-            ),
-            role=Coalesce(
-                F("user__project_resource__position__name"),
-                Value("TBA"),
-                output_field=CharField(),
-            ),
+                role=Coalesce(
+                    F("user__project_resource__position__name"),
+                    Value("TBA"),
+                    output_field=CharField(),
+                ),
+            )
         )
 
     def kpi_fields(self):
@@ -88,17 +147,22 @@ class TimesheetCustomQuerySet(models.QuerySet):
         Annotates the timesheets with KPI-related fields.The results are ordered
         by authorized sum in descending order and then by billed sum in ascending order
         """
+        # Every row is a single timesheet entry, so its hours are taken as they
+        # are, which keeps the ordering columns plain columns for the keyset
+        # pagination instead of aggregates grouped by the primary key
         return (
-            self.annotate(
+            self.with_expected_efficiency()
+            .annotate(
                 project_name=F("project__name"),
-                worked_hours=Sum("working_hours"),
-                expected_efficiency=F("user__expected_user_efficiencies__expected_efficiency"),
-                authorized_sum=Sum("authorized_hours"),
-                billed_sum=Sum("billed_hours"),
+                worked_hours=F("working_hours"),
+                expected_efficiency=F("effective_efficiency"),
+                authorized_sum=F("authorized_hours"),
+                billed_sum=F("billed_hours"),
                 user_name=F("user__name"),
                 team_name=F("team__name"),
             )
             .values(
+                "pk",
                 "project_name",
                 "user_name",
                 "team_name",
@@ -115,7 +179,8 @@ class TimesheetCustomQuerySet(models.QuerySet):
         Annotates the timesheets with monetization-related fields
         """
         return (
-            self.annotate(a_sum=Sum("authorized_hours"))
+            self.with_expected_efficiency()
+            .annotate(a_sum=Sum("authorized_hours"))
             .annotate(
                 day=Func(
                     F("entry_date"),
@@ -132,11 +197,8 @@ class TimesheetCustomQuerySet(models.QuerySet):
                         default=Round(
                             100
                             * (
-                                (
-                                    Sum(F("user__expected_user_efficiencies__expected_efficiency"))
-                                    - Sum(F("authorized_hours"))
-                                )
-                                / Sum("user__expected_user_efficiencies__expected_efficiency")
+                                (Sum(F("effective_efficiency")) - Sum(F("authorized_hours")))
+                                / Sum("effective_efficiency")
                             ),
                             2,
                         ),
@@ -146,13 +208,223 @@ class TimesheetCustomQuerySet(models.QuerySet):
                     output_field=FloatField(),
                 ),
                 efficiency_capacity=Sum(F("authorized_hours")),
-                monetization_capacity=Sum(
-                    F("user__expected_user_efficiencies__expected_efficiency")
-                ),
+                monetization_capacity=Sum(F("effective_efficiency")),
                 ratings=Sum(F("authorized_hours")),
             )
         )
 
+    def window_comparison(self, current, previous):
+        """
+        Filters the timesheets of the two given `(from_date, to_date)` windows
+        and groups them by team, so that the measures of both windows can be
+        aggregated side by side with the `FILTER` clauses of `window_filters`
+        """
+        return (
+            self.with_expected_efficiency()
+            .filter(
+                Q(entry_date__range=current) | Q(entry_date__range=previous),
+                ExpectedUserEfficiency.has_effective_efficiency(),
+            )
+            .values("team__name")
+            .annotate(pk=F("team_id"))
+        )
+
+    def efficiency_comparison(self, current, previous):
+        """
+        Annotates every team with its capacity in the current and the previous
+        window and the change between them
+        """
+        windows = window_filters(current, previous)
+        return (
+            self.window_comparison(current, previous)
+            .annotate(
+                **{
+                    f"capacity_{name}": Round(
+                        Avg(
+                            100 * F("authorized_hours") / F("effective_efficiency"),
+                            filter=window,
+                            output_field=FloatField(),
+                        ),
+                        2,
+                    )
+                    for name, window in windows.items()
+                }
+            )
+            .annotate(**comparison_deltas("capacity"))
+            .order_by("team__name")
+        )
+
+    def monetization_comparison(self, current, previous):
+        """
+        Annotates every team with its efficiency capacity, monetization
+        capacity and gap in the current and the previous window and the
+        changes between them. The monetization capacity is the working hours
+        of the capacity calendar of the users of the team
+        """
+        windows = window_filters(current, previous)
+        queryset = (
+            self.window_comparison(current, previous)
+            .annotate(
+                **{
+                    f"efficiency_capacity_{name}": Coalesce(
+                        Sum("authorized_hours", filter=window), 0, output_field=FloatField()
+                    )
+                    for name, window in windows.items()
+                },
+                **{
+                    f"monetization_capacity_{name}": Coalesce(
+                        CapacityCalendar.team_capacity_within(window),
+                        0,
+                        output_field=FloatField(),
+                    )
+                    for name, window in zip(COMPARISON_WINDOWS, (current, previous))
+                },
+            )
+            .annotate(
+                **{
+                    f"gap_{name}": Case(
+                        When(**{f"efficiency_capacity_{name}": 0}, then=Value(0.0)),
+                        # The teams without expected hours in the calendar have no gap either
+                        When(**{f"monetization_capacity_{name}": 0}, then=Value(0.0)),
+                        default=Round(
+                            100
+                            * (
+                                F(f"monetization_capacity_{name}")
+                                - F(f"efficiency_capacity_{name}")
+                            )
+                            / F(f"monetization_capacity_{name}"),
+                            2,
+                        ),
+                        output_field=FloatField(),
+                    )
+                    for name in COMPARISON_WINDOWS
+                }
+            )
+        )
+        return queryset.annotate(
+            **comparison_deltas("efficiency_capacity"),
+            **comparison_deltas("monetization_capacity"),
+            **comparison_deltas("gap"),
+        ).order_by("team__name")
+
+    def project_revenue(self):
+        """
+        Annotates the timesheets with the revenue of every project, i.e. the
+        billed and authorized hours multiplied by the hourly rate of the
+        resource, in the project currency and converted to the base currency
+        with the rate effective on the entry date. The revenue at risk is the
+        authorized revenue which isn't billed. The hours without a currency
+        rate on their day are left out of the base currency revenues and
+        listed as the unconverted hours instead
+        """
+        converted = Q(currency_rate__isnull=False)
+
+        def revenue(hours, *rates, **kwargs):
+            expression = F(hours)
+            for rate in rates:
+                expression = expression * F(rate)
+            return Round(Sum(expression, output_field=FloatField(), **kwargs), 2)
+
+        return (
+            self.annotate(
+                hourly_rate=ProjectResource.effective_rate(),
+                currency_rate=CurrencyRate.effective_rate(),
+                project_name=F("project__name"),
+                client_name=F("project__client__name"),
+                currency_name=F("project__currency__name"),
+            )
+            .values("project_id", "project_name", "client_name", "currency_name")
+            .annotate(
+                billed_sum=Sum("billed_hours"),
+                authorized_sum=Sum("authorized_hours"),
+                unrated_hours=Coalesce(
+                    Sum("authorized_hours", filter=Q(hourly_rate__isnull=True)),
+                    0,
+                    output_field=FloatField(),
+                ),
+                unconverted_hours=Coalesce(
+                    Sum(
+                        "authorized_hours",
+                        filter=Q(hourly_rate__isnull=False, currency_rate__isnull=True),
+                    ),
+                    0,
+                    output_field=FloatField(),
+                ),
+                billed_revenue=revenue("billed_hours", "hourly_rate"),
+                authorized_revenue=revenue("authorized_hours", "hourly_rate"),
+                billed_revenue_base=revenue(
+                    "billed_hours", "hourly_rate", "currency_rate", filter=converted
+                ),
+                authorized_revenue_base=revenue(
+                    "authorized_hours", "hourly_rate", "currency_rate", filter=converted
+                ),
+            )
+            .annotate(
+                revenue_at_risk=Round(
+                    F("authorized_revenue_base") - F("billed_revenue_base"),
+                    2,
+                    output_field=FloatField(),
+                ),
+            )
+            .order_by("project_name")
+        )
+
+    def pivot(self, grouping_sets):
+        """
+        Returns the sums of the measures for every grouping set of dimensions,
+        e.g. `[("team",), ("team", "month"), ()]`, computed by a single
+        `GROUPING SETS` query over the timesheets. Every row has the tuple of
+        dimensions it is grouped by, their values, the measures and the count
+        of entries
+        """
+        dimensions = [
+            name for name in PIVOT_DIMENSIONS if any(name in dims for dims in grouping_sets)
+        ]
+        base = self.with_expected_efficiency().values(
+            **{f"pivot_{name}": PIVOT_DIMENSIONS[name] for name in dimensions},
+            **{f"pivot_{name}": expression for name, expression in PIVOT_MEASURES.items()},
+        )
+        base_sql, params = base.order_by().query.sql_with_params()
+        columns = [f"pivot_{name}" for name in dimensions]
+        sets = ", ".join(
+            "(" + ", ".join(f"pivot_{name}" for name in dims) + ")" for dims in grouping_sets
+        )
+        # The bits of GROUPING are set for the columns which aren't grouped by
+        grouping = f"GROUPING({', '.join(columns)})" if columns else "0"
+        sums = ", ".join(f"SUM(pivot_{name})" for name in PIVOT_MEASURES)
+        sql = (
+            f"SELECT {''.join(column + ', ' for column in columns)}{grouping}, {sums}, COUNT(*) "
+            f"FROM ({base_sql}) AS pivot_base GROUP BY GROUPING SETS ({sets})"
+        )
+        with connections[self.db].cursor() as cursor:
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+
+        results = []
+        for row in rows:
+            values, mask, measures = (
+                row[: len(dimensions)],
+                row[len(dimensions)],
+                row[len(dimensions) + 1 :],
+            )
+            grouped_by = tuple(
+                name
+                for index, name in enumerate(dimensions)
+                if not mask & (1 << (len(dimensions) - 1 - index))
+            )
+            results.append(
+                {
+                    "grouped_by": grouped_by,
+                    **{
+                        name: value
+                        for name, value in zip(dimensions, values)
+                        if name in grouped_by
+                    },
+                    **dict(zip([*PIVOT_MEASURES, "entries"], measures)),
+                }
+            )
+        return results
+
 
 class TimesheetManager(models.Manager):
     """
@@ -2,12 +2,84 @@
 Django test cases for the create, delete and Datatables features in the
 TraineeHoliday module
 """
-from django.db import models
+import uuid
+
+from django.core.cache import cache
+from django.db import models, transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 
 from core import db
+from core.constants import HOLIDAY_CALENDAR_CACHE_TIMEOUT
+from core.working_days import WorkingDayCalendar
 from hubble.models import Batch
 
 
+def calendar_version_key(batch_id):
+    """
+    Returns the cache key of the version of the holiday calendar of a batch
+    """
+    return f"trainee-holiday-calendar-version:{batch_id}"
+
+
+def calendar_cache_key(batch_id, version):
+    """
+    Returns the cache key of a version of the holiday calendar of a batch
+    """
+    return f"trainee-holiday-calendar:{batch_id}:{version}"
+
+
+class TraineeHolidayManager(db.SoftDeleteManager):
+    """
+    Custom manager for the TraineeHoliday model
+    """
+
+    def calendar(self, batch_id):
+        """
+        Returns the working day calendar of the holidays of a batch. The
+        calendar is cached under the current version of the holidays of the
+        batch, which moves on whenever a holiday of the batch is written
+        """
+        version = cache.get(calendar_version_key(batch_id))
+        if version is None:
+            version = uuid.uuid4().hex
+            cache.set(calendar_version_key(batch_id), version, HOLIDAY_CALENDAR_CACHE_TIMEOUT)
+        calendar = cache.get(calendar_cache_key(batch_id, version))
+        if calendar is None:
+            calendar = WorkingDayCalendar(
+                self.filter(batch_id=batch_id).values_list("date_of_holiday", flat=True)
+            )
+            cache.set(
+                calendar_cache_key(batch_id, version), calendar, HOLIDAY_CALENDAR_CACHE_TIMEOUT
+            )
+        return calendar
+
+    @staticmethod
+    def invalidate_calendar(*batch_ids):
+        """
+        Moves the version of the holiday calendars of the given batches on.
+        The version moves on again once the transaction is committed, so that
+        a calendar rebuilt from the holidays before the commit isn't kept
+        """
+
+        def bump_versions():
+            cache.set_many(
+                {calendar_version_key(batch_id): uuid.uuid4().hex for batch_id in batch_ids},
+                HOLIDAY_CALENDAR_CACHE_TIMEOUT,
+            )
+
+        bump_versions()
+        transaction.on_commit(bump_versions)
+
+    def bulk_create(self, objs, *args, **kwargs):
+        """
+        Creates the holidays in bulk and moves the calendars of their batches on
+        """
+        objs = super().bulk_create(objs, *args, **kwargs)
+        self.invalidate_calendar(*{holiday.batch_id for holiday in objs})
+        return objs
+
+
 class TraineeHoliday(db.SoftDeleteWithBaseModel):
     """
     Store the trainee holiday details for a batch
@@ -22,6 +94,8 @@ class TraineeHoliday(db.SoftDeleteWithBaseModel):
     national_holiday = models.BooleanField()
     allow_check_in = models.BooleanField()
 
+    objects = TraineeHolidayManager()
+
     class Meta:
         """
         Meta class for defining class behavior and properties.
@@ -31,3 +105,22 @@ class TraineeHoliday(db.SoftDeleteWithBaseModel):
 
     def __str__(self):
         return str(self.date_of_holiday)
+
+    @classmethod
+    def bulk_delete(cls, filters):
+        """
+        Performs a bulk delete operation on objects matching the specified
+        filters and moves the holiday calendars of their batches on
+        """
+        batch_ids = set(cls.objects.filter(**filters).values_list("batch_id", flat=True))
+        super().bulk_delete(filters)
+        cls.objects.invalidate_calendar(*batch_ids)
+
+
+@receiver([post_save, post_delete], sender=TraineeHoliday)
+def invalidate_holiday_calendar(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Moves the holiday calendar of the batch of a saved, soft deleted or
+    deleted trainee holiday on
+    """
+    TraineeHoliday.objects.invalidate_calendar(instance.batch_id)
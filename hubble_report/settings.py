@@ -66,6 +66,7 @@ SESSION_FILE_PATH = os.path.join(BASE_DIR, "session_files")
 SESSION_COOKIE_AGE = 288000
 
 MIDDLEWARE = [
+    "hubble.middlewares.server_timing.ServerTiming",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -74,6 +75,7 @@ MIDDLEWARE = [
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "hubble.middlewares.subdomain_classifier.SubdomainClassifier",
+    "hubble.middlewares.replica_reads.ReplicaReads",
     "hubble.middlewares.verify_users.VerifiedUser",
 ]
 
@@ -106,6 +108,25 @@ DATABASES = {
     "default": env.db(),
 }
 
+# Optional read replica for the reports app, see core.db_router
+if env("REPLICA_DATABASE_URL", default=None):
+    DATABASES["replica"] = env.db("REPLICA_DATABASE_URL")
+    DATABASES["replica"]["TEST"] = {"MIRROR": "default"}
+
+DATABASE_ROUTERS = ["core.db_router.ReplicaRouter"]
+
+# The replica is skipped when it lags behind the primary by more than these seconds
+REPLICA_MAX_LAG = env.int("REPLICA_MAX_LAG", default=30)
+REPLICA_CHECK_INTERVAL = env.int("REPLICA_CHECK_INTERVAL", default=10)
+
+
+# Cache
+# https://docs.djangoproject.com/en/4.1/topics/cache/
+
+CACHES = {
+    "default": env.cache("CACHE_URL", default="locmemcache://"),
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.1/ref/settings/#auth-password-validators
@@ -190,9 +211,22 @@ LOGGING = {
             "level": "WARNING",
             "handlers": ["console", "teams"],
         },
+        "hubble.middlewares.server_timing": {
+            "level": "INFO",
+            "handlers": ["console"],
+            "propagate": False,
+        },
     },
 }
 
+# Requests running more queries than this are logged as warnings by the
+# server timing middleware
+SQL_QUERY_BUDGET = env.int("SQL_QUERY_BUDGET", default=50)
+
+# Statements of the report datatables running longer than these milliseconds
+# are cancelled and the last cached result is served instead
+REPORT_STATEMENT_TIMEOUT = env.int("REPORT_STATEMENT_TIMEOUT", default=30000)
+
 if ENV_NAME == ENVIRONMENT_DEVELOPMENT:
     # Local development dependencies.
     INSTALLED_APPS += [
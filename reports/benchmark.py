@@ -0,0 +1,264 @@
+"""
+This module is responsible for generating synthetic report data and for
+timing the report endpoints against it, so that the changes of the report
+querysets can be measured before they are deployed
+"""
+import datetime
+import json
+import math
+import random
+import time
+
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve, reverse
+
+from hubble.models import (
+    CapacityCalendar,
+    DailyEfficiencyRollup,
+    ExpectedUserEfficiency,
+    Module,
+    Project,
+    ProjectResource,
+    Task,
+    Team,
+    TimesheetEntry,
+    User,
+)
+
+# The generated rows are recognised by these markers, so that they can be
+# purged without touching the real data
+BENCHMARK_EMAIL_DOMAIN = "benchmark.invalid"
+BENCHMARK_NAME_PREFIX = "Benchmark"
+BENCHMARK_BATCH_SIZE = 5000
+BENCHMARK_URLCONF = "reports.urls"
+
+
+def benchmark_users():
+    """
+    Returns the generated users
+    """
+    return User.objects.with_trashed().filter(email__endswith=f"@{BENCHMARK_EMAIL_DOMAIN}")
+
+
+def refresh_report_tables():
+    """
+    Rebuilds the daily efficiency rollup and the capacity calendar, which the
+    reports read instead of the timesheets. They are rebuilt in full, since
+    the purged rows can't be detected by an incremental refresh
+    """
+    DailyEfficiencyRollup.objects.refresh(full=True)
+    CapacityCalendar.objects.refresh(full=True)
+
+
+def purge_data(refresh=True):
+    """
+    Deletes every generated row and returns the number of deleted timesheet
+    entries. The report tables are refreshed unless `refresh` is unset, e.g.
+    when new data is generated right afterwards
+    """
+    with transaction.atomic():
+        users = benchmark_users()
+        deleted, _ = TimesheetEntry.objects.filter(user__in=users).delete()
+        ExpectedUserEfficiency.objects.with_trashed().filter(user__in=users).delete()
+        ProjectResource.objects.with_trashed().filter(user__in=users).delete()
+        projects = Project.objects.with_trashed().filter(
+            name__startswith=f"{BENCHMARK_NAME_PREFIX} project"
+        )
+        Task.objects.with_trashed().filter(module__project__in=projects).delete()
+        Module.objects.with_trashed().filter(project__in=projects).delete()
+        projects.delete()
+        users.delete()
+        Team.objects.with_trashed().filter(
+            name__startswith=f"{BENCHMARK_NAME_PREFIX} team"
+        ).delete()
+    if refresh:
+        refresh_report_tables()
+    return deleted
+
+
+def working_days(from_date, days):
+    """
+    Returns the weekdays among the given number of days from the given date
+    """
+    return [
+        day
+        for day in (from_date + datetime.timedelta(offset) for offset in range(days))
+        if day.weekday() < 5
+    ]
+
+
+def generate_data(
+    entries, users=100, teams=10, projects=20, from_date=None, days=365, seed=1
+):  # pylint: disable=too-many-arguments, too-many-locals
+    """
+    Bulk loads the given volume of users, teams, projects, project resources,
+    expected efficiencies and timesheet entries, spread over the working days of the
+    date range, and refreshes the report tables from them. The same seed
+    generates the same data
+    """
+    randomizer = random.Random(seed)
+    from_date = from_date or datetime.date(datetime.date.today().year - 1, 1, 1)
+    with transaction.atomic():
+        team_rows = Team.objects.bulk_create(
+            Team(name=f"{BENCHMARK_NAME_PREFIX} team {index}") for index in range(teams)
+        )
+        user_rows = User.objects.bulk_create(
+            User(
+                email=f"user-{index}@{BENCHMARK_EMAIL_DOMAIN}",
+                name=f"{BENCHMARK_NAME_PREFIX} user {index}",
+                status="active",
+                is_employed=True,
+                is_saturday_working=False,
+                team=team_rows[index % teams],
+            )
+            for index in range(users)
+        )
+        ExpectedUserEfficiency.objects.bulk_create(
+            ExpectedUserEfficiency(
+                user=user,
+                updated_by=user,
+                expected_efficiency=randomizer.choice([6, 7, 8]),
+                effective_from=from_date,
+            )
+            for user in user_rows
+        )
+        project_rows = Project.objects.bulk_create(
+            Project(
+                project_id=index,
+                name=f"{BENCHMARK_NAME_PREFIX} project {index}",
+                status="active",
+            )
+            for index in range(projects)
+        )
+        module_rows = Module.objects.bulk_create(
+            Module(name="Development", project=project, created_by=user_rows[0])
+            for project in project_rows
+        )
+        task_rows = Task.objects.bulk_create(
+            Task(name="Development", module=module, created_by=user_rows[0])
+            for module in module_rows
+        )
+        ProjectResource.objects.bulk_create(
+            ProjectResource(
+                user=user,
+                project=project_rows[index % projects],
+                utilisation=100,
+                charge_by_hour=randomizer.choice([20, 30, 40]),
+                primary_project=True,
+                allotted_from=from_date,
+            )
+            for index, user in enumerate(user_rows)
+        )
+
+        entry_days = working_days(from_date, days)
+        batch = []
+        for _ in range(entries):
+            user = randomizer.choice(user_rows)
+            index = randomizer.randrange(projects)
+            working_hours = randomizer.choice([2, 4, 6, 8])
+            authorized_hours = randomizer.randint(0, working_hours)
+            batch.append(
+                TimesheetEntry(
+                    user=user,
+                    team_id=user.team_id,
+                    project=project_rows[index],
+                    module=module_rows[index],
+                    task=task_rows[index],
+                    description="Benchmark",
+                    entry_date=randomizer.choice(entry_days),
+                    working_hours=working_hours,
+                    approved_hours=working_hours,
+                    authorized_hours=authorized_hours,
+                    billed_hours=randomizer.randint(0, authorized_hours),
+                )
+            )
+            if len(batch) == BENCHMARK_BATCH_SIZE:
+                TimesheetEntry.objects.bulk_create(batch)
+                batch = []
+        TimesheetEntry.objects.bulk_create(batch)
+    refresh_report_tables()
+    return {"from_date": from_date, "to_date": entry_days[-1], "team_id": team_rows[0].id}
+
+
+def benchmark_endpoints(from_date, to_date, team_id):
+    """
+    Returns the name, url and parameters of every timed report endpoint
+    """
+    date_range = {"from_date": from_date.isoformat(), "to_date": to_date.isoformat()}
+    month = {"year_filter": from_date.year, "month_filter": from_date.month}
+    return [
+        ("efficiency", reverse("efficiency_datatable", BENCHMARK_URLCONF), date_range),
+        (
+            "detailed_efficiency",
+            reverse("detailed_efficiency_datatable", BENCHMARK_URLCONF),
+            {**date_range, "team_id": team_id},
+        ),
+        ("monetization", reverse("monetization_datatable", BENCHMARK_URLCONF), month),
+        ("kpi", reverse("kpi_datatable", BENCHMARK_URLCONF), date_range),
+        (
+            "project_revenue",
+            reverse("project_revenue_datatable", BENCHMARK_URLCONF),
+            date_range,
+        ),
+        (
+            "resource_utilisation",
+            reverse("resource_utilisation_datatable", BENCHMARK_URLCONF),
+            month,
+        ),
+    ]
+
+
+def percentile(values, percent):
+    """
+    Returns the nearest-rank percentile of the given values
+    """
+    values = sorted(values)
+    return values[max(math.ceil(percent / 100 * len(values)) - 1, 0)]
+
+
+def time_endpoint(user, url, params, iterations, warm=False):
+    """
+    Requests the endpoint the given number of times and returns the latency
+    percentiles in milliseconds along with the number of queries and rows of
+    the last request. The cache is cleared before every request unless `warm`
+    is set
+    """
+    view = resolve(url, BENCHMARK_URLCONF).func
+    factory = RequestFactory()
+    timings, queries, status = [], 0, None
+    for _ in range(iterations):
+        if not warm:
+            cache.clear()
+        request = factory.post(
+            url, {"draw": 1, "start": 0, "length": 10, **params}, HTTP_ACCEPT="application/json"
+        )
+        request.user = user
+        with CaptureQueriesContext(connection) as captured:
+            start = time.perf_counter()
+            response = view(request)
+            timings.append((time.perf_counter() - start) * 1000)
+        queries, status = len(captured), response.status_code
+    return {
+        "status": status,
+        "p50_ms": round(percentile(timings, 50), 2),
+        "p95_ms": round(percentile(timings, 95), 2),
+        "min_ms": round(min(timings), 2),
+        "max_ms": round(max(timings), 2),
+        "queries": queries,
+        "rows": len(json.loads(response.content)["data"]),
+    }
+
+
+def run_benchmark(ranges, iterations=5, warm=False):
+    """
+    Times every report endpoint over the generated data and returns the
+    results keyed by the report
+    """
+    user = benchmark_users().order_by("id").first()
+    return {
+        name: time_endpoint(user, url, params, iterations, warm)
+        for name, url, params in benchmark_endpoints(**ranges)
+    }
@@ -0,0 +1,369 @@
+"""
+This module is responsible for computing the reports from a single slice of
+the daily efficiency rollup which is loaded once per request into a pandas frame
+"""
+import calendar
+import contextlib
+import datetime
+from contextvars import ContextVar
+
+import numpy as np
+import pandas as pd
+
+from core.constants import REPORT_MONTH_CLOSE_DAYS
+from hubble.models import CapacityCalendar, DailyEfficiencyRollup
+
+FRAME_COLUMNS = [
+    "entry_date",
+    "user_id",
+    "team_id",
+    "team_name",
+    "authorized_hours",
+    "billed_hours",
+    "working_hours",
+    "entry_count",
+    "expected_efficiency",
+]
+CALENDAR_COLUMNS = ["day", "team_id", "expected_hours"]
+
+# The date ranges and the lazily loaded frames shared by the reports of a batch
+shared_frame = ContextVar("shared_frame", default=None)
+
+
+def parse_date(value):
+    """
+    The function returns the given date or ISO formatted string as a date, or
+    None when it isn't a valid date
+    """
+    if isinstance(value, datetime.date):
+        return value
+    try:
+        return datetime.date.fromisoformat(str(value))
+    except ValueError:
+        return None
+
+
+def same_day_last_year(day):
+    """
+    The function returns the same day of the previous year, the 29th of
+    February falling back to the 28th
+    """
+    try:
+        return day.replace(year=day.year - 1)
+    except ValueError:
+        return day.replace(year=day.year - 1, day=28)
+
+
+def is_closed_month(month_start, today=None):
+    """
+    The function checks whether the month which starts on the given day is
+    closed, i.e. its timesheets are no longer expected to change
+    """
+    today = today or datetime.date.today()
+    next_month = (month_start + datetime.timedelta(days=31)).replace(day=1)
+    return today >= next_month + datetime.timedelta(days=REPORT_MONTH_CLOSE_DAYS)
+
+
+def closed_month(from_date, to_date, today=None):
+    """
+    The function returns the first day of the month when the given date range
+    spans exactly a closed month, otherwise None
+    """
+    from_date, to_date = parse_date(from_date), parse_date(to_date)
+    if from_date is None or to_date is None or from_date.day != 1:
+        return None
+    if to_date != ReportFrame.month_range(from_date.year, from_date.month)[1]:
+        return None
+    return from_date if is_closed_month(from_date, today) else None
+
+
+def last_closed_month(today=None):
+    """
+    The function returns the first day of the latest closed month
+    """
+    today = today or datetime.date.today()
+    closing_day = today - datetime.timedelta(days=REPORT_MONTH_CLOSE_DAYS)
+    return (closing_day.replace(day=1) - datetime.timedelta(days=1)).replace(day=1)
+
+
+def postgres_month_name(dates):
+    """
+    The function returns the month names of the given dates blank-padded to
+    nine characters, like the `Month` pattern of postgres `to_char`
+    """
+    return dates.dt.month_name().str.pad(9, side="right")
+
+
+def round_half_away_from_zero(values, decimals=0):
+    """
+    The function rounds the given values like postgres `round` does, i.e.
+    halves are rounded away from zero instead of to the even neighbour
+    """
+    factor = 10**decimals
+    # Drop the binary noise first, like the cast to numeric does in postgres
+    scaled = np.round(values * factor, 6)
+    return np.sign(scaled) * np.floor(np.abs(scaled) + 0.5) / factor
+
+
+class ReportFrame:
+    """
+    This class holds the daily efficiency rollup rows of a date range, i.e.
+    the hours of every team, user and day, along with the expected hours of
+    every team and day of the capacity calendar as columnar arrays and
+    computes the efficiency, detailed efficiency and monetization reports from
+    them with grouped vectorized operations
+    """
+
+    def __init__(self, data_frame, calendar_frame):
+        self.data_frame = data_frame
+        self.calendar_frame = calendar_frame
+
+    @classmethod
+    def load(cls, from_date, to_date):
+        """
+        Returns the frame of the given date range. Inside `ReportFrame.share`
+        the date ranges it covers are sliced from the shared frame of their
+        overlapping ranges, so the reports of a batch over the same days are
+        served with a single round trip to the database
+        """
+        from_day, to_day = parse_date(from_date), parse_date(to_date)
+        for shared in shared_frame.get() or ():
+            if (
+                from_day
+                and to_day
+                and shared["from_date"] <= from_day <= to_day <= shared["to_date"]
+            ):
+                # The shared frame is loaded by the first report which needs it
+                if shared["frame"] is None:
+                    shared["frame"] = cls.query(shared["from_date"], shared["to_date"])
+                return shared["frame"].slice(from_day, to_day)
+        return cls.query(from_date, to_date)
+
+    def slice(self, from_date, to_date):
+        """
+        Returns the frame of the days of the given date range
+        """
+
+        def within(days):
+            return (days >= pd.Timestamp(from_date)) & (days <= pd.Timestamp(to_date))
+
+        return ReportFrame(
+            self.data_frame[within(self.data_frame["entry_date"])],
+            self.calendar_frame[within(self.calendar_frame["day"])],
+        )
+
+    @classmethod
+    def load_month(cls, year, month):
+        """
+        Returns the frame of every day of the given month
+        """
+        return cls.load(*cls.month_range(year, month))
+
+    @staticmethod
+    def month_range(year, month):
+        """
+        Returns the first and the last day of the given month
+        """
+        year, month = int(year), int(month)
+        return (
+            datetime.date(year, month, 1),
+            datetime.date(year, month, calendar.monthrange(year, month)[1]),
+        )
+
+    @staticmethod
+    @contextlib.contextmanager
+    def share(date_ranges):
+        """
+        Shares a frame spanning every group of overlapping date ranges, from
+        which every frame loaded within the block for one of the ranges is
+        sliced. The disjoint ranges get frames of their own, so the days in
+        between are never loaded. A frame is only loaded when a report misses
+        the draw cache, and the ranges which aren't valid dates are left to
+        their own load
+        """
+        date_ranges = [
+            (parse_date(from_date), parse_date(to_date)) for from_date, to_date in date_ranges
+        ]
+        date_ranges = [
+            (from_date, to_date)
+            for from_date, to_date in date_ranges
+            if from_date and to_date and from_date <= to_date
+        ]
+        clusters = []
+        for from_date, to_date in sorted(date_ranges):
+            if clusters and from_date <= clusters[-1]["to_date"]:
+                clusters[-1]["to_date"] = max(clusters[-1]["to_date"], to_date)
+            else:
+                clusters.append({"from_date": from_date, "to_date": to_date, "frame": None})
+        if not clusters:
+            yield
+            return
+        token = shared_frame.set(clusters)
+        try:
+            yield
+        finally:
+            shared_frame.reset(token)
+
+    @classmethod
+    def query(cls, from_date, to_date):
+        """
+        Loads the rollup rows of the date range which have an expected
+        efficiency and the expected hours of the teams on every day of the
+        date range into data frames
+        """
+        rows = (
+            DailyEfficiencyRollup.objects.date_range(from_date, to_date)
+            .values_list(
+                "entry_date",
+                "user_id",
+                "team_id",
+                "team__name",
+                "authorized_hours",
+                "billed_hours",
+                "working_hours",
+                "entry_count",
+                "expected_efficiency",
+            )
+            .order_by()
+        )
+        data_frame = pd.DataFrame.from_records(rows.iterator(), columns=FRAME_COLUMNS)
+        data_frame["entry_date"] = pd.to_datetime(data_frame["entry_date"])
+        data_frame["team_name"] = data_frame["team_name"].astype("category")
+        calendar_rows = (
+            CapacityCalendar.objects.date_range(from_date, to_date)
+            .daily_team_capacity()
+            .values_list(*CALENDAR_COLUMNS)
+        )
+        calendar_frame = pd.DataFrame.from_records(
+            calendar_rows.iterator(), columns=CALENDAR_COLUMNS
+        )
+        calendar_frame["day"] = pd.to_datetime(calendar_frame["day"])
+        return cls(data_frame, calendar_frame)
+
+    @staticmethod
+    def ratio(data_frame):
+        """
+        Returns the authorized hours of every row against its expected
+        efficiency. The expected efficiency is constant for a user on a given
+        day, so the ratio of the day equals the sum of the ratios of its entries
+        """
+        return data_frame["authorized_hours"] / data_frame["expected_efficiency"]
+
+    @staticmethod
+    def capacity(grouped):
+        """
+        Returns the capacity of the grouped rows, i.e. the average of the
+        authorized hours of every timesheet entry against the expected efficiency
+        """
+        return 100 * grouped["ratio"] / grouped["entry_count"]
+
+    def team_capacity(self, periods):
+        """
+        Returns the expected hours of the capacity calendar of every team in
+        every period of the given frequency, indexed by the team and the period
+        """
+        calendar_frame = self.calendar_frame
+        return calendar_frame.groupby(["team_id", calendar_frame["day"].dt.to_period(periods)])[
+            "expected_hours"
+        ].sum()
+
+    def efficiency(self):
+        """
+        Returns the capacity of every team, ordered by the team
+        """
+        result = (
+            self.data_frame.assign(ratio=self.ratio(self.data_frame))
+            .groupby(["team_id", "team_name"], observed=True, sort=True)
+            .agg(ratio=("ratio", "sum"), entry_count=("entry_count", "sum"))
+            .reset_index()
+            .rename(columns={"team_id": "pk", "team_name": "team__name"})
+        )
+        result["capacity"] = round_half_away_from_zero(self.capacity(result), 2)
+        return self.records(result, ["pk", "team__name", "capacity"])
+
+    def detailed_efficiency(self, team_id):
+        """
+        Returns the expected hours, actual hours and capacity of a team for
+        every month. The expected hours are the working hours of the capacity
+        calendar of the users of the team
+        """
+        team_id = int(team_id)
+        data_frame = self.data_frame[self.data_frame["team_id"] == team_id]
+        data_frame = data_frame.assign(
+            month_start=data_frame["entry_date"].dt.to_period("M"),
+            ratio=self.ratio(data_frame),
+        )
+        result = (
+            data_frame.groupby("month_start", sort=True)
+            .agg(
+                actual_hours=("authorized_hours", "sum"),
+                ratio=("ratio", "sum"),
+                entry_count=("entry_count", "sum"),
+            )
+            .reset_index()
+        )
+        capacity = self.team_capacity("M")
+        result["expected_hours"] = [
+            float(capacity.get((team_id, month_start), 0.0))
+            for month_start in result["month_start"]
+        ]
+        result["capacity"] = round_half_away_from_zero(self.capacity(result))
+        start = result["month_start"].dt.start_time
+        result["month"] = postgres_month_name(start) + "-" + start.dt.strftime("%Y")
+        return self.records(result, ["month", "expected_hours", "actual_hours", "capacity"])
+
+    def monetization(self):
+        """
+        Returns the efficiency capacity, monetization capacity and the gap
+        between them for every team and month. The monetization capacity is
+        the working hours of the capacity calendar of the users of the team
+        """
+        data_frame = self.data_frame.assign(
+            month_start=self.data_frame["entry_date"].dt.to_period("M")
+        )
+        result = (
+            data_frame.groupby(["month_start", "team_id", "team_name"], observed=True)
+            .agg(efficiency_capacity=("authorized_hours", "sum"))
+            .reset_index()
+            .rename(columns={"team_name": "team__name"})
+        )
+        capacity = self.team_capacity("M")
+        result["monetization_capacity"] = [
+            float(capacity.get((team_id, month_start), 0.0))
+            for team_id, month_start in zip(result["team_id"], result["month_start"])
+        ]
+        start = result["month_start"].dt.start_time
+        result["day"] = postgres_month_name(start) + " " + start.dt.strftime("%Y")
+        result = result.sort_values(["day", "team__name"], kind="stable")
+        result["ratings"] = result["efficiency_capacity"]
+        # The teams without expected hours in the calendar have no gap either
+        result["gap"] = np.where(
+            (result["efficiency_capacity"] == 0) | (result["monetization_capacity"] == 0),
+            0.0,
+            round_half_away_from_zero(
+                100
+                * (result["monetization_capacity"] - result["efficiency_capacity"])
+                / result["monetization_capacity"].where(result["monetization_capacity"] != 0),
+                2,
+            ),
+        )
+        return self.records(
+            result,
+            [
+                "team__name",
+                "day",
+                "efficiency_capacity",
+                "monetization_capacity",
+                "gap",
+                "ratings",
+            ],
+        )
+
+    @staticmethod
+    def records(data_frame, columns):
+        """
+        Returns the given columns of the frame as a list of dictionaries with
+        python values, in the shape the datatables expect
+        """
+        data_frame = data_frame[columns].astype(object)
+        return data_frame.where(data_frame.notna(), None).to_dict("records")
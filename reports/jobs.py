@@ -0,0 +1,84 @@
+"""
+This module is responsible for computing the report jobs which are too
+heavy to be answered within a web request
+"""
+import datetime
+import itertools
+import logging
+
+from django.http import HttpRequest, QueryDict
+
+from core.constants import (
+    REPORT_JOB_CHUNK_SIZE,
+    REPORT_JOB_STATEMENT_TIMEOUT,
+    REPORT_JOB_STATUS_COMPLETED,
+    REPORT_JOB_STATUS_FAILED,
+)
+from core.query_guard import QueryGuard
+from reports.views import REPORT_JOB_DATATABLES
+
+
+def build_request(job):
+    """
+    The function builds a request carrying the parameters of the job, in the
+    shape the ajax datatables read them
+    """
+    request = HttpRequest()
+    request.user = job.created_by
+    request.REQUEST = QueryDict(mutable=True)
+    request.REQUEST.update(job.params)
+    return request
+
+
+def iterate_chunks(rows):
+    """
+    The function yields the rows in chunks. The rows of a queryset are fetched
+    from a server side cursor, one chunk at a time, instead of all at once
+    """
+    if not isinstance(rows, list):
+        rows = rows.iterator(chunk_size=REPORT_JOB_CHUNK_SIZE)
+    rows = iter(rows)
+    while chunk := list(itertools.islice(rows, REPORT_JOB_CHUNK_SIZE)):
+        yield chunk
+
+
+def run_report_job(job):
+    """
+    The function computes the full result of the datatable of the job and
+    stores the rendered rows as the result of the job. A heartbeat is sent
+    before the rows are queried and after each chunk of rows is fetched and
+    rendered, which keeps the job from being reclaimed. Every statement is
+    bounded by a timeout below the stale timeout, and the job is dropped if it
+    has been reclaimed anyway
+    """
+    try:
+        request = build_request(job)
+        datatable = REPORT_JOB_DATATABLES[job.report]()
+        datatable.setup(request)
+        datatable.initialize(request)
+        if not job.heartbeat(5):
+            logging.warning("The report job %s has been reclaimed by another worker", job.id)
+            return job
+        data = []
+        with QueryGuard(REPORT_JOB_STATEMENT_TIMEOUT):
+            rows = datatable.get_initial_queryset(request)
+            total = len(rows) if isinstance(rows, list) else None
+            for chunk in iterate_chunks(rows):
+                data.extend(datatable.prepare_results(request, chunk, len(data)))
+                progress = 10 + 80 * len(data) // total if total else 50
+                if not job.heartbeat(progress):
+                    logging.warning(
+                        "The report job %s has been reclaimed by another worker", job.id
+                    )
+                    return job
+        job.result = {"recordsTotal": len(data), "data": data}
+        job.status = REPORT_JOB_STATUS_COMPLETED
+    except Exception as exception:  # pylint: disable=broad-exception-caught
+        logging.exception("An error has occured while running the report job %s", job.id)
+        job.error = str(exception)
+        job.status = REPORT_JOB_STATUS_FAILED
+    job.progress = 100
+    job.completed_at = datetime.datetime.now()
+    if not job.finish():
+        logging.warning("The report job %s has been reclaimed by another worker", job.id)
+    return job
@@ -0,0 +1,107 @@
+"""
+This module is responsible for the management command for timing the report
+endpoints against synthetic data of several sizes
+"""
+import datetime
+import json
+import subprocess
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.constants import ENVIRONMENT_PRODUCTION
+from reports.benchmark import generate_data, purge_data, run_benchmark
+
+
+def current_commit():
+    """
+    Returns the checked out commit, so that the reports can be told apart
+    """
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Command(BaseCommand):
+    """
+    Creates a custom command for benchmarking the report endpoints
+    """
+
+    help = "Times the report endpoints at several data sizes and writes a JSON report"
+
+    def add_arguments(self, parser):
+        """
+        This function is responsible for adding arguments to the command
+        """
+        parser.add_argument(
+            "--sizes",
+            type=int,
+            nargs="+",
+            default=[10000, 100000, 1000000],
+            help="Numbers of timesheet entries to benchmark",
+        )
+        parser.add_argument("--users", type=int, default=100)
+        parser.add_argument("--teams", type=int, default=10)
+        parser.add_argument("--projects", type=int, default=20)
+        parser.add_argument("--days", type=int, default=365)
+        parser.add_argument("--seed", type=int, default=1)
+        parser.add_argument("--iterations", type=int, default=5)
+        parser.add_argument(
+            "--warm",
+            action="store_true",
+            help="Keep the cache between the requests instead of timing cold requests",
+        )
+        parser.add_argument("--output", default=None, help="File of the JSON report")
+        parser.add_argument(
+            "--keep",
+            action="store_true",
+            help="Keep the generated data of the last size after the benchmark",
+        )
+
+    def handle(self, *args, **kwargs):
+        """
+        Generate every data size in turn and time the endpoints against it
+        """
+        if settings.ENV_NAME == ENVIRONMENT_PRODUCTION:
+            raise CommandError("The benchmark can't be run in production")
+        if kwargs["iterations"] < 1:
+            raise CommandError("At least one iteration is needed")
+        report = {
+            "commit": current_commit(),
+            "created_at": datetime.datetime.now().isoformat(timespec="seconds"),
+            "iterations": kwargs["iterations"],
+            "warm": kwargs["warm"],
+            "sizes": [],
+        }
+        for size in kwargs["sizes"]:
+            purge_data(refresh=False)
+            ranges = generate_data(
+                size,
+                users=kwargs["users"],
+                teams=kwargs["teams"],
+                projects=kwargs["projects"],
+                days=kwargs["days"],
+                seed=kwargs["seed"],
+            )
+            report["sizes"].append(
+                {
+                    "entries": size,
+                    "reports": run_benchmark(ranges, kwargs["iterations"], kwargs["warm"]),
+                }
+            )
+            self.stderr.write(f"{size} entries benchmarked")
+        if not kwargs["keep"]:
+            purge_data()
+
+        output = json.dumps(report, indent=2, sort_keys=True)
+        if kwargs["output"]:
+            with open(kwargs["output"], "w", encoding="utf-8") as output_file:
+                output_file.write(output + "\n")
+        else:
+            self.stdout.write(output)
@@ -0,0 +1,79 @@
+"""
+This module is responsible for the management command for freezing the
+reports of the closed months into snapshots
+"""
+import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from hubble.models import ReportSnapshot
+from reports.engine import ReportFrame, is_closed_month, last_closed_month
+from reports.views import SNAPSHOT_DATATABLES
+
+
+def parse_month(value):
+    """
+    Returns the first day of a month given as YYYY-MM
+    """
+    return datetime.datetime.strptime(value, "%Y-%m").date()
+
+
+class Command(BaseCommand):
+    """
+    Creates a custom command for freezing the reports of closed months
+    """
+
+    help = "Freezes the efficiency, monetization and KPI reports of closed months"
+
+    def add_arguments(self, parser):
+        """
+        This function is responsible for adding arguments to the command
+        """
+        parser.add_argument(
+            "--month",
+            action="append",
+            type=parse_month,
+            default=None,
+            help="Month to freeze as YYYY-MM, the latest closed month by default",
+        )
+        parser.add_argument(
+            "--report",
+            action="append",
+            choices=sorted(SNAPSHOT_DATATABLES),
+            default=None,
+            help="Report to freeze, every report by default",
+        )
+        parser.add_argument(
+            "--replace",
+            action="store_true",
+            help="Overwrite the snapshots which already exist",
+        )
+
+    def handle(self, *args, **kwargs):
+        """
+        Freeze every requested report of every requested month
+        """
+        months = kwargs["month"] or [last_closed_month()]
+        open_months = [month for month in months if not is_closed_month(month)]
+        if open_months:
+            raise CommandError(
+                "Only closed months can be frozen: "
+                + ", ".join(f"{month:%Y-%m}" for month in open_months)
+            )
+        for month in months:
+            date_range = ReportFrame.month_range(month.year, month.month)
+            # Every report of the month is computed from the same frame
+            with ReportFrame.share([date_range]):
+                for report in kwargs["report"] or sorted(SNAPSHOT_DATATABLES):
+                    datatable = SNAPSHOT_DATATABLES[report]()
+                    # The querysets of the reports are evaluated to be frozen
+                    rows = list(
+                        datatable.get_report_rows(datatable.get_period_params(*date_range))
+                    )
+                    snapshot, written = ReportSnapshot.objects.freeze(
+                        report, month, rows, replace=kwargs["replace"]
+                    )
+                    status = "frozen" if written else "already frozen"
+                    self.stdout.write(
+                        f"{report} {month:%Y-%m} {status} ({snapshot.row_count} rows)"
+                    )
@@ -0,0 +1,65 @@
+"""
+This module is responsible for the management command for loading synthetic
+timesheet data which the report benchmarks are run against
+"""
+import datetime
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.constants import ENVIRONMENT_PRODUCTION
+from reports.benchmark import generate_data, purge_data
+
+
+class Command(BaseCommand):
+    """
+    Creates a custom command for loading synthetic report data
+    """
+
+    help = "Bulk loads synthetic users, teams, resources, efficiencies and timesheet entries"
+
+    def add_arguments(self, parser):
+        """
+        This function is responsible for adding arguments to the command
+        """
+        parser.add_argument("--entries", type=int, default=100000)
+        parser.add_argument("--users", type=int, default=100)
+        parser.add_argument("--teams", type=int, default=10)
+        parser.add_argument("--projects", type=int, default=20)
+        parser.add_argument(
+            "--from-date",
+            type=datetime.date.fromisoformat,
+            default=None,
+            help="First day of the entries, the first day of the last year by default",
+        )
+        parser.add_argument("--days", type=int, default=365)
+        parser.add_argument("--seed", type=int, default=1)
+        parser.add_argument(
+            "--purge",
+            action="store_true",
+            help="Only delete the previously generated data",
+        )
+
+    def handle(self, *args, **kwargs):
+        """
+        Replace the previously generated data with a new volume
+        """
+        if settings.ENV_NAME == ENVIRONMENT_PRODUCTION:
+            raise CommandError("Synthetic data can't be generated in production")
+        deleted = purge_data(refresh=kwargs["purge"])
+        self.stdout.write(f"{deleted} generated timesheet entries deleted")
+        if kwargs["purge"]:
+            return
+        ranges = generate_data(
+            kwargs["entries"],
+            users=kwargs["users"],
+            teams=kwargs["teams"],
+            projects=kwargs["projects"],
+            from_date=kwargs["from_date"],
+            days=kwargs["days"],
+            seed=kwargs["seed"],
+        )
+        self.stdout.write(
+            f"{kwargs['entries']} timesheet entries generated "
+            f"from {ranges['from_date']} to {ranges['to_date']}"
+        )
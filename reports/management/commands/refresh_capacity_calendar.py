@@ -0,0 +1,32 @@
+"""
+This module is responsible for the management command for refreshing the
+capacity calendar which is used by the reports
+"""
+from django.core.management.base import BaseCommand
+
+from hubble.models import CapacityCalendar
+
+
+class Command(BaseCommand):
+    """
+    Creates a custom command for refreshing the capacity calendar
+    """
+
+    help = "Refreshes the capacity calendar from the expected efficiencies and holidays"
+
+    def add_arguments(self, parser):
+        """
+        This function is responsible for adding arguments to the command
+        """
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="Rebuild the whole calendar instead of the days changed since the last run",
+        )
+
+    def handle(self, *args, **kwargs):
+        """
+        Refresh the calendar days and report the number of rows written
+        """
+        written = CapacityCalendar.objects.refresh(full=kwargs["full"])
+        self.stdout.write(f"{written} calendar rows written")
@@ -0,0 +1,32 @@
+"""
+This module is responsible for the management command for refreshing the
+daily efficiency rollup table which is used by the reports
+"""
+from django.core.management.base import BaseCommand
+
+from hubble.models import DailyEfficiencyRollup
+
+
+class Command(BaseCommand):
+    """
+    Creates a custom command for refreshing the daily efficiency rollup
+    """
+
+    help = "Refreshes the daily efficiency rollup from the timesheet entries"
+
+    def add_arguments(self, parser):
+        """
+        This function is responsible for adding arguments to the command
+        """
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="Rebuild the whole rollup instead of the rows changed since the last run",
+        )
+
+    def handle(self, *args, **kwargs):
+        """
+        Refresh the rollup rows and report the number of rows written
+        """
+        written = DailyEfficiencyRollup.objects.refresh(full=kwargs["full"])
+        self.stdout.write(f"{written} rollup rows written")
@@ -0,0 +1,51 @@
+"""
+This module is responsible for the management command which works through
+the queued report jobs
+"""
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from hubble.models import ReportJob
+from reports.jobs import run_report_job
+
+
+class Command(BaseCommand):
+    """
+    Creates a custom command for running the queued report jobs
+    """
+
+    help = "Runs the queued report jobs, polling the job table for new jobs"
+
+    def add_arguments(self, parser):
+        """
+        This function is responsible for adding arguments to the command
+        """
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Exit once there are no pending jobs instead of polling",
+        )
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=5,
+            help="Seconds to wait between two polls when there are no pending jobs",
+        )
+
+    def handle(self, *args, **kwargs):
+        """
+        Claim and run the pending jobs one by one
+        """
+        while True:
+            job = ReportJob.objects.claim_next()
+            if job is not None:
+                run_report_job(job)
+                self.stdout.write(f"Report job {job.id} {job.status.lower()}")
+            elif kwargs["once"]:
+                break
+            else:
+                # Drop the connection if it has gone stale while idling
+                close_old_connections()
+                time.sleep(kwargs["sleep"])
@@ -0,0 +1,47 @@
+"""
+This module is responsible for the management command for storing the
+exchange rate of a currency which is used by the revenue reports
+"""
+import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from hubble.models import Currency, CurrencyRate
+
+
+class Command(BaseCommand):
+    """
+    Creates a custom command for storing the exchange rate of a currency
+    """
+
+    help = "Stores the value of one unit of a currency in the base currency of the reports"
+
+    def add_arguments(self, parser):
+        """
+        This function is responsible for adding arguments to the command
+        """
+        parser.add_argument("currency", help="Name of the currency")
+        parser.add_argument("rate", type=float, help="Value of one unit in the base currency")
+        parser.add_argument(
+            "--effective-from",
+            type=datetime.date.fromisoformat,
+            default=None,
+            help="Day from which the rate is effective, today by default",
+        )
+
+    def handle(self, *args, **kwargs):
+        """
+        Store the rate of the currency, replacing the rate of the same day
+        """
+        currency = Currency.objects.filter(name__iexact=kwargs["currency"]).first()
+        if currency is None:
+            raise CommandError(f"Currency {kwargs['currency']} does not exist")
+        if kwargs["rate"] <= 0:
+            raise CommandError("The rate should be greater than zero")
+        effective_from = kwargs["effective_from"] or datetime.date.today()
+        CurrencyRate.objects.update_or_create(
+            currency=currency,
+            effective_from=effective_from,
+            defaults={"rate": kwargs["rate"]},
+        )
+        self.stdout.write(f"{currency.name} rate from {effective_from} set to {kwargs['rate']}")
@@ -0,0 +1,85 @@
+"""
+Django test cases for the synthetic data generator and the report benchmark
+"""
+import datetime
+import json
+from io import StringIO
+
+from django.core.management import call_command
+
+from core.base_test import ReportsBaseTestCase
+from hubble.models import DailyEfficiencyRollup, TimesheetEntry
+from reports.benchmark import benchmark_users, percentile
+
+
+class BenchmarkTest(ReportsBaseTestCase):
+    """
+    This class is responsible for testing the report benchmark commands
+    """
+
+    def test_generate_data(self):
+        """
+        To makes sure that the requested volume is generated and purged
+        without touching the other rows
+        """
+        user = self.create_user()
+        self.create_timesheet_entry(user, self.create_team(), datetime.date(2023, 5, 2))
+        call_command(
+            "generate_report_data",
+            "--entries",
+            "120",
+            "--users",
+            "5",
+            "--from-date",
+            "2023-01-01",
+            "--days",
+            "31",
+            stdout=StringIO(),
+        )
+        self.assertEqual(benchmark_users().count(), 5)
+        generated = TimesheetEntry.objects.filter(user__in=benchmark_users())
+        self.assertEqual(generated.count(), 120)
+        self.assertFalse(generated.filter(entry_date__week_day__in=[1, 7]).exists())
+
+        call_command("generate_report_data", "--purge", stdout=StringIO())
+        self.assertEqual(TimesheetEntry.objects.count(), 1)
+        self.assertFalse(benchmark_users().exists())
+
+    def test_benchmark(self):
+        """
+        To makes sure that every report endpoint is timed at every size and
+        lists the generated rows, the report tables being refreshed from them
+        """
+        output = StringIO()
+        call_command(
+            "benchmark_reports",
+            "--sizes",
+            "20",
+            "40",
+            "--users",
+            "3",
+            "--days",
+            "20",
+            "--iterations",
+            "2",
+            stdout=output,
+            stderr=StringIO(),
+        )
+        report = json.loads(output.getvalue())
+        self.assertEqual([size["entries"] for size in report["sizes"]], [20, 40])
+        for size in report["sizes"]:
+            for result in size["reports"].values():
+                self.assertEqual(result["status"], 200)
+                self.assertLessEqual(result["p50_ms"], result["p95_ms"])
+                self.assertGreater(result["rows"], 0)
+        self.assertIn("monetization", report["sizes"][0]["reports"])
+        self.assertFalse(benchmark_users().exists())
+        self.assertFalse(DailyEfficiencyRollup.objects.exists())
+
+    def test_percentile(self):
+        """
+        To makes sure that the nearest-rank percentile is returned
+        """
+        self.assertEqual(percentile([5, 1, 3, 2, 4], 50), 3)
+        self.assertEqual(percentile([5, 1, 3, 2, 4], 95), 5)
+        self.assertEqual(percentile([7], 95), 7)
@@ -0,0 +1,171 @@
+"""
+Django test cases for the capacity calendar
+"""
+import datetime
+from io import StringIO
+
+from django.core.management import call_command
+from model_bakery import baker
+
+from core.base_test import ReportsBaseTestCase
+from hubble.models import CapacityCalendar
+
+
+class CapacityCalendarTest(ReportsBaseTestCase):
+    """
+    This class is responsible for testing the refresh of the capacity calendar
+    """
+
+    def setUp(self):
+        """
+        This function will run before every test and makes sure required data are ready
+        """
+        super().setUp()
+        self.team = self.create_team()
+        self.user = self.create_user()
+        self.user.is_saturday_working = False
+        self.user.team = self.team
+        self.user.save()
+        # Monday to Sunday, with a holiday on the Wednesday
+        self.monday = datetime.date(2023, 5, 1)
+        self.sunday = datetime.date(2023, 5, 7)
+        self.create_expected_efficiency(
+            self.user, expected_efficiency=8, effective_from=self.monday, effective_to=self.sunday
+        )
+        self.holiday = self.create_holiday(datetime.date(2023, 5, 3))
+
+    def create_holiday(self, day):
+        """
+        This function is responsible for creating an organization holiday
+        """
+        return baker.make("hubble.Holiday", date_of_holiday=day, updated_by=self.user)
+
+    def test_full_refresh(self):
+        """
+        To makes sure that only the working days of the user are stored
+        """
+        self.assertEqual(CapacityCalendar.objects.refresh(), 4)
+        self.assertEqual(
+            list(CapacityCalendar.objects.order_by("day").values_list("day", flat=True)),
+            [
+                datetime.date(2023, 5, 1),
+                datetime.date(2023, 5, 2),
+                datetime.date(2023, 5, 4),
+                datetime.date(2023, 5, 5),
+            ],
+        )
+
+    def test_saturday_working(self):
+        """
+        To makes sure that the Saturdays are stored for the Saturday working users
+        """
+        self.user.is_saturday_working = True
+        self.user.save()
+        self.assertEqual(CapacityCalendar.objects.refresh(), 5)
+        self.assertTrue(CapacityCalendar.objects.filter(day=datetime.date(2023, 5, 6)).exists())
+
+    def test_incremental_refresh(self):
+        """
+        To makes sure that only the days touched after the watermark are rebuilt
+        """
+        CapacityCalendar.objects.refresh()
+        self.assertEqual(CapacityCalendar.objects.refresh(), 0)
+        self.create_holiday(datetime.date(2023, 5, 4))
+        CapacityCalendar.objects.refresh()
+        self.assertEqual(CapacityCalendar.objects.count(), 3)
+        self.create_expected_efficiency(
+            self.user, expected_efficiency=4, effective_from=datetime.date(2023, 5, 5)
+        )
+        CapacityCalendar.objects.refresh()
+        self.assertEqual(
+            CapacityCalendar.objects.get(day=datetime.date(2023, 5, 5)).expected_hours, 4
+        )
+
+    def test_moved_holiday(self):
+        """
+        To makes sure that a holiday moved to another date frees its old date
+        without a full refresh
+        """
+        CapacityCalendar.objects.refresh()
+        self.holiday.date_of_holiday = datetime.date(2023, 5, 4)
+        self.holiday.save()
+        CapacityCalendar.objects.refresh()
+        self.assertEqual(
+            list(CapacityCalendar.objects.order_by("day").values_list("day", flat=True)),
+            [
+                datetime.date(2023, 5, 1),
+                datetime.date(2023, 5, 2),
+                datetime.date(2023, 5, 3),
+                datetime.date(2023, 5, 5),
+            ],
+        )
+
+    def test_team_of_the_day(self):
+        """
+        To makes sure that every day is attributed to the team of the
+        timesheets of the user on that day, and the days after their last
+        entry to their current team
+        """
+        other_team = self.create_team()
+        self.create_timesheet_entry(self.user, other_team, datetime.date(2023, 5, 2))
+        entry = self.create_timesheet_entry(self.user, self.team, datetime.date(2023, 5, 4))
+        CapacityCalendar.objects.refresh()
+        self.assertEqual(
+            list(CapacityCalendar.objects.order_by("day").values_list("team_id", flat=True)),
+            [other_team.id, other_team.id, self.team.id, self.team.id],
+        )
+
+        entry.team = other_team
+        entry.save()
+        CapacityCalendar.objects.refresh()
+        self.assertEqual(
+            list(CapacityCalendar.objects.order_by("day").values_list("team_id", flat=True)),
+            [other_team.id, other_team.id, other_team.id, self.team.id],
+        )
+
+    def test_departed_user(self):
+        """
+        To makes sure that the open ended efficiency of a user who has left
+        ends with their employment
+        """
+        user = self.create_user()
+        user.is_saturday_working = False
+        user.save()
+        self.create_expected_efficiency(user, effective_from=self.monday)
+        CapacityCalendar.objects.refresh()
+        self.assertGreater(CapacityCalendar.objects.filter(user=user).count(), 100)
+
+        user.deleted_at = datetime.datetime(2023, 5, 4, 10)
+        user.save()
+        CapacityCalendar.objects.refresh()
+        self.assertEqual(
+            list(
+                CapacityCalendar.objects.filter(user=user)
+                .order_by("day")
+                .values_list("day", flat=True)
+            ),
+            [datetime.date(2023, 5, 1), datetime.date(2023, 5, 2), datetime.date(2023, 5, 4)],
+        )
+
+        user.deleted_at = None
+        user.is_employed = False
+        user.save()
+        self.create_timesheet_entry(user, self.team, datetime.date(2023, 5, 2))
+        CapacityCalendar.objects.refresh()
+        self.assertEqual(
+            list(
+                CapacityCalendar.objects.filter(user=user)
+                .order_by("day")
+                .values_list("day", flat=True)
+            ),
+            [datetime.date(2023, 5, 1), datetime.date(2023, 5, 2)],
+        )
+
+    def test_team_capacity(self):
+        """
+        To makes sure that the expected hours are summed per team
+        """
+        call_command("refresh_capacity_calendar", "--full", stdout=StringIO())
+        row = CapacityCalendar.objects.date_range(self.monday, self.sunday).team_capacity().get()
+        self.assertEqual(row["pk"], self.team.id)
+        self.assertEqual(row["expected_hours"], 32)
@@ -0,0 +1,75 @@
+"""
+Django test cases for the result cache of the report datatables
+"""
+import datetime
+
+import time_machine
+from django.urls import reverse
+
+from core.base_test import ReportsBaseTestCase
+from core.constants import REPORT_DATA_VERSION_TIMEOUT
+from hubble.models import DailyEfficiencyRollup
+
+
+class DatatableCacheTest(ReportsBaseTestCase):
+    """
+    This class is responsible for testing the cached draws of the report datatables
+    """
+
+    def setUp(self):
+        """
+        This function will run before every test and makes sure required data are ready
+        """
+        super().setUp()
+        self.user = self.create_user()
+        self.authenticate(self.user)
+        self.team = self.create_team()
+        self.create_expected_efficiency(self.user, expected_efficiency=8)
+        self.day = datetime.date(2023, 5, 2)
+        self.create_timesheet_entry(self.user, self.team, self.day, authorized_hours=6)
+        DailyEfficiencyRollup.objects.refresh()
+        self.params = {"from_date": self.day, "to_date": self.day}
+
+    def test_cache_hit(self):
+        """
+        To makes sure that the same draw is answered from the cache with the
+        draw counter of the request
+        """
+        url = reverse("efficiency_datatable")
+        first = self.make_datatable_request(url, self.params)
+        self.assertEqual(first["X-Cache"], "MISS")
+        # Only the authenticated user is loaded by the session
+        with self.assertNumQueries(1):
+            second = self.make_datatable_request(url, {**self.params, "draw": 2})
+        self.assertEqual(second["X-Cache"], "HIT")
+        self.assertEqual(second.json()["draw"], 2)
+        self.assertEqual(second.json()["data"], first.json()["data"])
+
+    def test_cache_key_params(self):
+        """
+        To makes sure that another page or filter is not answered from the cache
+        """
+        url = reverse("efficiency_datatable")
+        self.make_datatable_request(url, self.params)
+        response = self.make_datatable_request(url, {**self.params, "start": 10})
+        self.assertEqual(response["X-Cache"], "MISS")
+        response = self.make_datatable_request(
+            url, {**self.params, "from_date": datetime.date(2023, 5, 1)}
+        )
+        self.assertEqual(response["X-Cache"], "MISS")
+
+    def test_invalidation(self):
+        """
+        To makes sure that the cache is invalidated when the data behind the report changes
+        """
+        url = reverse("efficiency_datatable")
+        self.make_datatable_request(url, self.params)
+        self.create_timesheet_entry(self.user, self.team, self.day, authorized_hours=2)
+        DailyEfficiencyRollup.objects.refresh()
+        expiry = datetime.datetime.now() + datetime.timedelta(
+            seconds=REPORT_DATA_VERSION_TIMEOUT + 1
+        )
+        with time_machine.travel(expiry):
+            response = self.make_datatable_request(url, self.params)
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertIn("50.0", response.json()["data"][0]["capacity"])
@@ -0,0 +1,180 @@
+"""
+Django test cases for the daily efficiency rollup and the report datatables
+"""
+import datetime
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.db.models import Avg, F
+from django.db.models.functions import Round
+from django.urls import reverse
+
+from core.base_test import ReportsBaseTestCase
+from hubble.models import CapacityCalendar, DailyEfficiencyRollup, TimesheetEntry
+
+
+class EfficiencyRollupTest(ReportsBaseTestCase):
+    """
+    This class is responsible for testing the rollup refresh and the datatables
+    """
+
+    def setUp(self):
+        """
+        This function will run before every test and makes sure required data are ready
+        """
+        super().setUp()
+        self.user = self.create_user()
+        self.authenticate(self.user)
+        self.team = self.create_team()
+        self.user.team = self.team
+        self.user.is_saturday_working = False
+        self.user.save()
+        self.create_expected_efficiency(self.user, expected_efficiency=8)
+        self.first_day = datetime.date(2023, 5, 2)
+        self.second_day = datetime.date(2023, 5, 3)
+        self.create_timesheet_entry(self.user, self.team, self.first_day, authorized_hours=6)
+        self.create_timesheet_entry(self.user, self.team, self.first_day, authorized_hours=1)
+        self.create_timesheet_entry(self.user, self.team, self.second_day, authorized_hours=4)
+
+    def test_full_refresh(self):
+        """
+        To makes sure that one row is stored for every team, user and day
+        """
+        self.assertEqual(DailyEfficiencyRollup.objects.refresh(), 2)
+        rollup = DailyEfficiencyRollup.objects.get(entry_date=self.first_day)
+        self.assertEqual(rollup.authorized_hours, 7)
+        self.assertEqual(rollup.entry_count, 2)
+        self.assertEqual(rollup.expected_efficiency, 8)
+
+    def test_incremental_refresh(self):
+        """
+        To makes sure that only the days touched after the watermark are rebuilt
+        """
+        DailyEfficiencyRollup.objects.refresh()
+        self.assertEqual(DailyEfficiencyRollup.objects.refresh(), 0)
+        self.create_timesheet_entry(self.user, self.team, self.second_day, authorized_hours=2)
+        self.assertEqual(DailyEfficiencyRollup.objects.refresh(), 1)
+        self.assertEqual(DailyEfficiencyRollup.objects.count(), 2)
+        rollup = DailyEfficiencyRollup.objects.get(entry_date=self.second_day)
+        self.assertEqual(rollup.authorized_hours, 6)
+
+    def test_incremental_refresh_of_moved_entry(self):
+        """
+        To makes sure that the old day, team and user of an edited entry are
+        rebuilt along with the new ones
+        """
+        DailyEfficiencyRollup.objects.refresh()
+        other_user = self.create_user()
+        other_team = self.create_team()
+        self.create_expected_efficiency(other_user, expected_efficiency=8)
+        entry = TimesheetEntry.objects.get(entry_date=self.second_day)
+        entry.entry_date = datetime.date(2023, 5, 4)
+        entry.user = other_user
+        entry.team = other_team
+        entry.save()
+        DailyEfficiencyRollup.objects.refresh()
+        self.assertFalse(DailyEfficiencyRollup.objects.filter(entry_date=self.second_day).exists())
+        rollup = DailyEfficiencyRollup.objects.get(entry_date=datetime.date(2023, 5, 4))
+        self.assertEqual((rollup.user_id, rollup.team_id), (other_user.id, other_team.id))
+        self.assertEqual(rollup.authorized_hours, 4)
+        self.assertEqual(DailyEfficiencyRollup.objects.count(), 2)
+
+    def test_entry_moved_during_refresh(self):
+        """
+        To makes sure that an entry moved while the refresh is running keeps
+        the key it was rebuilt under, so that the next refresh frees its old day
+        """
+        DailyEfficiencyRollup.objects.refresh()
+        entry = TimesheetEntry.objects.get(entry_date=self.second_day)
+        entry.authorized_hours = 5
+        entry.save()
+        bulk_create = DailyEfficiencyRollup.objects.bulk_create
+
+        def move_entry(*args, **kwargs):
+            TimesheetEntry.objects.filter(id=entry.id).update(
+                entry_date=datetime.date(2023, 5, 4), updated_at=datetime.datetime.now()
+            )
+            return bulk_create(*args, **kwargs)
+
+        with mock.patch.object(DailyEfficiencyRollup.objects, "bulk_create", move_entry):
+            DailyEfficiencyRollup.objects.refresh()
+        DailyEfficiencyRollup.objects.refresh()
+        self.assertFalse(DailyEfficiencyRollup.objects.filter(entry_date=self.second_day).exists())
+        rollup = DailyEfficiencyRollup.objects.get(entry_date=datetime.date(2023, 5, 4))
+        self.assertEqual(rollup.authorized_hours, 5)
+
+    def test_command(self):
+        """
+        To makes sure that the management command refreshes the rollup
+        """
+        call_command("refresh_efficiency_rollup", "--full", stdout=StringIO())
+        self.assertEqual(DailyEfficiencyRollup.objects.count(), 2)
+
+    def test_efficiency_datatable(self):
+        """
+        To makes sure that the capacity of the datatable matches the capacity
+        computed from the raw timesheet entries
+        """
+        DailyEfficiencyRollup.objects.refresh()
+        expected_capacity = (
+            TimesheetEntry.objects.all()
+            .date_range(self.first_day, self.second_day)
+            .values("team__name")
+            .annotate(
+                capacity=Round(
+                    Avg(
+                        100
+                        * F("authorized_hours")
+                        / F("user__expected_user_efficiencies__expected_efficiency")
+                    ),
+                    2,
+                )
+            )
+            .get()["capacity"]
+        )
+        response = self.make_datatable_request(
+            reverse("efficiency_datatable"),
+            {"from_date": self.first_day, "to_date": self.second_day},
+        )
+        self.assertEqual(response.status_code, 200)
+        data = response.json()["data"]
+        self.assertEqual(len(data), 1)
+        self.assertIn(str(expected_capacity), data[0]["capacity"])
+
+    def test_detailed_efficiency_datatable(self):
+        """
+        To makes sure that the monthly hours of a team are listed, with the
+        expected hours of the capacity calendar
+        """
+        DailyEfficiencyRollup.objects.refresh()
+        CapacityCalendar.objects.refresh()
+        response = self.make_datatable_request(
+            reverse("detailed_efficiency_datatable"),
+            {
+                "from_date": self.first_day,
+                "to_date": self.second_day,
+                "team_id": self.team.id,
+            },
+        )
+        row = response.json()["data"][0]
+        self.assertEqual(row["expected_hours"], 16)
+        self.assertEqual(row["actual_hours"], 11)
+        self.assertEqual(row["capacity"], 46)
+
+    def test_monetization_datatable(self):
+        """
+        To makes sure that the monetization gap is listed against the working
+        days of the month in the capacity calendar
+        """
+        DailyEfficiencyRollup.objects.refresh()
+        CapacityCalendar.objects.refresh()
+        response = self.make_datatable_request(
+            reverse("monetization_datatable"),
+            {"year_filter": 2023, "month_filter": 5},
+        )
+        row = response.json()["data"][0]
+        self.assertEqual(row["efficiency_capacity"], 11)
+        # The 23 working days of May 2023, without the Saturdays
+        self.assertEqual(row["monetization_capacity"], 184)
+        self.assertEqual(row["gap"], "94.02%")
@@ -0,0 +1,99 @@
+"""
+Django test cases for resolving the effective expected efficiency of the
+timesheet entries
+"""
+import datetime
+
+from django.urls import reverse
+
+from core.base_test import ReportsBaseTestCase
+from hubble.models import TimesheetEntry
+
+
+class ExpectedEfficiencyIntervalTest(ReportsBaseTestCase):
+    """
+    This class is responsible for testing the interval lookup of the expected efficiency
+    """
+
+    def setUp(self):
+        """
+        This function will run before every test and makes sure required data are ready
+        """
+        super().setUp()
+        self.user = self.create_user()
+        self.authenticate(self.user)
+        self.team = self.create_team()
+        self.create_expected_efficiency(
+            self.user,
+            expected_efficiency=6,
+            effective_from=datetime.date(2023, 1, 1),
+            effective_to=datetime.date(2023, 5, 31),
+        )
+        self.create_expected_efficiency(
+            self.user, expected_efficiency=8, effective_from=datetime.date(2023, 6, 1)
+        )
+        self.create_expected_efficiency(
+            self.user,
+            expected_efficiency=4,
+            effective_from=datetime.date(2023, 1, 1),
+            deleted_at=datetime.datetime(2023, 1, 2),
+        )
+        self.may_entry = self.create_timesheet_entry(
+            self.user, self.team, datetime.date(2023, 5, 15)
+        )
+        self.june_entry = self.create_timesheet_entry(
+            self.user, self.team, datetime.date(2023, 6, 15)
+        )
+
+    def test_date_range_is_one_to_one(self):
+        """
+        To makes sure that every entry is joined to exactly one efficiency
+        """
+        queryset = TimesheetEntry.objects.all().date_range(
+            datetime.date(2023, 5, 1), datetime.date(2023, 6, 30)
+        )
+        self.assertEqual(queryset.count(), 2)
+        self.assertEqual(
+            dict(queryset.values_list("id", "effective_efficiency")),
+            {self.may_entry.id: 6, self.june_entry.id: 8},
+        )
+
+    def test_date_range_skips_entries_without_efficiency(self):
+        """
+        To makes sure that the entries outside every efficiency window are skipped
+        """
+        self.create_timesheet_entry(self.user, self.team, datetime.date(2022, 12, 15))
+        queryset = TimesheetEntry.objects.all().date_range(
+            datetime.date(2022, 12, 1), datetime.date(2023, 6, 30)
+        )
+        self.assertEqual(queryset.count(), 2)
+
+    def test_subquery_resolved_once(self):
+        """
+        To makes sure that the date range is filtered with a semi join, so that
+        the efficiency subquery is only resolved where it is selected
+        """
+        queryset = (
+            TimesheetEntry.objects.all()
+            .date_range(datetime.date(2023, 5, 1), datetime.date(2023, 6, 30))
+            .kpi_fields()
+        )
+        sql = str(queryset.query)
+        self.assertEqual(sql.count('"expected_user_efficiencies"'), 2)
+        self.assertEqual(sql.count("EXISTS"), 1)
+        self.assertEqual(
+            sorted(row["expected_efficiency"] for row in queryset),
+            [6, 8],
+        )
+
+    def test_kpi_datatable(self):
+        """
+        To makes sure that the KPI report lists every entry once with its efficiency
+        """
+        response = self.make_datatable_request(
+            reverse("kpi_datatable"),
+            {"from_date": "2023-05-01", "to_date": "2023-06-30"},
+        )
+        data = response.json()["data"]
+        self.assertEqual(len(data), 2)
+        self.assertEqual(sorted(row["expected_efficiency"] for row in data), [6, 8])
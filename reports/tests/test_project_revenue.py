@@ -0,0 +1,134 @@
+"""
+Django test cases for the project revenue report
+"""
+import datetime
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from model_bakery import baker
+
+from core.base_test import ReportsBaseTestCase
+
+
+class ProjectRevenueTest(ReportsBaseTestCase):
+    """
+    This class is responsible for testing the revenue of the projects
+    """
+
+    def setUp(self):
+        """
+        This function will run before every test and makes sure required data are ready
+        """
+        super().setUp()
+        self.user = self.create_user()
+        self.authenticate(self.user)
+        self.team = self.create_team()
+        self.create_expected_efficiency(self.user, expected_efficiency=8)
+        self.currency = baker.make("hubble.Currency", name="USD")
+        self.project = baker.make("hubble.Project", currency=self.currency)
+        baker.make(
+            "hubble.ProjectResource",
+            user=self.user,
+            project=self.project,
+            charge_by_hour=10,
+            allotted_from=datetime.date(2023, 1, 1),
+            removed_on=None,
+        )
+        call_command(
+            "set_currency_rate", "usd", "80", "--effective-from", "2023-01-01", stdout=StringIO()
+        )
+        call_command(
+            "set_currency_rate", "usd", "82", "--effective-from", "2023-06-01", stdout=StringIO()
+        )
+        for entry_date in (datetime.date(2023, 5, 2), datetime.date(2023, 6, 5)):
+            self.create_timesheet_entry(
+                self.user,
+                self.team,
+                entry_date,
+                project=self.project,
+                authorized_hours=6,
+                billed_hours=4,
+            )
+
+    def test_datatable(self):
+        """
+        To makes sure that the hours are converted with the rate effective on
+        their day, by a single aggregated query besides the count of the projects
+        """
+        with CaptureQueriesContext(connection) as queries:
+            response = self.make_datatable_request(
+                reverse("project_revenue_datatable"),
+                {"from_date": "2023-05-01", "to_date": "2023-06-30"},
+            )
+        self.assertEqual(response.status_code, 200)
+        revenue_queries = [
+            query
+            for query in queries
+            if "currency_rates" in query["sql"] and "timesheet_entries" in query["sql"]
+        ]
+        self.assertEqual(len(revenue_queries), 2)
+        row = response.json()["data"][0]
+        self.assertEqual(row["project_name"], self.project.name)
+        self.assertEqual(row["billed_revenue"], 80)
+        self.assertEqual(row["authorized_revenue"], 120)
+        self.assertEqual(row["billed_revenue_base"], 4 * 10 * 80 + 4 * 10 * 82)
+        self.assertEqual(row["revenue_at_risk"], 2 * 10 * 80 + 2 * 10 * 82)
+        self.assertEqual(row["unrated_hours"], 0)
+        self.assertEqual(row["unconverted_hours"], 0)
+
+    def test_unconverted_hours(self):
+        """
+        To makes sure that the entries of users without an expected efficiency
+        are billed and the hours without a currency rate are listed instead of
+        being converted
+        """
+        user = self.create_user()
+        baker.make(
+            "hubble.ProjectResource",
+            user=user,
+            project=self.project,
+            charge_by_hour=10,
+            allotted_from=datetime.date(2022, 1, 1),
+            removed_on=None,
+        )
+        self.create_timesheet_entry(
+            user,
+            self.team,
+            datetime.date(2022, 12, 15),
+            project=self.project,
+            authorized_hours=5,
+            billed_hours=3,
+        )
+        response = self.make_datatable_request(
+            reverse("project_revenue_datatable"),
+            {"from_date": "2022-12-01", "to_date": "2023-06-30"},
+        )
+        row = response.json()["data"][0]
+        self.assertEqual(row["authorized_sum"], 17)
+        self.assertEqual(row["unconverted_hours"], 5)
+        self.assertEqual(row["authorized_revenue"], 170)
+        self.assertEqual(row["billed_revenue_base"], 4 * 10 * 80 + 4 * 10 * 82)
+        self.assertEqual(row["revenue_at_risk"], 2 * 10 * 80 + 2 * 10 * 82)
+
+    def test_export(self):
+        """
+        To makes sure that the report is exported with the plain column titles
+        """
+        response = self.make_get_request(
+            reverse("project_revenue_export"),
+            {"from_date": "2023-05-01", "to_date": "2023-06-30"},
+        )
+        self.assertEqual(response.status_code, 200)
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertIn("Revenue at risk (Base currency)", lines[0])
+        self.assertIn(self.project.name, lines[1])
+
+    def test_unknown_currency(self):
+        """
+        To makes sure that the rate of an unknown currency is rejected
+        """
+        with self.assertRaises(CommandError):
+            call_command("set_currency_rate", "unknown", "1", stdout=StringIO())
@@ -0,0 +1,110 @@
+"""
+Django test cases for the database router of the read replica. The routing
+to the replica is only tested when REPLICA_DATABASE_URL is configured
+"""
+import datetime
+import unittest
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.test import Client, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from model_bakery import baker
+
+from core.base_test import ReportsBaseTestCase
+from core.db_router import REPLICA_DATABASE, ReplicaRouter, use_replica
+from hubble.models import ReportJob, TimesheetEntry, User
+from hubble_report.settings import env
+
+replica_configured = REPLICA_DATABASE in settings.DATABASES
+
+
+class ReplicaRouterTest(ReportsBaseTestCase):
+    """
+    This class is responsible for testing the routing within a transaction
+    """
+
+    def setUp(self):
+        """
+        This function will run before every test and makes sure required data are ready
+        """
+        super().setUp()
+        self.router = ReplicaRouter()
+
+    def test_writes_stay_on_primary(self):
+        """
+        To makes sure that the writes and the migrations never go to the replica
+        """
+        with use_replica():
+            self.assertEqual(self.router.db_for_write(TimesheetEntry), "default")
+        self.assertFalse(self.router.allow_migrate(REPLICA_DATABASE, "hubble"))
+        self.assertTrue(self.router.allow_migrate("default", "hubble"))
+
+    def test_reads_within_transaction(self):
+        """
+        To makes sure that the reads within a transaction of the primary, like
+        every test case, stay on the primary
+        """
+        with use_replica():
+            self.assertIsNone(self.router.db_for_read(TimesheetEntry))
+
+
+@unittest.skipUnless(replica_configured, "REPLICA_DATABASE_URL is not configured")
+class ReplicaReadsTest(TransactionTestCase):
+    """
+    This class is responsible for testing the routing to a configured replica.
+    The data is committed, so that the replica connection can read it
+    """
+
+    databases = "__all__"
+
+    def setUp(self):
+        """
+        This function will run before every test and makes sure required data are ready
+        """
+        settings.ROOT_URLCONF = "reports.urls"
+        cache.clear()
+        self.router = ReplicaRouter()
+        self.client = Client()
+        self.client.force_login(baker.make("hubble.User", is_employed=True))
+
+    def test_reports_reads(self):
+        """
+        To makes sure that only the reports models are read from the replica,
+        and only while the reports reads are enabled
+        """
+        self.assertIsNone(self.router.db_for_read(TimesheetEntry))
+        with use_replica():
+            self.assertEqual(self.router.db_for_read(TimesheetEntry), REPLICA_DATABASE)
+            self.assertIsNone(self.router.db_for_read(User))
+            self.assertIsNone(self.router.db_for_read(ReportJob))
+
+    @override_settings(REPLICA_MAX_LAG=-1)
+    def test_lagging_replica(self):
+        """
+        To makes sure that the reads fall back to the primary when the replica lags
+        """
+        with use_replica():
+            self.assertIsNone(self.router.db_for_read(TimesheetEntry))
+
+    def test_reports_request(self):
+        """
+        To makes sure that a request of the reports subdomain reads the
+        timesheet entries from the replica
+        """
+        with CaptureQueriesContext(connections[REPLICA_DATABASE]) as queries:
+            self.client.post(
+                reverse("kpi_datatable"),
+                {
+                    "draw": 1,
+                    "start": 0,
+                    "length": 10,
+                    "from_date": datetime.date(2023, 5, 1),
+                    "to_date": datetime.date(2023, 5, 31),
+                },
+                SERVER_NAME=env("REPORTS_TESTCASE_SERVER_NAME"),
+                HTTP_ACCEPT="application/json",
+            )
+        self.assertTrue(any("timesheet_entries" in query["sql"] for query in queries))
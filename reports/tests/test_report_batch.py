@@ -0,0 +1,151 @@
+"""
+Django test cases for the batched report endpoint
+"""
+import datetime
+import json
+
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core.base_test import ReportsBaseTestCase
+from hubble.models import DailyEfficiencyRollup
+
+
+class ReportBatchTest(ReportsBaseTestCase):
+    """
+    This class is responsible for testing several reports answered in one request
+    """
+
+    def setUp(self):
+        """
+        This function will run before every test and makes sure required data are ready
+        """
+        super().setUp()
+        self.user = self.create_user()
+        self.authenticate(self.user)
+        self.team = self.create_team()
+        self.create_expected_efficiency(self.user, expected_efficiency=8)
+        self.create_timesheet_entry(
+            self.user, self.team, datetime.date(2023, 5, 2), authorized_hours=6
+        )
+        self.create_timesheet_entry(
+            self.user, self.team, datetime.date(2023, 6, 5), authorized_hours=4
+        )
+        DailyEfficiencyRollup.objects.refresh()
+        self.page = {"draw": 1, "start": 0, "length": 10}
+        self.specs = [
+            {
+                "report": "efficiency",
+                "params": {**self.page, "from_date": "2023-05-01", "to_date": "2023-06-30"},
+            },
+            {
+                "report": "detailed_efficiency",
+                "params": {
+                    **self.page,
+                    "from_date": "2023-05-01",
+                    "to_date": "2023-06-30",
+                    "team_id": self.team.id,
+                },
+            },
+            {
+                "report": "kpi",
+                "params": {**self.page, "from_date": "2023-06-01", "to_date": "2023-06-30"},
+            },
+            {
+                "report": "monetization",
+                "params": {**self.page, "year_filter": 2023, "month_filter": 5},
+            },
+        ]
+
+    def make_batch_request(self, specs):
+        """
+        This function is responsible for requesting a batch of reports
+        """
+        return self.client.post(
+            reverse("report_batch"),
+            json.dumps({"reports": specs}),
+            content_type="application/json",
+            SERVER_NAME=self.testcase_server_name,
+            HTTP_ACCEPT="application/json",
+        )
+
+    def test_batch(self):
+        """
+        To makes sure that every report of the batch matches its own datatable
+        while the timesheet entries are loaded only once
+        """
+        with CaptureQueriesContext(connection) as queries:
+            response = self.make_batch_request(self.specs)
+        self.assertEqual(response.status_code, 200)
+        frame_queries = [
+            query["sql"]
+            for query in queries
+            if '"daily_efficiency_rollups"' in query["sql"] and "BETWEEN" in query["sql"]
+        ]
+        self.assertEqual(len(frame_queries), 1)
+
+        # The reports are computed again from their own frames
+        cache.clear()
+        results = response.json()["results"]
+        self.assertEqual(
+            [result["report"] for result in results], [spec["report"] for spec in self.specs]
+        )
+        urls = {
+            "efficiency": "efficiency_datatable",
+            "detailed_efficiency": "detailed_efficiency_datatable",
+            "kpi": "kpi_datatable",
+            "monetization": "monetization_datatable",
+        }
+        for spec, result in zip(self.specs, results):
+            self.assertEqual(result["status"], 200)
+            expected = self.make_datatable_request(reverse(urls[spec["report"]]), spec["params"])
+            self.assertEqual(result["data"]["data"], expected.json()["data"])
+            self.assertTrue(result["data"]["data"])
+
+    def test_disjoint_ranges(self):
+        """
+        To makes sure that the disjoint date ranges are loaded into frames of
+        their own, while the reports which aren't computed from the frame
+        don't widen it
+        """
+        specs = [
+            {
+                "report": "efficiency",
+                "params": {**self.page, "from_date": "2023-05-01", "to_date": "2023-05-31"},
+            },
+            {
+                "report": "efficiency",
+                "params": {**self.page, "from_date": "2023-05-15", "to_date": "2023-06-10"},
+            },
+            {
+                "report": "efficiency",
+                "params": {**self.page, "from_date": "2024-01-01", "to_date": "2024-01-31"},
+            },
+            {
+                "report": "project_revenue",
+                "params": {**self.page, "from_date": "2020-01-01", "to_date": "2025-12-31"},
+            },
+        ]
+        with CaptureQueriesContext(connection) as queries:
+            response = self.make_batch_request(specs)
+        self.assertEqual(response.status_code, 200)
+        frame_queries = [
+            query["sql"]
+            for query in queries
+            if '"daily_efficiency_rollups"' in query["sql"] and "BETWEEN" in query["sql"]
+        ]
+        self.assertEqual(len(frame_queries), 2)
+        self.assertIn("BETWEEN '2023-05-01'::date AND '2023-06-10'::date", frame_queries[0])
+        self.assertIn("BETWEEN '2024-01-01'::date AND '2024-01-31'::date", frame_queries[1])
+        self.assertEqual(
+            [result["status"] for result in response.json()["results"]], [200, 200, 200, 200]
+        )
+
+    def test_invalid_batch(self):
+        """
+        To makes sure that an unknown report or an empty batch is rejected
+        """
+        self.assertEqual(self.make_batch_request([{"report": "unknown"}]).status_code, 400)
+        self.assertEqual(self.make_batch_request([]).status_code, 400)
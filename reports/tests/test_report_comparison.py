@@ -0,0 +1,94 @@
+"""
+Django test cases for the comparison mode of the efficiency and monetization reports
+"""
+import datetime
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core.base_test import ReportsBaseTestCase
+from hubble.models import CapacityCalendar
+
+
+class ReportComparisonTest(ReportsBaseTestCase):
+    """
+    This class is responsible for testing the comparison of two date windows
+    """
+
+    def setUp(self):
+        """
+        This function will run before every test and makes sure required data are ready
+        """
+        super().setUp()
+        self.user = self.create_user()
+        self.authenticate(self.user)
+        self.team = self.create_team()
+        self.create_expected_efficiency(self.user, expected_efficiency=8)
+        self.create_timesheet_entry(
+            self.user, self.team, datetime.date(2022, 5, 2), authorized_hours=4
+        )
+        self.create_timesheet_entry(
+            self.user, self.team, datetime.date(2023, 5, 2), authorized_hours=6
+        )
+        self.create_timesheet_entry(
+            self.user, self.team, datetime.date(2023, 5, 3), authorized_hours=8
+        )
+
+    def test_efficiency_comparison(self):
+        """
+        To makes sure that the capacity of both windows is computed by one
+        query, the previous window defaulting to the same window last year
+        """
+        with CaptureQueriesContext(connection) as queries:
+            response = self.make_datatable_request(
+                reverse("efficiency_comparison_datatable"),
+                {"from_date": "2023-05-01", "to_date": "2023-05-31"},
+            )
+        self.assertEqual(response.status_code, 200)
+        comparison_queries = [query for query in queries if "FILTER" in query["sql"]]
+        # The count of the teams and the page of the teams
+        self.assertEqual(len(comparison_queries), 2)
+        row = response.json()["data"][0]
+        self.assertEqual(row["capacity_current"], 87.5)
+        self.assertEqual(row["capacity_previous"], 50)
+        self.assertEqual(row["capacity_delta"], 37.5)
+        self.assertEqual(row["capacity_delta_pct"], "75.0%")
+
+    def test_monetization_comparison(self):
+        """
+        To makes sure that the monetization fields of the selected months are
+        compared, against the working days of the months in the capacity calendar
+        """
+        self.user.team = self.team
+        self.user.is_saturday_working = False
+        self.user.save()
+        CapacityCalendar.objects.refresh()
+        response = self.make_datatable_request(
+            reverse("monetization_comparison_datatable"),
+            {
+                "year_filter": 2023,
+                "month_filter": 5,
+                "compare_year_filter": 2023,
+                "compare_month_filter": 4,
+            },
+        )
+        row = response.json()["data"][0]
+        self.assertEqual(row["efficiency_capacity_current"], 14)
+        self.assertEqual(row["efficiency_capacity_previous"], 0)
+        self.assertEqual(row["efficiency_capacity_delta_pct"], None)
+        # The 23 working days of May and the 20 of April 2023, without the Saturdays
+        self.assertEqual(row["monetization_capacity_current"], 184)
+        self.assertEqual(row["monetization_capacity_previous"], 160)
+        self.assertEqual(row["gap_current"], 92.39)
+        self.assertEqual(row["gap_previous"], 0)
+
+    def test_invalid_windows(self):
+        """
+        To makes sure that no rows are listed for an invalid window
+        """
+        response = self.make_datatable_request(
+            reverse("efficiency_comparison_datatable"),
+            {"from_date": "2023-05-01", "to_date": "2023-05-31", "compare_from_date": "x"},
+        )
+        self.assertEqual(response.json()["data"], [])
@@ -0,0 +1,286 @@
+"""
+Django test cases for the report frame which computes the reports in memory
+from the daily efficiency rollup, and for the KPI datatable
+"""
+import datetime
+
+from django.db import connection
+from django.db.models import Avg, CharField, F, FloatField, Func, Sum, Value
+from django.db.models.functions import Round
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core.base_test import ReportsBaseTestCase
+from hubble.models import (
+    CapacityCalendar,
+    DailyEfficiencyRollup,
+    SearchMirror,
+    TimesheetEntry,
+)
+from reports.engine import ReportFrame
+
+
+class ReportFrameTest(ReportsBaseTestCase):
+    """
+    This class is responsible for testing that the report frame returns the
+    same results as the aggregations of the timesheet entries in the database
+    """
+
+    def setUp(self):
+        """
+        This function will run before every test and makes sure required data are ready
+        """
+        super().setUp()
+        self.user = self.create_user()
+        self.authenticate(self.user)
+        self.teams = [self.create_team(), self.create_team()]
+        self.users = [self.create_user(), self.create_user(), self.create_user()]
+        for user, team in zip(self.users, self.teams):
+            user.team = team
+            user.is_saturday_working = False
+            user.save()
+        self.create_expected_efficiency(self.users[0], 6, effective_to=datetime.date(2023, 5, 31))
+        self.create_expected_efficiency(self.users[0], 8, effective_from=datetime.date(2023, 6, 1))
+        self.create_expected_efficiency(self.users[1], 7)
+        for day, hours in ((2, 5), (15, 7), (31, 3)):
+            for month in (5, 6, 7):
+                if day > 30 and month == 6:
+                    continue
+                entry_date = datetime.date(2023, month, day)
+                self.create_timesheet_entry(
+                    self.users[0], self.teams[0], entry_date, authorized_hours=hours
+                )
+                # Several entries of a user on a day are rolled up together
+                self.create_timesheet_entry(
+                    self.users[0], self.teams[0], entry_date, authorized_hours=hours - 1
+                )
+                self.create_timesheet_entry(
+                    self.users[1], self.teams[month % 2], entry_date, authorized_hours=hours + 1
+                )
+                # Entries of users without an expected efficiency are skipped
+                self.create_timesheet_entry(self.users[2], self.teams[1], entry_date)
+        DailyEfficiencyRollup.objects.refresh()
+        CapacityCalendar.objects.refresh()
+        self.from_date = datetime.date(2023, 5, 1)
+        self.to_date = datetime.date(2023, 7, 31)
+
+    def test_efficiency(self):
+        """
+        To makes sure that the capacity of every team matches the database
+        """
+        window = (self.from_date, self.to_date)
+        expected = sorted(
+            (
+                {
+                    "pk": row["pk"],
+                    "team__name": row["team__name"],
+                    "capacity": row["capacity_current"],
+                }
+                for row in TimesheetEntry.objects.all().efficiency_comparison(window, window)
+            ),
+            key=lambda row: row["pk"],
+        )
+        self.assertEqual(ReportFrame.load(self.from_date, self.to_date).efficiency(), expected)
+
+    def test_detailed_efficiency(self):
+        """
+        To makes sure that the monthly hours of a team match the database and
+        the expected hours match the capacity calendar of the team
+        """
+        for team in self.teams:
+            calendar = {
+                row["day__month"]: row["expected_hours"]
+                for row in CapacityCalendar.objects.date_range(self.from_date, self.to_date)
+                .filter(team=team)
+                .values("day__month")
+                .annotate(expected_hours=Sum("expected_hours", output_field=FloatField()))
+                .order_by()
+            }
+            expected = sorted(
+                TimesheetEntry.objects.all()
+                .date_range(self.from_date, self.to_date)
+                .filter(team=team)
+                .annotate(
+                    month=Func(
+                        F("entry_date"),
+                        Value("Month-YYYY"),
+                        function="to_char",
+                        output_field=CharField(),
+                    )
+                )
+                .values("month")
+                .annotate(
+                    actual_hours=Sum("authorized_hours", output_field=FloatField()),
+                    capacity=Round(
+                        Avg(
+                            100 * F("authorized_hours") / F("effective_efficiency"),
+                            output_field=FloatField(),
+                        )
+                    ),
+                )
+                .order_by(),
+                key=lambda row: datetime.datetime.strptime(row["month"].replace(" ", ""), "%B-%Y"),
+            )
+            for row in expected:
+                month = datetime.datetime.strptime(row["month"].replace(" ", ""), "%B-%Y").month
+                row["expected_hours"] = calendar.get(month, 0.0)
+            result = ReportFrame.load(self.from_date, self.to_date).detailed_efficiency(team.id)
+            self.assertEqual(result, expected)
+
+    def test_monetization(self):
+        """
+        To makes sure that the monetization fields of a month match the database
+        """
+        month = ReportFrame.month_range(2023, 5)
+        expected = [
+            (
+                row["team__name"],
+                row["efficiency_capacity_current"],
+                row["monetization_capacity_current"],
+                row["gap_current"],
+            )
+            for row in TimesheetEntry.objects.all().monetization_comparison(month, month)
+        ]
+        result = ReportFrame.load_month("2023", "5").monetization()
+        self.assertEqual(
+            [
+                (
+                    row["team__name"],
+                    row["efficiency_capacity"],
+                    row["monetization_capacity"],
+                    row["gap"],
+                )
+                for row in result
+            ],
+            expected,
+        )
+        self.assertEqual({row["day"] for row in result}, {"May       2023"})
+
+    def test_pre_grouped_rows(self):
+        """
+        To makes sure that the frame holds a row per team, user and day
+        instead of a row per timesheet entry
+        """
+        frame = ReportFrame.load(self.from_date, self.to_date)
+        self.assertEqual(len(frame.data_frame), 16)
+        self.assertEqual(
+            frame.data_frame["entry_count"].sum(),
+            TimesheetEntry.objects.all().date_range(self.from_date, self.to_date).count(),
+        )
+
+    def test_kpi_keyset_pagination(self):
+        """
+        To makes sure that the KPI datatable pages through the timesheet
+        entries in order, fetching the next pages with a cursor
+        """
+        params = {"from_date": self.from_date, "to_date": self.to_date, "length": 10}
+        expected = list(
+            TimesheetEntry.objects.all().date_range(self.from_date, self.to_date).kpi_fields()
+        )
+        rows = self.make_datatable_request(reverse("kpi_datatable"), params).json()["data"]
+        with CaptureQueriesContext(connection) as queries:
+            for start in (10, 20):
+                response = self.make_datatable_request(
+                    reverse("kpi_datatable"), {**params, "start": start}
+                )
+                rows += response.json()["data"]
+        self.assertEqual(response.json()["recordsTotal"], len(expected))
+        self.assertEqual(
+            [row["authorized_sum"] for row in rows],
+            [row["authorized_sum"] for row in expected],
+        )
+        self.assertFalse(
+            any(
+                "OFFSET" in query["sql"]
+                for query in queries
+                if '"timesheet_entries"' in query["sql"]
+            )
+        )
+
+    def test_kpi_keyset_pagination_by_relation(self):
+        """
+        To makes sure that the KPI datatable sorted by a related name, which
+        its rows don't carry as it is, still fetches the next pages with a
+        cursor
+        """
+        params = {
+            "from_date": self.from_date,
+            "to_date": self.to_date,
+            "length": 10,
+            "columns[0][name]": "project_name",
+            "columns[0][orderable]": "true",
+            "order[0][column]": 0,
+            "order[0][dir]": "desc",
+        }
+        expected = list(
+            TimesheetEntry.objects.all()
+            .date_range(self.from_date, self.to_date)
+            .kpi_fields()
+            .order_by("-project__name", "pk")
+        )
+        rows = self.make_datatable_request(reverse("kpi_datatable"), params).json()["data"]
+        with CaptureQueriesContext(connection) as queries:
+            for start in (10, 20):
+                response = self.make_datatable_request(
+                    reverse("kpi_datatable"), {**params, "start": start}
+                )
+                rows += response.json()["data"]
+        columns = ("project_name", "user_name", "authorized_sum", "billed_sum")
+        self.assertEqual(
+            [[row[column] for column in columns] for row in rows],
+            [[row[column] for column in columns] for row in expected],
+        )
+        self.assertFalse(
+            any(
+                "OFFSET" in query["sql"]
+                for query in queries
+                if '"timesheet_entries"' in query["sql"]
+            )
+        )
+
+    def test_all_rows(self):
+        """
+        To makes sure that the "All" length lists every row of the datatables
+        whose rows are a list of dictionaries
+        """
+        params = {"from_date": self.from_date, "to_date": self.to_date, "length": -1}
+        response = self.make_datatable_request(reverse("efficiency_datatable"), params)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            len(response.json()["data"]),
+            len(ReportFrame.load(self.from_date, self.to_date).efficiency()),
+        )
+        self.assertEqual(response.json()["recordsTotal"], len(response.json()["data"]))
+
+    def test_datatable_search_and_order(self):
+        """
+        To makes sure that the KPI datatable is searched through the search
+        mirror and sorted in the database
+        """
+        SearchMirror.objects.refresh()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.make_datatable_request(
+                reverse("kpi_datatable"),
+                {
+                    "from_date": self.from_date,
+                    "to_date": self.to_date,
+                    "columns[0][name]": "user_name",
+                    "columns[0][searchable]": "true",
+                    "columns[0][orderable]": "true",
+                    "columns[1][name]": "authorized_sum",
+                    "columns[1][searchable]": "false",
+                    "columns[1][orderable]": "true",
+                    "order[0][column]": 1,
+                    "order[0][dir]": "asc",
+                    "search[value]": self.users[1].name,
+                    "length": 100,
+                },
+            )
+        data = response.json()["data"]
+        self.assertEqual(len(data), 8)
+        self.assertEqual({row["user_name"] for row in data}, {self.users[1].name})
+        self.assertEqual(
+            [row["authorized_sum"] for row in data],
+            sorted(row["authorized_sum"] for row in data),
+        )
+        self.assertTrue(any('"search_mirror"' in query["sql"] for query in queries))
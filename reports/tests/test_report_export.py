@@ -0,0 +1,110 @@
+"""
+Django test cases for the CSV and XLSX exports of the reports
+"""
+import csv
+import datetime
+import io
+
+from django.urls import reverse
+from openpyxl import load_workbook
+
+from core.base_test import ReportsBaseTestCase
+from hubble.models import CapacityCalendar, DailyEfficiencyRollup
+from reports.xlsx import stream_workbook
+
+
+class ReportExportTest(ReportsBaseTestCase):
+    """
+    This class is responsible for testing the report export endpoints
+    """
+
+    def setUp(self):
+        """
+        This function will run before every test and makes sure required data are ready
+        """
+        super().setUp()
+        self.user = self.create_user()
+        self.authenticate(self.user)
+        self.team = self.create_team()
+        self.user.team = self.team
+        self.user.is_saturday_working = False
+        self.user.save()
+        self.create_expected_efficiency(self.user, expected_efficiency=8)
+        self.day = datetime.date(2023, 5, 2)
+        self.create_timesheet_entry(self.user, self.team, self.day, authorized_hours=6)
+        DailyEfficiencyRollup.objects.refresh()
+        CapacityCalendar.objects.refresh()
+        self.date_range = {"from_date": self.day, "to_date": self.day}
+
+    def read_csv(self, response):
+        """
+        This function is responsible for reading the rows of a streamed CSV response
+        """
+        content = b"".join(response.streaming_content).decode()
+        return list(csv.reader(io.StringIO(content)))
+
+    def test_efficiency_csv(self):
+        """
+        To makes sure that the efficiency report is streamed as CSV without markup
+        """
+        response = self.make_get_request(reverse("efficiency_export"), self.date_range)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "text/csv")
+        rows = self.read_csv(response)
+        self.assertEqual(rows, [["Team Name", "Capacity"], [self.team.name, "75.0"]])
+
+    def test_monetization_csv(self):
+        """
+        To makes sure that the monetization report is exported with plain titles
+        """
+        response = self.make_get_request(
+            reverse("monetization_export"), {"year_filter": 2023, "month_filter": 5}
+        )
+        rows = self.read_csv(response)
+        self.assertEqual(rows[0][2], "Efficiency Capacity (Accomplishment)")
+        self.assertEqual(rows[1][4:], ["96.74%", "Need Improvements"])
+
+    def test_kpi_xlsx(self):
+        """
+        To makes sure that the KPI report is exported as a workbook
+        """
+        response = self.make_get_request(
+            reverse("kpi_export"), {**self.date_range, "format": "xlsx"}
+        )
+        self.assertEqual(response.status_code, 200)
+        workbook = load_workbook(io.BytesIO(b"".join(response.streaming_content)))
+        rows = list(workbook["kpi"].values)
+        self.assertEqual(rows[0][1], "User Name")
+        self.assertEqual(rows[1][1:], (self.user.name, self.team.name, 4, 6, 8, 8))
+
+    def test_xlsx_streaming(self):
+        """
+        To makes sure that the workbook is streamed while the rows are still
+        being fetched, with the values kept as numbers and escaped strings
+        """
+        fetched = []
+
+        def rows():
+            for number in range(3):
+                fetched.append(number)
+                yield [f"<row {number}> & more", number, None, 1.5]
+
+        chunks = stream_workbook(rows(), "report")
+        first_chunk = next(chunks)
+        self.assertTrue(first_chunk.startswith(b"PK"))
+        self.assertEqual(fetched, [0])
+        workbook = load_workbook(io.BytesIO(first_chunk + b"".join(chunks)))
+        self.assertEqual(
+            list(workbook["report"].values),
+            [(f"<row {number}> & more", number, None, 1.5) for number in range(3)],
+        )
+
+    def test_unsupported_format(self):
+        """
+        To makes sure that an unknown export format is rejected
+        """
+        response = self.make_get_request(
+            reverse("kpi_export"), {**self.date_range, "format": "pdf"}
+        )
+        self.assertEqual(response.status_code, 404)
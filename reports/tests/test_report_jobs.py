@@ -0,0 +1,165 @@
+"""
+Django test cases for the background report jobs
+"""
+import datetime
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.urls import reverse
+
+from core.base_test import ReportsBaseTestCase
+from core.constants import (
+    REPORT_JOB_STALE_TIMEOUT,
+    REPORT_JOB_STATEMENT_TIMEOUT,
+    REPORT_JOB_STATUS_COMPLETED,
+    REPORT_JOB_STATUS_FAILED,
+    REPORT_JOB_STATUS_PENDING,
+    REPORT_JOB_STATUS_RUNNING,
+)
+from hubble.models import DailyEfficiencyRollup, ReportJob
+from reports.jobs import run_report_job
+from reports.views import REPORT_JOB_DATATABLES
+
+
+class ReportJobTest(ReportsBaseTestCase):
+    """
+    This class is responsible for testing the submission, the worker and the
+    status of the report jobs
+    """
+
+    def setUp(self):
+        """
+        This function will run before every test and makes sure required data are ready
+        """
+        super().setUp()
+        self.user = self.create_user()
+        self.authenticate(self.user)
+        self.team = self.create_team()
+        self.create_expected_efficiency(self.user, expected_efficiency=8)
+        self.day = datetime.date(2023, 5, 2)
+        self.create_timesheet_entry(self.user, self.team, self.day, authorized_hours=6)
+        DailyEfficiencyRollup.objects.refresh()
+        self.params = {
+            "report": "detailed_efficiency",
+            "from_date": self.day,
+            "to_date": self.day,
+            "team_id": self.team.id,
+        }
+
+    def run_jobs(self):
+        """
+        This function is responsible for running the pending jobs
+        """
+        call_command("run_report_jobs", "--once", stdout=StringIO())
+
+    def test_submit(self):
+        """
+        To makes sure that a submitted report is queued as a pending job
+        """
+        response = self.make_post_request(reverse("submit_report_job"), self.params)
+        self.assertEqual(response.status_code, 202)
+        job = ReportJob.objects.get()
+        self.assertEqual(job.status, REPORT_JOB_STATUS_PENDING)
+        self.assertEqual(job.params["team_id"], str(self.team.id))
+        self.assertEqual(
+            response.json()["status_url"], reverse("report_job_status", args=[job.id])
+        )
+
+    def test_invalid_report(self):
+        """
+        To makes sure that an unknown report is not queued
+        """
+        response = self.make_post_request(
+            reverse("submit_report_job"), {**self.params, "report": "unknown"}
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(ReportJob.objects.exists())
+
+    def test_completed_job(self):
+        """
+        To makes sure that the worker stores the same rows as the datatable returns
+        """
+        response = self.make_post_request(reverse("submit_report_job"), self.params)
+        self.run_jobs()
+        response = self.make_get_request(response.json()["status_url"])
+        self.assertEqual(response.json()["status"], REPORT_JOB_STATUS_COMPLETED)
+        self.assertEqual(response.json()["progress"], 100)
+        datatable = self.make_datatable_request(
+            reverse("detailed_efficiency_datatable"),
+            {key: value for key, value in self.params.items() if key != "report"},
+        )
+        self.assertEqual(response.json()["result"]["data"], datatable.json()["data"])
+
+    def test_failed_job(self):
+        """
+        To makes sure that an error of the report marks the job as failed
+        """
+        params = {key: value for key, value in self.params.items() if key != "team_id"}
+        response = self.make_post_request(reverse("submit_report_job"), params)
+        self.run_jobs()
+        response = self.make_get_request(response.json()["status_url"])
+        self.assertEqual(response.json()["status"], REPORT_JOB_STATUS_FAILED)
+        self.assertNotIn("result", response.json())
+
+    def test_heartbeat(self):
+        """
+        To makes sure that a running job with a recent heartbeat is not
+        reclaimed, while a job without one is
+        """
+        self.make_post_request(reverse("submit_report_job"), self.params)
+        job = ReportJob.objects.claim_next()
+        self.assertIsNone(ReportJob.objects.claim_next())
+        ReportJob.objects.filter(pk=job.pk).update(
+            updated_at=datetime.datetime.now()
+            - datetime.timedelta(seconds=REPORT_JOB_STALE_TIMEOUT + 1)
+        )
+        self.assertTrue(job.heartbeat(50))
+        self.assertIsNone(ReportJob.objects.claim_next())
+        ReportJob.objects.filter(pk=job.pk).update(
+            updated_at=datetime.datetime.now()
+            - datetime.timedelta(seconds=REPORT_JOB_STALE_TIMEOUT + 1)
+        )
+        self.assertEqual(ReportJob.objects.claim_next().pk, job.pk)
+
+    def test_reclaimed_job(self):
+        """
+        To makes sure that a worker whose job has been reclaimed does not
+        store its result over the one of the new worker
+        """
+        self.make_post_request(reverse("submit_report_job"), self.params)
+        job = ReportJob.objects.claim_next()
+        ReportJob.objects.filter(pk=job.pk).update(
+            started_at=datetime.datetime.now() + datetime.timedelta(seconds=1)
+        )
+        self.assertFalse(job.heartbeat(50))
+        run_report_job(job)
+        job.refresh_from_db()
+        self.assertEqual(job.status, REPORT_JOB_STATUS_RUNNING)
+        self.assertIsNone(job.result)
+
+    def test_heartbeat_before_query(self):
+        """
+        To makes sure that a heartbeat is sent before the rows are queried, so
+        that a job reclaimed meanwhile doesn't run its query again, and that
+        the statements of a job can't outlast the stale timeout
+        """
+        self.assertLess(REPORT_JOB_STATEMENT_TIMEOUT, REPORT_JOB_STALE_TIMEOUT * 1000)
+        self.make_post_request(reverse("submit_report_job"), self.params)
+        job = ReportJob.objects.claim_next()
+        ReportJob.objects.filter(pk=job.pk).update(
+            started_at=datetime.datetime.now() + datetime.timedelta(seconds=1)
+        )
+        datatable = REPORT_JOB_DATATABLES[job.report]
+        with mock.patch.object(datatable, "get_initial_queryset") as get_initial_queryset:
+            run_report_job(job)
+        get_initial_queryset.assert_not_called()
+
+    def test_status_of_other_user(self):
+        """
+        To makes sure that the job of another user can't be polled
+        """
+        response = self.make_post_request(reverse("submit_report_job"), self.params)
+        self.authenticate()
+        response = self.make_get_request(response.json()["status_url"])
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,69 @@
+"""
+Django test cases for the pivot report
+"""
+import datetime
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core.base_test import ReportsBaseTestCase
+
+
+class ReportPivotTest(ReportsBaseTestCase):
+    """
+    This class is responsible for testing the totals of the pivot report
+    """
+
+    def setUp(self):
+        """
+        This function will run before every test and makes sure required data are ready
+        """
+        super().setUp()
+        self.user = self.create_user()
+        self.authenticate(self.user)
+        self.team = self.create_team()
+        self.another_team = self.create_team()
+        self.create_expected_efficiency(self.user, expected_efficiency=8)
+        self.create_timesheet_entry(
+            self.user, self.team, datetime.date(2023, 5, 2), authorized_hours=6
+        )
+        self.create_timesheet_entry(
+            self.user, self.team, datetime.date(2023, 6, 5), authorized_hours=4
+        )
+        self.create_timesheet_entry(
+            self.user, self.another_team, datetime.date(2023, 6, 6), authorized_hours=2
+        )
+        self.params = {"from_date": "2023-05-01", "to_date": "2023-06-30"}
+
+    def test_pivot(self):
+        """
+        To makes sure that every grouping is computed by a single query and
+        nested in the requested order
+        """
+        with CaptureQueriesContext(connection) as queries:
+            response = self.make_get_request(
+                reverse("report_pivot"),
+                {**self.params, "grouping": ["team", "month,team", ""]},
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len([query for query in queries if "GROUPING SETS" in query["sql"]]), 1)
+        data = response.json()
+        authorized = data["measures"].index("authorized_hours")
+        groupings = data["groupings"]
+        self.assertEqual(groupings[""][authorized], 12)
+        self.assertEqual(groupings["team"][self.team.name][authorized], 10)
+        self.assertEqual(groupings["month,team"]["2023-06"][self.team.name][authorized], 4)
+        self.assertEqual(groupings["month,team"]["2023-06"][self.another_team.name][authorized], 2)
+        self.assertEqual(groupings["team"][self.team.name][-1], 2)
+
+    def test_invalid_pivot(self):
+        """
+        To makes sure that an unknown dimension or a missing date range is rejected
+        """
+        response = self.make_get_request(
+            reverse("report_pivot"), {**self.params, "grouping": "unknown"}
+        )
+        self.assertEqual(response.status_code, 400)
+        response = self.make_get_request(reverse("report_pivot"))
+        self.assertEqual(response.status_code, 400)
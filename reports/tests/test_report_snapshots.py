@@ -0,0 +1,99 @@
+"""
+Django test cases for the report snapshots of the closed months
+"""
+import datetime
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.urls import reverse
+
+from core.base_test import ReportsBaseTestCase
+from hubble.models import DailyEfficiencyRollup, ReportSnapshot
+from reports.engine import closed_month
+
+
+class ReportSnapshotTest(ReportsBaseTestCase):
+    """
+    This class is responsible for testing the freezing and the serving of the snapshots
+    """
+
+    def setUp(self):
+        """
+        This function will run before every test and makes sure required data are ready
+        """
+        super().setUp()
+        self.user = self.create_user()
+        self.authenticate(self.user)
+        self.team = self.create_team()
+        self.create_expected_efficiency(self.user, expected_efficiency=8)
+        self.create_timesheet_entry(
+            self.user, self.team, datetime.date(2023, 5, 2), authorized_hours=6
+        )
+        self.create_timesheet_entry(
+            self.user, self.team, datetime.date(2023, 5, 3), authorized_hours=4
+        )
+        DailyEfficiencyRollup.objects.refresh()
+
+    def test_command(self):
+        """
+        To makes sure that every report of a closed month is frozen once,
+        unless it is replaced
+        """
+        output = StringIO()
+        call_command("freeze_report_snapshots", "--month", "2023-05", stdout=output)
+        self.assertEqual(ReportSnapshot.objects.count(), 3)
+        self.assertIn("monetization 2023-05 frozen (1 rows)", output.getvalue())
+        self.assertEqual(
+            ReportSnapshot.objects.thaw("monetization", datetime.date(2023, 5, 1))[0][
+                "efficiency_capacity"
+            ],
+            10,
+        )
+
+        output = StringIO()
+        call_command(
+            "freeze_report_snapshots", "--month", "2023-05", "--report", "kpi", stdout=output
+        )
+        self.assertIn("kpi 2023-05 already frozen", output.getvalue())
+        with self.assertRaises(CommandError):
+            call_command(
+                "freeze_report_snapshots",
+                "--month",
+                f"{datetime.date.today():%Y-%m}",
+                stdout=StringIO(),
+            )
+
+    def test_datatables(self):
+        """
+        To makes sure that the frozen rows are served for a closed month,
+        while other date ranges are computed from the timesheets
+        """
+        call_command("freeze_report_snapshots", "--month", "2023-05", stdout=StringIO())
+        self.create_timesheet_entry(
+            self.user, self.team, datetime.date(2023, 5, 4), authorized_hours=5
+        )
+        response = self.make_datatable_request(
+            reverse("monetization_datatable"), {"year_filter": 2023, "month_filter": 5}
+        )
+        self.assertEqual(response.json()["data"][0]["efficiency_capacity"], 10)
+
+        response = self.make_datatable_request(
+            reverse("kpi_datatable"), {"from_date": "2023-05-01", "to_date": "2023-05-31"}
+        )
+        self.assertEqual(response.json()["recordsTotal"], 2)
+        response = self.make_datatable_request(
+            reverse("kpi_datatable"), {"from_date": "2023-05-02", "to_date": "2023-05-31"}
+        )
+        self.assertEqual(response.json()["recordsTotal"], 3)
+
+    def test_closed_month(self):
+        """
+        To makes sure that only a whole month is closed, after the grace period
+        """
+        today = datetime.date(2023, 6, 11)
+        self.assertEqual(
+            closed_month("2023-05-01", "2023-05-31", today), datetime.date(2023, 5, 1)
+        )
+        self.assertIsNone(closed_month("2023-05-01", "2023-05-30", today))
+        self.assertIsNone(closed_month("2023-05-01", "2023-05-31", datetime.date(2023, 6, 10)))
+        self.assertIsNone(closed_month("invalid", "2023-05-31", today))
@@ -0,0 +1,113 @@
+"""
+Django test cases for the resource utilisation report
+"""
+import datetime
+
+from django.urls import reverse
+from model_bakery import baker
+
+from core.base_test import ReportsBaseTestCase
+from hubble.models import CapacityCalendar
+from hubble.models.capacity_calendar import is_working_day
+from reports.views import ResourceUtilisationDatatable
+
+
+class ResourceUtilisationTest(ReportsBaseTestCase):
+    """
+    This class is responsible for testing the utilisation of the resources
+    """
+
+    def setUp(self):
+        """
+        This function will run before every test and makes sure required data are ready
+        """
+        super().setUp()
+        self.user = self.create_user()
+        self.authenticate(self.user)
+        self.team = self.create_team()
+        self.create_expected_efficiency(
+            self.user, expected_efficiency=8, effective_from=datetime.date(2023, 5, 1)
+        )
+        self.project = baker.make("hubble.Project")
+        baker.make(
+            "hubble.ProjectResource",
+            user=self.user,
+            project=self.project,
+            utilisation=50,
+            allotted_from=datetime.date(2023, 5, 10),
+            removed_on=None,
+        )
+        for entry_date in (
+            datetime.date(2023, 5, 2),
+            datetime.date(2023, 5, 11),
+            datetime.date(2023, 5, 12),
+        ):
+            self.create_timesheet_entry(
+                self.user, self.team, entry_date, project=self.project, authorized_hours=6
+            )
+        CapacityCalendar.objects.refresh()
+        self.working_days = sum(
+            is_working_day(datetime.date(2023, 5, day), set(), self.user.is_saturday_working)
+            for day in range(10, 32)
+        )
+
+    def test_datatable(self):
+        """
+        To makes sure that the planned hours cover only the allocation window
+        and that the timesheets outside the window are not counted
+        """
+        response = self.make_datatable_request(
+            reverse("resource_utilisation_datatable"),
+            {"year_filter": 2023, "month_filter": 5},
+        )
+        self.assertEqual(response.status_code, 200)
+        row = response.json()["data"][0]
+        self.assertEqual(row["user_name"], self.user.name)
+        self.assertEqual(row["planned_utilisation"], "50%")
+        self.assertEqual(row["planned_hours"], 4 * self.working_days)
+        self.assertEqual(row["actual_hours"], 12)
+        self.assertEqual(row["variance"], 12 - 4 * self.working_days)
+        self.assertEqual(
+            row["actual_utilisation"], f"{round(100 * 12 / (8 * self.working_days), 2)}%"
+        )
+
+    def test_closed_month_cache(self):
+        """
+        To makes sure that a closed month is answered from the cache even
+        after the timesheets are changed, unlike an open month
+        """
+        params = {"year_filter": 2023, "month_filter": 5}
+        self.make_datatable_request(reverse("resource_utilisation_datatable"), params)
+        self.create_timesheet_entry(
+            self.user,
+            self.team,
+            datetime.date(2023, 5, 15),
+            project=self.project,
+            authorized_hours=6,
+        )
+        response = self.make_datatable_request(reverse("resource_utilisation_datatable"), params)
+        self.assertEqual(response.json()["data"][0]["actual_hours"], 12)
+
+        _, timeout = ResourceUtilisationDatatable.get_cache_key(
+            datetime.date(2023, 5, 1), today=datetime.date(2023, 6, 5)
+        )
+        self.assertIsNotNone(timeout)
+        key, timeout = ResourceUtilisationDatatable.get_cache_key(
+            datetime.date(2023, 5, 1), today=datetime.date(2023, 6, 11)
+        )
+        self.assertEqual(key, "resource-utilisation:2023-05")
+        self.assertIsNone(timeout)
+
+    def test_export(self):
+        """
+        To makes sure that the utilisation of the selected month is exported
+        """
+        response = self.client.get(
+            reverse("resource_utilisation_export"),
+            {"year_filter": 2023, "month_filter": 5},
+            SERVER_NAME=self.testcase_server_name,
+        )
+        self.assertEqual(response.status_code, 200)
+        content = b"".join(response.streaming_content).decode()
+        self.assertIn(self.project.name, content)
+        self.assertIn("May 2023", content)
@@ -0,0 +1,48 @@
+"""
+Django test cases for the server timing middleware
+"""
+import json
+
+from django.test import override_settings
+from django.urls import reverse
+
+from core.base_test import ReportsBaseTestCase
+
+
+class ServerTimingTest(ReportsBaseTestCase):
+    """
+    This class is responsible for testing the per-request timings
+    """
+
+    def setUp(self):
+        """
+        This function will run before every test and makes sure required data are ready
+        """
+        super().setUp()
+        self.user = self.create_user()
+        self.authenticate(self.user)
+
+    def test_server_timing_header(self):
+        """
+        To makes sure that the timings are reported as a header and a log line
+        tagged with the view name
+        """
+        with self.assertLogs("hubble.middlewares.server_timing", "INFO") as logs:
+            response = self.make_datatable_request(reverse("efficiency_datatable"), {})
+        header = response["Server-Timing"]
+        for metric in ("sql;dur=", "render;dur=", "python;dur=", "total;dur="):
+            self.assertIn(metric, header)
+        self.assertEqual(logs.records[0].levelname, "INFO")
+        line = json.loads(logs.records[0].getMessage())
+        self.assertEqual(line["view"], "efficiency_datatable")
+        self.assertEqual(line["status"], 200)
+        self.assertGreater(line["sql_count"], 0)
+
+    @override_settings(SQL_QUERY_BUDGET=0)
+    def test_sql_budget(self):
+        """
+        To makes sure that the requests over the SQL budget are logged as warnings
+        """
+        with self.assertLogs("hubble.middlewares.server_timing", "INFO") as logs:
+            self.make_datatable_request(reverse("efficiency_datatable"), {})
+        self.assertEqual(logs.records[0].levelname, "WARNING")
@@ -0,0 +1,104 @@
+"""
+Django test cases for the statement timeout of the report datatables
+"""
+import datetime
+import json
+
+from django.core.cache import cache
+from django.db import OperationalError, connection
+from django.test import RequestFactory
+
+from core.base_test import ReportsBaseTestCase
+from core.query_guard import QueryGuard, is_query_canceled
+from hubble.models import DailyEfficiencyRollup
+from reports.views import EfficiencyDatatable
+
+
+class SlowEfficiencyDatatable(EfficiencyDatatable):
+    """
+    Efficiency datatable whose draws can be made to exceed the statement timeout
+    """
+
+    statement_timeout = 50
+    slow = False
+
+    def get_report_rows(self, params):
+        if self.slow:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT pg_sleep(1)")
+        return super().get_report_rows(params)
+
+
+class StatementTimeoutTest(ReportsBaseTestCase):
+    """
+    This class is responsible for testing the timeout and the stale fallback of the reports
+    """
+
+    def setUp(self):
+        """
+        This function will run before every test and makes sure required data are ready
+        """
+        super().setUp()
+        self.user = self.create_user()
+        self.team = self.create_team()
+        self.create_expected_efficiency(self.user, expected_efficiency=8)
+        self.create_timesheet_entry(
+            self.user, self.team, datetime.date(2023, 5, 2), authorized_hours=6
+        )
+        DailyEfficiencyRollup.objects.refresh()
+        self.factory = RequestFactory()
+
+    def draw(self, slow=False):
+        """
+        Requests a draw of the efficiency datatable
+        """
+        request = self.factory.post(
+            "/overall-efficiency-datatable",
+            {
+                "draw": 1,
+                "start": 0,
+                "length": 10,
+                "from_date": "2023-05-01",
+                "to_date": "2023-05-31",
+            },
+            HTTP_ACCEPT="application/json",
+        )
+        request.user = self.user
+        return SlowEfficiencyDatatable.as_view(slow=slow)(request)
+
+    def test_query_guard(self):
+        """
+        To makes sure that a statement exceeding the timeout is cancelled
+        without breaking the connection, and that the timeout is reset
+        """
+        with connection.cursor() as cursor:
+            cursor.execute("SHOW statement_timeout")
+            default_timeout = cursor.fetchone()[0]
+            with self.assertRaises(OperationalError) as error:
+                with QueryGuard(50):
+                    cursor.execute("SELECT pg_sleep(1)")
+            self.assertTrue(is_query_canceled(error.exception))
+            cursor.execute("SHOW statement_timeout")
+            self.assertEqual(cursor.fetchone()[0], default_timeout)
+
+    def test_stale_result(self):
+        """
+        To makes sure that the last good result is served as stale when a draw
+        times out, and that an error is answered when there is none
+        """
+        response = self.draw(slow=True)
+        self.assertEqual(response.status_code, 503)
+
+        response = self.draw()
+        self.assertEqual(response["X-Cache"], "MISS")
+        capacity = json.loads(response.content)["data"][0]["capacity"]
+
+        self.create_timesheet_entry(
+            self.user, self.team, datetime.date(2023, 5, 3), authorized_hours=2
+        )
+        cache.delete("report-data-version")
+        response = self.draw(slow=True)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["X-Cache"], "STALE")
+        self.assertTrue(json.loads(response.content)["stale"])
+        self.assertEqual(json.loads(response.content)["data"][0]["capacity"], capacity)
@@ -21,6 +21,12 @@ urlpatterns = [
         name="detailed_efficiency",
     ),
     path("kpi", views.KpiReport.as_view(), name="kpi"),
+    path("project-revenue", views.ProjectRevenueReport.as_view(), name="project_revenue"),
+    path(
+        "resource-utilisation",
+        views.ResourceUtilisationReport.as_view(),
+        name="resource_utilisation",
+    ),
     path(
         "overall-efficiency-datatable",
         views.EfficiencyDatatable.as_view(),
@@ -41,4 +47,49 @@ urlpatterns = [
         views.KPIDatatable.as_view(),
         name="kpi_datatable",
     ),
+    path(
+        "overall-efficiency-comparison-datatable",
+        views.EfficiencyComparisonDatatable.as_view(),
+        name="efficiency_comparison_datatable",
+    ),
+    path(
+        "monetization-comparison-datatable",
+        views.MonetizationComparisonDatatable.as_view(),
+        name="monetization_comparison_datatable",
+    ),
+    path(
+        "overall-efficiency-export",
+        views.EfficiencyExport.as_view(),
+        name="efficiency_export",
+    ),
+    path(
+        "monetization-export",
+        views.MonetizationExport.as_view(),
+        name="monetization_export",
+    ),
+    path("kpi-export", views.KPIExport.as_view(), name="kpi_export"),
+    path(
+        "project-revenue-datatable",
+        views.ProjectRevenueDatatable.as_view(),
+        name="project_revenue_datatable",
+    ),
+    path(
+        "project-revenue-export",
+        views.ProjectRevenueExport.as_view(),
+        name="project_revenue_export",
+    ),
+    path(
+        "resource-utilisation-datatable",
+        views.ResourceUtilisationDatatable.as_view(),
+        name="resource_utilisation_datatable",
+    ),
+    path(
+        "resource-utilisation-export",
+        views.ResourceUtilisationExport.as_view(),
+        name="resource_utilisation_export",
+    ),
+    path("report-jobs", views.submit_report_job, name="submit_report_job"),
+    path("report-jobs/<int:pk>", views.report_job_status, name="report_job_status"),
+    path("report-batch", views.report_batch, name="report_batch"),
+    path("report-pivot", views.report_pivot, name="report_pivot"),
 ]
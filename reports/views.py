@@ -1,15 +1,50 @@
 """
 Django views and datatables for generating efficiency, monetization, and KPI reports
 """
+import copy
+import csv
+import hashlib
+import json
+
+from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.db.models import Avg, CharField, F, Func, Sum, Value
-from django.db.models.functions import Round
+from django.core.cache import cache
+from django.http import Http404, JsonResponse, QueryDict, StreamingHttpResponse
+from django.shortcuts import get_object_or_404
 from django.urls import reverse
+from django.utils.html import strip_tags
+from django.views import View
+from django.views.decorators.http import require_http_methods
 from django.views.generic import DetailView, TemplateView
 
 from core import template_utils
-from core.utils import CustomDatatable
-from hubble.models import Team, TimesheetEntry
+from core.constants import (
+    PIVOT_DEFAULT_GROUPINGS,
+    PIVOT_MAX_GROUPINGS,
+    REPORT_BATCH_MAX_SIZE,
+    REPORT_CACHE_TIMEOUT,
+    REPORT_JOB_STATUS_COMPLETED,
+    REPORT_JOB_STATUS_FAILED,
+)
+from core.utils import CachedDatatable, CustomDatatable, report_data_version
+from hubble.models import (
+    ProjectResource,
+    ReportJob,
+    ReportSnapshot,
+    Team,
+    TimesheetEntry,
+)
+from hubble.models.timesheet_entry import PIVOT_DIMENSIONS, PIVOT_MEASURES
+from reports.engine import (
+    ReportFrame,
+    closed_month,
+    is_closed_month,
+    parse_date,
+    same_day_last_year,
+)
+from reports.xlsx import stream_workbook
+
+EXPORT_CHUNK_SIZE = 2000
 
 
 class Index(LoginRequiredMixin, TemplateView):
@@ -38,6 +73,22 @@ class KpiReport(LoginRequiredMixin, TemplateView):
     template_name = "kpi.html"
 
 
+class ProjectRevenueReport(LoginRequiredMixin, TemplateView):
+    """This Class is responsible for checking whether user is authenticated
+    or not, and redirects the user to Project Revenue report
+    """
+
+    template_name = "project_revenue.html"
+
+
+class ResourceUtilisationReport(LoginRequiredMixin, TemplateView):
+    """This Class is responsible for checking whether user is authenticated
+    or not, and redirects the user to Resource Utilisation report
+    """
+
+    template_name = "resource_utilisation.html"
+
+
 class DetailedEfficiency(LoginRequiredMixin, DetailView):
     """This Class is responsible for checking whether user is authenticated
     or not, and redirects the user to Team specific report
@@ -47,7 +98,46 @@ class DetailedEfficiency(LoginRequiredMixin, DetailView):
     template_name = "detailed_efficiency.html"
 
 
-class EfficiencyDatatable(CustomDatatable):
+class SnapshotDatatable(CachedDatatable):
+    """
+    This class serves the closed months of a report from their frozen
+    snapshots, so that only the open months are computed from the timesheets
+    """
+
+    snapshot_report = None
+    # The method of the report frame which computes the rows of the report
+    frame_method = None
+    # Whether the rows are computed from the report frame, which the report
+    # batch shares between the reports over the same days
+    uses_report_frame = False
+
+    def get_period_params(self, from_date, to_date):
+        """
+        Returns the request parameters which select the given date range
+        """
+        return {"from_date": from_date.isoformat(), "to_date": to_date.isoformat()}
+
+    def get_report_rows(self, params):
+        """
+        Returns the rows of the report for the given request parameters,
+        computed by the `frame_method` of the report frame of the date range
+        """
+        return getattr(ReportFrame.load(*self.get_date_range(params)), self.frame_method)()
+
+    def get_initial_queryset(self, request=None):
+        """
+        The function returns the frozen rows when a closed month is selected
+        and it has been frozen, otherwise the computed rows
+        """
+        period = closed_month(*self.get_date_range(request.REQUEST))
+        if period is not None:
+            rows = ReportSnapshot.objects.thaw(self.snapshot_report, period)
+            if rows is not None:
+                return rows
+        return self.get_report_rows(request.REQUEST)
+
+
+class EfficiencyDatatable(SnapshotDatatable):
     """
     This class is responsible for Datatable corresponding to Overall efficiency
     """
@@ -55,6 +145,9 @@ class EfficiencyDatatable(CustomDatatable):
     model = TimesheetEntry
     initial_order = (["team__name", "asc"],)
     search_value_seperator = "+"
+    snapshot_report = "efficiency"
+    frame_method = "efficiency"
+    uses_report_frame = True
 
     column_defs = [
         {
@@ -93,39 +186,15 @@ class EfficiencyDatatable(CustomDatatable):
         The function `customize_row` adds a view action button to a row in a table.
         """
         # This is responsible for adding the view action button
-        buttons = template_utils.show_btn(  # pylint: disable=no-member
-            reverse("detailed_efficiency", args=[obj["pk"]])
-        )
+        buttons = template_utils.show_button(reverse("detailed_efficiency", args=[obj["pk"]]))
         row["action"] = f'<div class="form-inline justify-content-center">{buttons}</div>'
         return row
 
-    def get_initial_queryset(self, request=None):
+    def get_date_range(self, params):
         """
-        The function returns a queryset of TimesheetEntry objects with related user
-        and team objects, filtered by a date range and annotated with capacity
-        and primary key values.
+        Returns the date range of the report frame from the request parameters
         """
-        # To load a queryset into the datatable
-        return (
-            TimesheetEntry.objects.select_related("user", "team")
-            .date_range(
-                request.REQUEST.get("from_date"),
-                request.REQUEST.get("to_date"),
-            )
-            .values("team__name")
-            .annotate(
-                capacity=Round(
-                    Avg(
-                        100
-                        * (F("authorized_hours"))
-                        / (F("user__expected_user_efficiencies__expected_efficiency"))
-                    ),
-                    2,
-                ),
-                pk=F("team__id"),
-            )
-            .order_by("team__id")
-        )
+        return params.get("from_date"), params.get("to_date")
 
     def render_dict_column(self, row, column):
         # Used to differnetiate the data through various colors
@@ -142,13 +211,16 @@ class EfficiencyDatatable(CustomDatatable):
         return super().render_dict_column(row, column)
 
 
-class MonetizationDatatable(CustomDatatable):
+class MonetizationDatatable(SnapshotDatatable):
     """
     This class is responsible for Datatable corresponding to Monetization Gap report
     """
 
     model = TimesheetEntry
     initial_order = (["team__name", "asc"],)
+    snapshot_report = "monetization"
+    frame_method = "monetization"
+    uses_report_frame = True
 
     column_defs = [
         {
@@ -195,19 +267,20 @@ class MonetizationDatatable(CustomDatatable):
         },
     ]
 
-    def get_initial_queryset(self, request=None):
+    def get_date_range(self, params):
         """
-        The function returns a queryset of TimesheetEntry objects filtered by year and month.
+        Returns the date range of the report frame, i.e. the selected month
         """
-        # To load a queryset into the datatable
-        return (
-            TimesheetEntry.objects.select_related("user", "project")
-            .monetization_fields()
-            .filter(
-                entry_date__year=request.REQUEST.get("year_filter"),
-                entry_date__month=request.REQUEST.get("month_filter"),
-            )
-        )
+        try:
+            return ReportFrame.month_range(params.get("year_filter"), params.get("month_filter"))
+        except (TypeError, ValueError):
+            return None, None
+
+    def get_period_params(self, from_date, to_date):
+        """
+        Returns the request parameters which select the month of the date range
+        """
+        return {"year_filter": str(from_date.year), "month_filter": str(from_date.month)}
 
     def render_dict_column(self, row, column):
         # This is responsible for percentage symbol and data tag colors
@@ -226,14 +299,18 @@ class MonetizationDatatable(CustomDatatable):
         return super().render_dict_column(row, column)
 
 
-class KPIDatatable(CustomDatatable):
+class KPIDatatable(SnapshotDatatable):
     """
     This class is responsible for Datatable corresponding to KPI report
     """
 
     model = TimesheetEntry
     search_value_seperator = "+"
+    snapshot_report = "kpi"
+    keyset_pagination = True
 
+    # The names are sorted and searched through their relations, so that the
+    # searches go through the search mirror
     column_defs = [
         {
             "name": "project_name",
@@ -241,6 +318,7 @@ class KPIDatatable(CustomDatatable):
             "className": "text-center",
             "visible": True,
             "searchable": True,
+            "sort_field": "project__name",
         },
         {
             "name": "user_name",
@@ -248,6 +326,7 @@ class KPIDatatable(CustomDatatable):
             "className": "text-center",
             "visible": True,
             "searchable": True,
+            "sort_field": "user__name",
         },
         {
             "name": "team_name",
@@ -255,6 +334,7 @@ class KPIDatatable(CustomDatatable):
             "className": "text-center",
             "visible": True,
             "searchable": True,
+            "sort_field": "team__name",
         },
         {
             "name": "billed_sum",
@@ -286,7 +366,13 @@ class KPIDatatable(CustomDatatable):
         },
     ]
 
-    def get_initial_queryset(self, request=None):
+    def get_date_range(self, params):
+        """
+        Returns the date range of the report frame from the request parameters
+        """
+        return params.get("from_date"), params.get("to_date")
+
+    def get_report_rows(self, params):
         """
         The function returns a queryset of TimesheetEntry objects with related
         user and project objects, filtered by a date range and annotated with KPI fields.
@@ -294,21 +380,144 @@ class KPIDatatable(CustomDatatable):
         # To load a queryset into the datatable
         return (
             TimesheetEntry.objects.select_related("user", "project")
-            .date_range(
-                request.REQUEST.get("from_date"),
-                request.REQUEST.get("to_date"),
-            )
+            .date_range(*self.get_date_range(params))
             .kpi_fields()
         )
 
 
-class DetaileEfficiencyDatatable(CustomDatatable):
+def comparison_columns(measures):
+    """
+    The function returns the columns of a comparison datatable, every measure
+    being listed for both windows along with its changes
+    """
+    return [
+        {
+            "name": "team__name",
+            "title": "Team Name",
+            "className": "text-center",
+            "visible": True,
+            "searchable": True,
+        },
+    ] + [
+        {
+            "name": f"{name}_{suffix}",
+            "title": f"{title} <br> ({label})",
+            "className": "text-center",
+            "visible": True,
+            "searchable": False,
+        }
+        for name, title in measures
+        for suffix, label in (
+            ("current", "Current"),
+            ("previous", "Previous"),
+            ("delta", "Change"),
+            ("delta_pct", "Change %"),
+        )
+    ]
+
+
+class ComparisonDatatable(CachedDatatable):
+    """
+    This class is responsible for the comparison mode of a report, which lists
+    the measures of every team in two date windows side by side along with
+    their absolute and percentage changes. The previous window defaults to the
+    current one shifted back by a year
+    """
+
+    model = TimesheetEntry
+    initial_order = (["team__name", "asc"],)
+    search_value_seperator = "+"
+    # The method of the timesheet queryset which compares the two windows
+    comparison_method = "efficiency_comparison"
+
+    def get_windows(self, params):
+        """
+        Returns the current and the previous `(from_date, to_date)` windows
+        from the request parameters, or None when they aren't valid
+        """
+        current = (parse_date(params.get("from_date")), parse_date(params.get("to_date")))
+        if None in current:
+            return None
+        if params.get("compare_from_date") or params.get("compare_to_date"):
+            previous = (
+                parse_date(params.get("compare_from_date")),
+                parse_date(params.get("compare_to_date")),
+            )
+            if None in previous:
+                return None
+        else:
+            previous = tuple(same_day_last_year(day) for day in current)
+        return current, previous
+
+    def get_initial_queryset(self, request=None):
+        """
+        The function returns the measures of every team in both windows,
+        aggregated by a single query.
+        """
+        windows = self.get_windows(request.REQUEST)
+        if windows is None:
+            return TimesheetEntry.objects.none()
+        return getattr(TimesheetEntry.objects.all(), self.comparison_method)(*windows)
+
+    def render_dict_column(self, row, column):
+        # This is responsible for percentage symbol
+        if column.endswith("_delta_pct") and row.get(column) is not None:
+            return f"{row[column]}%"
+        return super().render_dict_column(row, column)
+
+
+class EfficiencyComparisonDatatable(ComparisonDatatable):
+    """
+    This class is responsible for the comparison mode of the Overall efficiency report
+    """
+
+    column_defs = comparison_columns([("capacity", "Capacity")])
+
+
+class MonetizationComparisonDatatable(ComparisonDatatable):
+    """
+    This class is responsible for the comparison mode of the Monetization Gap
+    report, whose windows are months selected by year and month
+    """
+
+    comparison_method = "monetization_comparison"
+
+    column_defs = comparison_columns(
+        [
+            ("efficiency_capacity", "Efficiency Capacity"),
+            ("monetization_capacity", "Monetization Capacity"),
+            ("gap", "Gap"),
+        ]
+    )
+
+    def get_windows(self, params):
+        """
+        Returns the selected month and the compared month, the same month of
+        the previous year by default
+        """
+        try:
+            current = ReportFrame.month_range(
+                params.get("year_filter"), params.get("month_filter")
+            )
+            if params.get("compare_year_filter") or params.get("compare_month_filter"):
+                previous = ReportFrame.month_range(
+                    params.get("compare_year_filter"), params.get("compare_month_filter")
+                )
+            else:
+                previous = ReportFrame.month_range(current[0].year - 1, current[0].month)
+        except (TypeError, ValueError):
+            return None
+        return current, previous
+
+
+class DetaileEfficiencyDatatable(CachedDatatable):
     """
     This class is responsible for Datatable corresponding to Team specific Efficiency
     """
 
     model = TimesheetEntry
     search_value_seperator = "+"
+    uses_report_frame = True
 
     column_defs = [
         {
@@ -341,39 +550,20 @@ class DetaileEfficiencyDatatable(CustomDatatable):
         },
     ]
 
+    def get_date_range(self, params):
+        """
+        Returns the date range of the report frame from the request parameters
+        """
+        return params.get("from_date"), params.get("to_date")
+
     def get_initial_queryset(self, request=None):
         """
-        The function returns a queryset of TimesheetEntry objects with related user
-        and team objects, filtered by fields.
+        The function returns the monthly hours and capacity of a team within a
+        date range, computed from the report frame of the date range.
         """
-        # To load a queryset into the datatable
-        return (
-            TimesheetEntry.objects.select_related("user", "team")
-            .date_range(
-                request.REQUEST.get("from_date"),
-                request.REQUEST.get("to_date"),
-            )
-            .annotate(
-                month=Func(
-                    F("entry_date"),
-                    Value("Month-YYYY"),
-                    function="to_char",
-                    output_field=CharField(),
-                ),
-            )
-            .values("month")
-            .filter(team__id=int(request.REQUEST.get("team_id")))
-            .annotate(
-                expected_hours=Sum("user__expected_user_efficiencies__expected_efficiency"),
-                actual_hours=Sum("authorized_hours"),
-                capacity=Round(
-                    Avg(
-                        100
-                        * (F("authorized_hours"))
-                        / (F("user__expected_user_efficiencies__expected_efficiency"))
-                    )
-                ),
-            )
+        # To load the rows into the datatable
+        return ReportFrame.load(*self.get_date_range(request.REQUEST)).detailed_efficiency(
+            request.REQUEST.get("team_id")
         )
 
     def render_dict_column(self, row, column):
@@ -389,3 +579,562 @@ class DetaileEfficiencyDatatable(CustomDatatable):
             return f'<span class="bg-dark-red-10 text-dark-red py-0.5 \
                     px-1.5 rounded-xl text-sm">{row["Capacity"]}</span>'
         return super().render_dict_column(row, column)
+
+
+class ProjectRevenueDatatable(CachedDatatable):
+    """
+    This class is responsible for Datatable corresponding to Project Revenue report
+    """
+
+    model = TimesheetEntry
+    initial_order = (["project_name", "asc"],)
+    search_value_seperator = "+"
+
+    column_defs = [
+        {
+            "name": "project_name",
+            "title": "Project",
+            "className": "text-center",
+            "visible": True,
+            "searchable": True,
+        },
+        {
+            "name": "client_name",
+            "title": "Client",
+            "className": "text-center",
+            "visible": True,
+            "searchable": True,
+        },
+        {
+            "name": "currency_name",
+            "title": "Currency",
+            "className": "text-center",
+            "visible": True,
+            "searchable": True,
+        },
+        {
+            "name": "billed_sum",
+            "title": "Billed hours",
+            "className": "text-center",
+            "visible": True,
+            "searchable": False,
+        },
+        {
+            "name": "authorized_sum",
+            "title": "Authorized hours",
+            "className": "text-center",
+            "visible": True,
+            "searchable": False,
+        },
+        {
+            "name": "unrated_hours",
+            "title": "Unrated hours",
+            "className": "text-center",
+            "visible": True,
+            "searchable": False,
+        },
+        {
+            "name": "unconverted_hours",
+            "title": "Unconverted hours",
+            "className": "text-center",
+            "visible": True,
+            "searchable": False,
+        },
+        {
+            "name": "billed_revenue",
+            "title": "Billed revenue",
+            "className": "text-center",
+            "visible": True,
+            "searchable": False,
+        },
+        {
+            "name": "authorized_revenue",
+            "title": "Authorized revenue",
+            "className": "text-center",
+            "visible": True,
+            "searchable": False,
+        },
+        {
+            "name": "billed_revenue_base",
+            "title": "Billed revenue <br> (Base currency)",
+            "className": "text-center",
+            "visible": True,
+            "searchable": False,
+        },
+        {
+            "name": "authorized_revenue_base",
+            "title": "Authorized revenue <br> (Base currency)",
+            "className": "text-center",
+            "visible": True,
+            "searchable": False,
+        },
+        {
+            "name": "revenue_at_risk",
+            "title": "Revenue at risk <br> (Base currency)",
+            "className": "text-center",
+            "visible": True,
+            "searchable": False,
+        },
+    ]
+
+    def get_date_range(self, params):
+        """
+        Returns the date range of the report from the request parameters
+        """
+        return params.get("from_date"), params.get("to_date")
+
+    def get_initial_queryset(self, request=None):
+        """
+        The function returns the revenue of every project within a date range,
+        aggregated by a single query. Every entry of the date range is billed,
+        whether or not its user has an expected efficiency.
+        """
+        # To load the rows into the datatable
+        return TimesheetEntry.objects.filter(
+            entry_date__range=self.get_date_range(request.REQUEST)
+        ).project_revenue()
+
+
+class ResourceUtilisationDatatable(CustomDatatable):
+    """
+    This class is responsible for Datatable corresponding to Resource Utilisation report
+    """
+
+    model = ProjectResource
+    initial_order = (["user_name", "asc"],)
+    search_value_seperator = "+"
+
+    column_defs = [
+        {
+            "name": "user_name",
+            "title": "User",
+            "className": "text-center",
+            "visible": True,
+            "searchable": True,
+        },
+        {
+            "name": "project_name",
+            "title": "Project",
+            "className": "text-center",
+            "visible": True,
+            "searchable": True,
+        },
+        {
+            "name": "month",
+            "title": "Month",
+            "className": "text-center",
+            "visible": True,
+            "searchable": True,
+        },
+        {
+            "name": "planned_utilisation",
+            "title": "Planned utilisation",
+            "className": "text-center",
+            "visible": True,
+            "searchable": False,
+        },
+        {
+            "name": "planned_hours",
+            "title": "Planned hours",
+            "className": "text-center",
+            "visible": True,
+            "searchable": False,
+        },
+        {
+            "name": "actual_hours",
+            "title": "Actual hours",
+            "className": "text-center",
+            "visible": True,
+            "searchable": False,
+        },
+        {
+            "name": "actual_utilisation",
+            "title": "Actual utilisation",
+            "className": "text-center",
+            "visible": True,
+            "searchable": False,
+        },
+        {
+            "name": "variance",
+            "title": "Variance <br> (Hours)",
+            "className": "text-center",
+            "visible": True,
+            "searchable": False,
+        },
+    ]
+
+    def get_date_range(self, params):
+        """
+        Returns the date range of the report, i.e. the selected month
+        """
+        try:
+            return ReportFrame.month_range(params.get("year_filter"), params.get("month_filter"))
+        except (TypeError, ValueError):
+            return None, None
+
+    @staticmethod
+    def get_cache_key(from_date, today=None):
+        """
+        Returns the cache key of the utilisation of a month. The closed months
+        never change, so they are cached regardless of the data version
+        """
+        if is_closed_month(from_date, today):
+            return f"resource-utilisation:{from_date:%Y-%m}", None
+        version = hashlib.sha256(report_data_version().encode()).hexdigest()
+        return f"resource-utilisation:{from_date:%Y-%m}:{version}", REPORT_CACHE_TIMEOUT
+
+    def get_initial_queryset(self, request=None):
+        """
+        The function returns the planned and actual hours of every resource
+        allotted within the selected month, cached per month.
+        """
+        from_date, to_date = self.get_date_range(request.REQUEST)
+        if from_date is None:
+            return []
+        cache_key, timeout = self.get_cache_key(from_date)
+        rows = cache.get(cache_key)
+        if rows is None:
+            rows = []
+            for row in ProjectResource.utilisation_hours(from_date, to_date):
+                expected_hours = row.pop("expected_hours")
+                row["planned_utilisation"] = row.pop("utilisation")
+                rows.append(
+                    {
+                        **row,
+                        "month": from_date.strftime("%B %Y"),
+                        "actual_utilisation": round(100 * row["actual_hours"] / expected_hours, 2)
+                        if expected_hours
+                        else 0.0,
+                        "variance": round(row["actual_hours"] - row["planned_hours"], 2),
+                    }
+                )
+            cache.set(cache_key, rows, timeout)
+        return rows
+
+    def render_dict_column(self, row, column):
+        # This is responsible for percentage symbol
+        if column in ("planned_utilisation", "actual_utilisation"):
+            return f"{row[column]}%"
+        return super().render_dict_column(row, column)
+
+
+# The datatables whose closed months can be frozen into snapshots
+SNAPSHOT_DATATABLES = {
+    datatable.snapshot_report: datatable
+    for datatable in (EfficiencyDatatable, MonetizationDatatable, KPIDatatable)
+}
+
+# The datatables which can be computed in the background by the report job worker
+REPORT_JOB_DATATABLES = {
+    "efficiency": EfficiencyDatatable,
+    "detailed_efficiency": DetaileEfficiencyDatatable,
+    "monetization": MonetizationDatatable,
+    "kpi": KPIDatatable,
+    "project_revenue": ProjectRevenueDatatable,
+    "resource_utilisation": ResourceUtilisationDatatable,
+    "efficiency_comparison": EfficiencyComparisonDatatable,
+    "monetization_comparison": MonetizationComparisonDatatable,
+}
+
+
+@login_required()
+@require_http_methods(["POST"])
+def submit_report_job(request):
+    """
+    The function queues a report job with the posted datatable parameters
+    and returns the url where its progress can be polled
+    """
+    report = request.POST.get("report")
+    if report not in REPORT_JOB_DATATABLES:
+        return JsonResponse({"message": "Invalid report"}, status=400)
+    params = {
+        key: value
+        for key, value in request.POST.items()
+        if key not in ("report", "csrfmiddlewaretoken")
+    }
+    job = ReportJob.objects.create(report=report, params=params, created_by=request.user)
+    return JsonResponse(
+        {
+            "id": job.id,
+            "status": job.status,
+            "status_url": reverse("report_job_status", args=[job.id]),
+        },
+        status=202,
+    )
+
+
+@login_required()
+@require_http_methods(["GET"])
+def report_job_status(request, pk):
+    """
+    The function returns the progress of a report job, along with the
+    datatable payload once the job is completed
+    """
+    job = get_object_or_404(ReportJob, pk=pk, created_by=request.user)
+    response_data = {"id": job.id, "status": job.status, "progress": job.progress}
+    if job.status == REPORT_JOB_STATUS_COMPLETED:
+        response_data["result"] = job.result
+    elif job.status == REPORT_JOB_STATUS_FAILED:
+        response_data["message"] = "Error while generating the report!"
+    return JsonResponse(response_data)
+
+
+@login_required()
+@require_http_methods(["POST"])
+def report_batch(request):
+    """
+    The function answers several report datatables in one response. The body
+    is a json object with a `reports` list of `{"report", "params"}` specs and
+    the overlapping date ranges of the specs computed from the report frame
+    are loaded as a single frame
+    """
+    try:
+        specs = json.loads(request.body)["reports"]
+        if not isinstance(specs, list) or not 0 < len(specs) <= REPORT_BATCH_MAX_SIZE:
+            raise ValueError
+        datatable_classes = [REPORT_JOB_DATATABLES[spec["report"]] for spec in specs]
+        params = []
+        for spec in specs:
+            query_dict = QueryDict(mutable=True)
+            query_dict.update(spec.get("params", {}))
+            params.append(query_dict)
+    except (KeyError, TypeError, ValueError, AttributeError):
+        return JsonResponse({"message": "Invalid reports"}, status=400)
+
+    results = []
+    with ReportFrame.share(
+        datatable_class().get_date_range(query_dict)
+        for datatable_class, query_dict in zip(datatable_classes, params)
+        if getattr(datatable_class, "uses_report_frame", False)
+    ):
+        for spec, datatable_class, query_dict in zip(specs, datatable_classes, params):
+            report_request = copy.copy(request)
+            report_request.REQUEST = query_dict
+            response = datatable_class.as_view()(report_request)
+            results.append(
+                {
+                    "report": spec["report"],
+                    "status": response.status_code,
+                    "data": json.loads(response.content) if response.status_code == 200 else None,
+                }
+            )
+    return JsonResponse({"results": results})
+
+
+@login_required()
+@require_http_methods(["GET"])
+def report_pivot(request):
+    """
+    The function returns the totals of the timesheets of a date range for
+    several groupings at once, e.g. `?grouping=team&grouping=team,month` with
+    an empty grouping for the grand total. Every grouping is a tree keyed by
+    the values of its dimensions, whose leaves list the measures
+    """
+    from_date = parse_date(request.GET.get("from_date"))
+    to_date = parse_date(request.GET.get("to_date"))
+    groupings = []
+    for grouping in request.GET.getlist("grouping") or PIVOT_DEFAULT_GROUPINGS:
+        dimensions = tuple(name.strip() for name in grouping.split(",") if name.strip())
+        if any(name not in PIVOT_DIMENSIONS for name in dimensions) or len(set(dimensions)) != len(
+            dimensions
+        ):
+            return JsonResponse({"message": "Invalid grouping"}, status=400)
+        if set(dimensions) not in [set(dims) for dims in groupings]:
+            groupings.append(dimensions)
+    if not from_date or not to_date or len(groupings) > PIVOT_MAX_GROUPINGS:
+        return JsonResponse({"message": "Invalid pivot"}, status=400)
+
+    digest = hashlib.sha256(
+        json.dumps([report_data_version(), from_date, to_date, groupings], default=str).encode()
+    ).hexdigest()
+    cache_key = f"report-pivot:{digest}"
+    response_data = cache.get(cache_key)
+    if response_data is None:
+        rows = TimesheetEntry.objects.all().date_range(from_date, to_date).pivot(groupings)
+        trees = {",".join(dimensions): {} for dimensions in groupings}
+        for row in rows:
+            # The dimensions are nested in the order of the requested grouping
+            dimensions = next(dims for dims in groupings if set(dims) == set(row["grouped_by"]))
+            leaf = [row[name] for name in [*PIVOT_MEASURES, "entries"]]
+            if not dimensions:
+                trees[""] = leaf
+                continue
+            node = trees[",".join(dimensions)]
+            for name in dimensions[:-1]:
+                node = node.setdefault(str(row[name]), {})
+            node[str(row[dimensions[-1]])] = leaf
+        response_data = {
+            "measures": [*PIVOT_MEASURES, "entries"],
+            "groupings": trees,
+        }
+        cache.set(cache_key, response_data, REPORT_CACHE_TIMEOUT)
+    return JsonResponse(response_data)
+
+
+class Echo:
+    """
+    A file-like object which returns the written value instead of buffering
+    it, so that the csv writer can feed the streaming response
+    """
+
+    def write(self, value):
+        """
+        Returns the given value as it is
+        """
+        return value
+
+
+class ReportExport(LoginRequiredMixin, View):
+    """
+    This class is responsible for exporting the full result of a report
+    datatable as CSV or XLSX. Querysets are fetched from a server-side cursor
+    in chunks, so the memory stays flat regardless of the number of rows
+    """
+
+    datatable_class = None
+    filename = None
+
+    def get_datatable(self, request):
+        """
+        The function returns the datatable of the report with the request
+        parameters in the same place the ajax datatable expects them
+        """
+        request.REQUEST = request.GET
+        datatable = self.datatable_class()
+        datatable.setup(request)
+        return datatable
+
+    def get_columns(self, datatable):
+        """
+        The function returns the name and the plain title of every visible data column
+        """
+        return [
+            (column["name"], " ".join(strip_tags(column["title"]).split()))
+            for column in datatable.column_defs
+            if column.get("visible", True) and column["name"] != "action"
+        ]
+
+    def get_rows(self, request):
+        """
+        The function yields the header and then the rendered values of every row
+        """
+        datatable = self.get_datatable(request)
+        columns = self.get_columns(datatable)
+        yield [title for _, title in columns]
+
+        rows = datatable.get_initial_queryset(request)
+        # The ajax datatable also accepts column indexes, which are only
+        # meaningful for the rendered table
+        ordering = [
+            (name, order == "desc")
+            for name, order in datatable.initial_order
+            if isinstance(name, str)
+        ]
+        if isinstance(rows, list):
+            # The rows are already computed in memory by the report frame, or
+            # thawed from a snapshot
+            for name, descending in reversed(ordering):
+                rows = sorted(rows, key=lambda row, name=name: row.get(name), reverse=descending)
+        else:
+            if ordering:
+                rows = rows.order_by(
+                    *[("-" if descending else "") + name for name, descending in ordering]
+                )
+            rows = rows.iterator(chunk_size=EXPORT_CHUNK_SIZE)
+        for row in rows:
+            yield [self.render_value(datatable, row, name) for name, _ in columns]
+
+    @staticmethod
+    def render_value(datatable, row, column):
+        """
+        The function renders the value of a column like the datatable does,
+        without the html markup. The raw value is kept when the rendering only
+        wraps it, so that numbers stay numbers in the spreadsheet
+        """
+        value = datatable.render_dict_column(row, column)
+        if isinstance(value, str):
+            value = strip_tags(value).strip()
+            if value == str(row.get(column)):
+                return row.get(column)
+        return value
+
+    def get(self, request, *args, **kwargs):
+        """
+        Streams the report in the requested format, CSV by default
+        """
+        export_format = request.GET.get("format", "csv")
+        if export_format == "csv":
+            return self.csv_response(request)
+        if export_format == "xlsx":
+            return self.xlsx_response(request)
+        raise Http404("Unsupported export format")
+
+    def csv_response(self, request):
+        """
+        Returns a streaming response which writes every row as soon as it is
+        fetched from the database
+        """
+        writer = csv.writer(Echo())
+        response = StreamingHttpResponse(
+            (writer.writerow(row) for row in self.get_rows(request)),
+            content_type="text/csv",
+        )
+        response["Content-Disposition"] = f'attachment; filename="{self.filename}.csv"'
+        return response
+
+    def xlsx_response(self, request):
+        """
+        Returns a streaming response which writes every row into the zip
+        archive of the workbook as soon as it is fetched from the database
+        """
+        response = StreamingHttpResponse(
+            stream_workbook(self.get_rows(request), self.filename),
+            content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        )
+        response["Content-Disposition"] = f'attachment; filename="{self.filename}.xlsx"'
+        return response
+
+
+class EfficiencyExport(ReportExport):
+    """
+    This class is responsible for exporting the Overall efficiency report
+    """
+
+    datatable_class = EfficiencyDatatable
+    filename = "efficiency"
+
+
+class MonetizationExport(ReportExport):
+    """
+    This class is responsible for exporting the Monetization Gap report
+    """
+
+    datatable_class = MonetizationDatatable
+    filename = "monetization"
+
+
+class KPIExport(ReportExport):
+    """
+    This class is responsible for exporting the KPI report
+    """
+
+    datatable_class = KPIDatatable
+    filename = "kpi"
+
+
+class ProjectRevenueExport(ReportExport):
+    """
+    This class is responsible for exporting the Project Revenue report
+    """
+
+    datatable_class = ProjectRevenueDatatable
+    filename = "project-revenue"
+
+
+class ResourceUtilisationExport(ReportExport):
+    """
+    This class is responsible for exporting the Resource Utilisation report
+    """
+
+    datatable_class = ResourceUtilisationDatatable
+    filename = "resource-utilisation"
@@ -0,0 +1,128 @@
+"""
+This module is responsible for streaming the rows of a report as a single
+sheet XLSX workbook. The zip archive of the workbook is written to the
+response while the rows are fetched, instead of being saved once all of them
+are in memory or in a temporary file
+"""
+import datetime
+import decimal
+import re
+import zipfile
+from xml.sax.saxutils import escape, quoteattr
+
+CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" '
+    'ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    "</Types>"
+)
+ROOT_RELATIONSHIPS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="xl/workbook.xml"/>'
+    "</Relationships>"
+)
+WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name={name} sheetId="1" r:id="rId1"/></sheets>'
+    "</workbook>"
+)
+WORKBOOK_RELATIONSHIPS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+    'Target="worksheets/sheet1.xml"/>'
+    "</Relationships>"
+)
+SHEET_START = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    "<sheetData>"
+)
+SHEET_END = "</sheetData></worksheet>"
+
+# The control characters which aren't allowed in the XML of a workbook
+ILLEGAL_CHARACTERS = re.compile(r"[\000-\010]|[\013-\014]|[\016-\037]")
+
+
+class ZipBuffer:
+    """
+    A write-only file-like object which keeps the written bytes until they
+    are taken, so that the zip archive can be streamed while it is written.
+    It can't tell its position, which makes the zip file write the sizes of
+    every member after its data
+    """
+
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data):
+        """
+        Keeps the given bytes until they are taken
+        """
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        """
+        The bytes are only flushed when they are taken
+        """
+
+    def take(self):
+        """
+        Returns the bytes written since the last call
+        """
+        data = b"".join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def render_cell(value):
+    """
+    Returns the XML of a cell, numbers are kept as numbers and every other
+    value is written as an inline string
+    """
+    if value is None:
+        return "<c/>"
+    if isinstance(value, bool):
+        return f'<c t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, (int, float, decimal.Decimal)):
+        return f"<c><v>{value}</v></c>"
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        value = value.isoformat()
+    text = escape(ILLEGAL_CHARACTERS.sub("", str(value)))
+    return f'<c t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+
+def stream_workbook(rows, sheet_name):
+    """
+    Yields the bytes of a workbook whose only sheet holds the given rows. The
+    bytes of a row are yielded as soon as the compressor releases them
+    """
+    buffer = ZipBuffer()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("[Content_Types].xml", CONTENT_TYPES)
+        archive.writestr("_rels/.rels", ROOT_RELATIONSHIPS)
+        archive.writestr("xl/workbook.xml", WORKBOOK.format(name=quoteattr(sheet_name[:31])))
+        archive.writestr("xl/_rels/workbook.xml.rels", WORKBOOK_RELATIONSHIPS)
+        with archive.open("xl/worksheets/sheet1.xml", "w", force_zip64=True) as sheet:
+            sheet.write(SHEET_START.encode())
+            for number, row in enumerate(rows, 1):
+                cells = "".join(render_cell(value) for value in row)
+                sheet.write(f'<row r="{number}">{cells}</row>'.encode())
+                data = buffer.take()
+                if data:
+                    yield data
+            sheet.write(SHEET_END.encode())
+    yield buffer.take()
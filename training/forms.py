@@ -222,20 +222,19 @@ class TraineeHolidayForm(forms.ModelForm):
         Raises a validation error.
         """
         id = self.data.get("id", None)  # pylint: disable=W0622
+        holiday = TraineeHoliday.objects.get(id=id) if id else None
+        batch_id = self.data.get("batch_id")
         if (
-            TraineeHoliday.objects.filter(
-                date_of_holiday=self.cleaned_data["date_of_holiday"],
-                batch_id=self.data.get("batch_id"),
-            )
-            .exclude(id=id)
-            .exists()
+            batch_id
+            and self.cleaned_data["date_of_holiday"]
+            in TraineeHoliday.objects.calendar(batch_id).holidays
+            and not (holiday and holiday.date_of_holiday == self.cleaned_data["date_of_holiday"])
         ):
             raise ValidationError(
                 "The date of holiday has already been taken.",
                 code="invalid_date",
             )
-        if id:
-            holiday = TraineeHoliday.objects.get(id=id)
+        if holiday:
             if (
                 holiday.date_of_holiday != self.cleaned_data["date_of_holiday"]
                 and self.cleaned_data["date_of_holiday"] < timezone.now().date()
@@ -392,11 +391,8 @@ class SubBatchForm(forms.ModelForm):
         and raises a validation error if it doesn't.
         """
         batch_start_date = models.Batch.objects.get(id=self.batch_id).start_date
-        if (
-            models.TraineeHoliday.objects.filter(
-                batch_id=self.batch_id, date_of_holiday=self.cleaned_data["start_date"]
-            ).exists()
-            or self.cleaned_data["start_date"].weekday() == 6
+        if models.TraineeHoliday.objects.calendar(self.batch_id).is_leave_day(
+            self.cleaned_data["start_date"]
         ):
             raise ValidationError(
                 "The Selected date falls on a holiday, please reconsider the start date",
@@ -0,0 +1,32 @@
+"""
+This module is responsible for the management command for refreshing the
+search mirror of the unmanaged hubble tables
+"""
+from django.core.management.base import BaseCommand
+
+from hubble.models import SearchMirror
+
+
+class Command(BaseCommand):
+    """
+    Creates a custom command for refreshing the search mirror
+    """
+
+    help = "Refreshes the search mirror from the users, teams and projects"
+
+    def add_arguments(self, parser):
+        """
+        This function is responsible for adding arguments to the command
+        """
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="Rebuild the whole mirror, dropping the rows which were hard deleted",
+        )
+
+    def handle(self, *args, **kwargs):
+        """
+        Refresh the mirror rows and report the number of rows written
+        """
+        written = SearchMirror.objects.refresh(full=kwargs["full"])
+        self.stdout.write(f"{written} mirror rows written")
@@ -2,7 +2,10 @@
 Django test cases for the create, delete and Datatables features in the
 SubBatchDetail module
 """
+from django.core.cache import cache
+from django.db import connection
 from django.db.models import Case, Value, When
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
 from model_bakery import baker
@@ -12,6 +15,7 @@ from core.base_test import BaseTestCase
 from core.constants import (
     ABOVE_AVERAGE,
     AVERAGE,
+    COUNT_STRATEGY_ESTIMATE,
     GOOD,
     MEET_EXPECTATION,
     NOT_YET_STARTED,
@@ -19,7 +23,8 @@ from core.constants import (
     TASK_TYPE_ASSESSMENT,
     USER_STATUS_INTERN,
 )
-from hubble.models import InternDetail, SubBatchTaskTimeline
+from hubble.models import InternDetail, SearchMirror, SubBatchTaskTimeline, User
+from training.views.sub_batch import SubBatchTraineesDataTable
 
 
 class AddInternTest(BaseTestCase):
@@ -350,6 +355,135 @@ class TraineeDatatableTest(BaseTestCase):
             self.assertTrue("no_of_retries" in row)
         self.assertEqual(response.json()["recordsTotal"], len(self.desired_output))
 
+    def test_keyset_pagination(self):
+        """
+        To makes sure that the next pages are fetched with a cursor instead of
+        an offset and that every trainee is listed once in the requested order
+        """
+        order = {
+            "columns[0][name]": "user",
+            "columns[0][searchable]": "true",
+            "columns[0][orderable]": "true",
+            "order[0][column]": 0,
+            "order[0][dir]": "desc",
+            "length": 3,
+        }
+        names = []
+        for start in (0, 3, 6):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.make_post_request(
+                    reverse(self.datatable_route_name),
+                    data=self.get_valid_inputs({**order, "start": start}),
+                )
+            self.assertEqual(response.json()["recordsTotal"], 7)
+            names += [row["user"] for row in response.json()["data"]]
+            page_query = [query["sql"] for query in queries if "LIMIT 3" in query["sql"]]
+            self.assertEqual(len(page_query), 1)
+            self.assertEqual("OFFSET" in page_query[0], False)
+        self.assertEqual(
+            names,
+            list(
+                InternDetail.objects.filter(sub_batch=self.sub_batch)
+                .order_by("-user__name", "pk")
+                .values_list("user__name", flat=True)
+            ),
+        )
+
+    def test_keyset_pagination_with_nulls(self):
+        """
+        To makes sure that the trainees without any score are listed along
+        with the others when the trainees are sorted by their average score,
+        in both directions
+        """
+        for direction, ordering in (("asc", "average_marks"), ("desc", "-average_marks")):
+            order = {
+                "columns[0][name]": "average_marks",
+                "columns[0][searchable]": "false",
+                "columns[0][orderable]": "true",
+                "order[0][column]": 0,
+                "order[0][dir]": direction,
+                "length": 3,
+            }
+            pks = []
+            for start in (0, 3, 6):
+                with CaptureQueriesContext(connection) as queries:
+                    response = self.make_post_request(
+                        reverse(self.datatable_route_name),
+                        data=self.get_valid_inputs({**order, "start": start}),
+                    )
+                pks += [int(row["pk"]) for row in response.json()["data"]]
+                page_query = [query["sql"] for query in queries if "LIMIT 3" in query["sql"]]
+                self.assertEqual("OFFSET" in page_query[0], False)
+            expected = list(self.desired_output.order_by(ordering, "pk"))
+            self.assertEqual(pks, [trainee.pk for trainee in expected])
+            self.assertIsNone(expected[-1 if direction == "asc" else 0].average_marks)
+
+    def test_cached_count(self):
+        """
+        To makes sure that the total count is cached per sub-batch, that the
+        filtered count only runs while searching and that the cached total
+        moves along with the trainees
+        """
+        url = reverse(self.datatable_route_name)
+        self.make_post_request(url, data=self.get_valid_inputs())
+        with CaptureQueriesContext(connection) as queries:
+            response = self.make_post_request(url, data=self.get_valid_inputs({"draw": 2}))
+        self.assertFalse(
+            any(
+                query["sql"].startswith("SELECT COUNT(*)")
+                and InternDetail._meta.db_table in query["sql"]
+                for query in queries
+            )
+        )
+        self.assertEqual(response.json()["recordsTotal"], 7)
+        self.assertEqual(response.json()["recordsFiltered"], 7)
+
+        response = self.make_post_request(
+            url, data=self.get_valid_inputs({"search[value]": self.name + "1"})
+        )
+        self.assertEqual(response.json()["recordsTotal"], 7)
+        self.assertEqual(
+            response.json()["recordsFiltered"],
+            InternDetail.objects.filter(
+                sub_batch=self.sub_batch, user__name__icontains=self.name + "1"
+            ).count(),
+        )
+
+        baker.make(
+            "hubble.InternDetail",
+            sub_batch_id=self.sub_batch.id,
+            _fill_optional=["expected_completion"],
+        )
+        response = self.make_post_request(url, data=self.get_valid_inputs())
+        self.assertEqual(response.json()["recordsTotal"], 8)
+
+    def test_estimated_count(self):
+        """
+        To makes sure that the planner estimate is used as the total count
+        above the threshold, and the exact count below it
+        """
+        url = reverse(self.datatable_route_name)
+        count_strategy = SubBatchTraineesDataTable.count_strategy
+        SubBatchTraineesDataTable.count_strategy = COUNT_STRATEGY_ESTIMATE
+        try:
+            response = self.make_post_request(url, data=self.get_valid_inputs())
+            self.assertEqual(response.json()["recordsTotal"], 7)
+            SubBatchTraineesDataTable.estimate_count_threshold = 0
+            response = self.make_post_request(
+                url, data=self.get_valid_inputs({"sub_batch": self.another_sub_batch.id})
+            )
+            self.assertEqual(
+                response.json()["recordsTotal"],
+                SubBatchTraineesDataTable.estimate_count(
+                    InternDetail.objects.get_performance_summary(
+                        self.another_sub_batch.id, 1
+                    ).order_by()
+                ),
+            )
+        finally:
+            SubBatchTraineesDataTable.count_strategy = count_strategy
+            del SubBatchTraineesDataTable.estimate_count_threshold
+
     def test_database_search(self):
         """
         To check what happens when search value is given
@@ -365,6 +499,47 @@ class TraineeDatatableTest(BaseTestCase):
             InternDetail.objects.filter(user__name__icontains=search_value).count(),
         )
 
+    def test_mirror_search(self):
+        """
+        To makes sure that the trainee names are searched through the search
+        mirror and that every term of a multi-term search is matched
+        """
+        SearchMirror.objects.refresh()
+        search_value = f"{self.name}1 + {self.name}2"
+        with CaptureQueriesContext(connection) as queries:
+            response = self.make_post_request(
+                reverse(self.datatable_route_name),
+                data=self.get_valid_inputs({"search[value]": search_value}),
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["recordsFiltered"], 2)
+        self.assertTrue(
+            any(
+                '"search_mirror"' in query["sql"] and "intern_details" in query["sql"]
+                for query in queries
+            )
+        )
+        self.assertEqual(SearchMirror.objects.filter(source="users").count(), User.objects.count())
+
+    def test_stale_mirror_search(self):
+        """
+        To makes sure that the search doesn't refresh the mirror and falls back
+        to the source column while the mirror is behind
+        """
+        SearchMirror.objects.refresh()
+        User.objects.filter(name=f"{self.name}1").update(
+            name=f"{self.name}9", updated_at=timezone.now()
+        )
+        cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.make_post_request(
+                reverse(self.datatable_route_name),
+                data=self.get_valid_inputs({"search[value]": f"{self.name}9"}),
+            )
+        self.assertEqual(response.json()["recordsFiltered"], 1)
+        self.assertFalse(any('"search_mirror"' in query["sql"] for query in queries))
+        self.assertFalse(SearchMirror.objects.filter(value=f"{self.name}9").exists())
+
     def test_performance_report(self):
         """
         To ensure that the received performance reports are valid
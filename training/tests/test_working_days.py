@@ -0,0 +1,376 @@
+"""
+Django test cases for the working day calendar of the timeline scheduling
+"""
+import datetime
+import random
+
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from model_bakery import baker
+
+from core.base_test import BaseTestCase
+from core.utils import (
+    calculate_duration_for_task,
+    reschedule_timelines_for_batch,
+    schedule_timeline_for_sub_batch,
+)
+from core.working_days import WorkingDayCalendar
+from hubble.models import InternDetail, SubBatchTaskTimeline, TraineeHoliday
+from training.forms import TraineeHolidayForm
+
+
+def walk_duration_for_task(holidays, start_date, is_half_day, number_of_days):
+    """
+    The day by day walk through the calendar which the working day calendar
+    replaces, kept as the reference of the schedules
+    """
+
+    def is_leave_day(day):
+        return (day.date() in holidays) or (day.date().weekday() == 6)
+
+    if start_date.time() == datetime.time(hour=18, minute=0):
+        start_date += datetime.timedelta(1)
+        start_date = start_date.replace(hour=9, minute=0)
+    while is_leave_day(start_date):
+        start_date += datetime.timedelta(1)
+    start_date_time = datetime.datetime.combine(
+        start_date, datetime.time(hour=14 if is_half_day else 9, minute=0)
+    )
+    having_half_day_at_end = False
+    end_time = datetime.time(hour=18, minute=0)
+    if (not is_half_day and (number_of_days % 1 == 0.5)) or (
+        is_half_day and (number_of_days % 1 != 0.5)
+    ):
+        having_half_day_at_end = True
+        end_time = datetime.time(hour=13, minute=0)
+    total_num_days = 0
+    if is_half_day:
+        total_num_days += 0.5
+        end_date = start_date
+        start_date += datetime.timedelta(1)
+    while total_num_days != number_of_days:
+        if is_leave_day(start_date):
+            start_date += datetime.timedelta(1)
+            continue
+        if number_of_days - total_num_days == 0.5:
+            total_num_days += 0.5
+            end_date = start_date
+            continue
+        total_num_days += 1
+        end_date = start_date
+        start_date += datetime.timedelta(1)
+    return {
+        "start_date_time": start_date_time,
+        "end_date_time": datetime.datetime.combine(end_date, end_time),
+        "ends_afternoon": having_half_day_at_end,
+    }
+
+
+class WorkingDayCalendarTest(BaseTestCase):
+    """
+    This class is responsible for testing the schedules of the working day calendar
+    """
+
+    def test_same_schedule_as_walk(self):
+        """
+        To makes sure that the schedules of random timelines are identical to
+        the day by day walk through the calendar
+        """
+        randomizer = random.Random(7)
+        first_day = datetime.date(2023, 1, 1)
+        for _ in range(50):
+            holidays = [
+                first_day + datetime.timedelta(randomizer.randrange(120))
+                for _ in range(randomizer.randrange(30))
+            ]
+            calendar = WorkingDayCalendar(holidays)
+            start_date = datetime.datetime.combine(
+                first_day + datetime.timedelta(randomizer.randrange(30)),
+                datetime.time(hour=randomizer.choice([0, 9, 13, 18])),
+            )
+            is_half_day = False
+            for _ in range(8):
+                days = randomizer.randint(1, 12) / 2
+                expected = walk_duration_for_task(holidays, start_date, is_half_day, days)
+                values = calculate_duration_for_task(
+                    holidays, start_date, is_half_day, days, calendar
+                )
+                self.assertEqual(values, expected)
+                start_date = values["end_date_time"]
+                is_half_day = values["ends_afternoon"]
+
+    def test_invalid_days(self):
+        """
+        To makes sure that a number of days which isn't a positive multiple
+        of 0.5 is refused instead of never ending
+        """
+        calendar = WorkingDayCalendar([])
+        with self.assertRaises(ValueError):
+            calendar.schedule(datetime.datetime(2023, 5, 2), False, 0)
+        with self.assertRaises(ValueError):
+            calendar.schedule(datetime.datetime(2023, 5, 2), True, 1.3)
+
+    def test_working_day(self):
+        """
+        To makes sure that Sundays and holidays are skipped
+        """
+        calendar = WorkingDayCalendar([datetime.date(2023, 5, 8)])
+        # 2023-05-06 is a Saturday, followed by a Sunday and a holiday
+        self.assertEqual(
+            calendar.working_day(datetime.date(2023, 5, 6), 1), datetime.date(2023, 5, 9)
+        )
+        self.assertEqual(
+            calendar.working_day(datetime.date(2023, 5, 7)), datetime.date(2023, 5, 9)
+        )
+
+
+class ScheduleTimelineTest(BaseTestCase):
+    """
+    This class is responsible for testing the bulk writes of the sub batch schedules
+    """
+
+    def setUp(self):
+        """
+        This function will run before every test and makes sure required data are ready
+        """
+        super().setUp()
+        self.user = baker.make("hubble.User")
+        timeline = baker.make("hubble.Timeline")
+        for order, days in enumerate([2, 1.5, 3], start=1):
+            baker.make("hubble.TimelineTask", timeline=timeline, days=days, order=order)
+        # 2023-05-01 is a Monday
+        self.sub_batch = baker.make(
+            "hubble.SubBatch", timeline=timeline, start_date=datetime.date(2023, 5, 1)
+        )
+        self.intern = baker.make("hubble.InternDetail", sub_batch=self.sub_batch)
+
+    def test_create(self):
+        """
+        To makes sure that the tasks of the template are created in order with
+        their schedule and the expected completion of the interns
+        """
+        end_date = schedule_timeline_for_sub_batch(self.sub_batch, self.user)
+        tasks = list(SubBatchTaskTimeline.objects.filter(sub_batch=self.sub_batch))
+        self.assertEqual([task.order for task in tasks], [1, 2, 3])
+        self.assertEqual(tasks[0].start_date, datetime.datetime(2023, 5, 1, 9))
+        self.assertEqual(tasks[1].start_date, datetime.datetime(2023, 5, 3, 9))
+        self.assertEqual(tasks[2].start_date, datetime.datetime(2023, 5, 4, 14))
+        self.assertEqual(end_date, datetime.datetime(2023, 5, 8, 13))
+        self.assertEqual(
+            InternDetail.objects.get(id=self.intern.id).expected_completion, end_date.date()
+        )
+
+    def test_reschedule_writes_changed_tasks(self):
+        """
+        To makes sure that a reschedule only updates the tasks whose dates
+        have changed, with a single update query
+        """
+        schedule_timeline_for_sub_batch(self.sub_batch, self.user)
+        first, second, third = SubBatchTaskTimeline.objects.filter(sub_batch=self.sub_batch)
+        SubBatchTaskTimeline.objects.filter(id=third.id).update(days=1)
+
+        with CaptureQueriesContext(connection) as captured:
+            end_date = schedule_timeline_for_sub_batch(self.sub_batch, is_create=False)
+        updates = [
+            query["sql"]
+            for query in captured.captured_queries
+            if query["sql"].startswith(f'UPDATE "{SubBatchTaskTimeline._meta.db_table}"')
+        ]
+        self.assertEqual(len(updates), 1)
+        self.assertIn(str(third.id), updates[0])
+        self.assertEqual(end_date, datetime.datetime(2023, 5, 5, 13))
+        for task in (first, second):
+            self.assertEqual(
+                SubBatchTaskTimeline.objects.get(id=task.id).updated_at, task.updated_at
+            )
+        self.assertEqual(
+            InternDetail.objects.get(id=self.intern.id).expected_completion, end_date.date()
+        )
+
+    def test_reschedule_without_changes(self):
+        """
+        To makes sure that a reschedule of an unchanged timeline doesn't update any task
+        """
+        schedule_timeline_for_sub_batch(self.sub_batch, self.user)
+        with CaptureQueriesContext(connection) as captured:
+            schedule_timeline_for_sub_batch(self.sub_batch, is_create=False)
+        self.assertFalse(
+            any(
+                query["sql"].startswith(f'UPDATE "{SubBatchTaskTimeline._meta.db_table}"')
+                for query in captured.captured_queries
+            )
+        )
+
+    def test_reschedule_from_order(self):
+        """
+        To makes sure that a reschedule from an order resumes from the end of
+        the preceding task and gives the same schedule as a full reschedule
+        """
+        schedule_timeline_for_sub_batch(self.sub_batch, self.user)
+        SubBatchTaskTimeline.objects.filter(sub_batch=self.sub_batch, order=3).update(days=4.5)
+        end_date = schedule_timeline_for_sub_batch(self.sub_batch, is_create=False, from_order=3)
+        partial = list(
+            SubBatchTaskTimeline.objects.filter(sub_batch=self.sub_batch).values_list(
+                "start_date", "end_date"
+            )
+        )
+        SubBatchTaskTimeline.objects.filter(sub_batch=self.sub_batch).update(
+            start_date=datetime.datetime(2023, 1, 1), end_date=datetime.datetime(2023, 1, 1)
+        )
+        self.assertEqual(
+            schedule_timeline_for_sub_batch(self.sub_batch, is_create=False), end_date
+        )
+        self.assertEqual(
+            list(
+                SubBatchTaskTimeline.objects.filter(sub_batch=self.sub_batch).values_list(
+                    "start_date", "end_date"
+                )
+            ),
+            partial,
+        )
+
+    def test_reschedule_after_last_task(self):
+        """
+        To makes sure that the expected completion moves to the end of the
+        preceding task when no task follows the order
+        """
+        schedule_timeline_for_sub_batch(self.sub_batch, self.user)
+        SubBatchTaskTimeline.objects.filter(sub_batch=self.sub_batch, order=3).delete()
+        end_date = schedule_timeline_for_sub_batch(self.sub_batch, is_create=False, from_order=3)
+        self.assertEqual(end_date, datetime.datetime(2023, 5, 4, 13))
+        self.assertEqual(
+            InternDetail.objects.get(id=self.intern.id).expected_completion, end_date.date()
+        )
+
+    def test_reschedule_from_unscheduled_task(self):
+        """
+        To makes sure that a reschedule from an order schedules the whole
+        timeline when the preceding task has never been scheduled
+        """
+        schedule_timeline_for_sub_batch(self.sub_batch, self.user)
+        SubBatchTaskTimeline.objects.filter(sub_batch=self.sub_batch).update(
+            start_date=None, end_date=None
+        )
+        end_date = schedule_timeline_for_sub_batch(self.sub_batch, is_create=False, from_order=3)
+        self.assertEqual(end_date, datetime.datetime(2023, 5, 8, 13))
+        self.assertEqual(
+            SubBatchTaskTimeline.objects.get(sub_batch=self.sub_batch, order=1).start_date,
+            datetime.datetime(2023, 5, 1, 9),
+        )
+
+    def test_reschedule_batch(self):
+        """
+        To makes sure that a holiday reschedules every sub batch of the batch
+        and reports the shifted end dates
+        """
+        schedule_timeline_for_sub_batch(self.sub_batch, self.user)
+        other_sub_batch = baker.make(
+            "hubble.SubBatch",
+            batch=self.sub_batch.batch,
+            timeline=self.sub_batch.timeline,
+            start_date=datetime.date(2023, 6, 5),
+        )
+        schedule_timeline_for_sub_batch(other_sub_batch, self.user)
+        baker.make(
+            "hubble.TraineeHoliday",
+            batch=self.sub_batch.batch,
+            date_of_holiday=datetime.date(2023, 5, 2),
+        )
+
+        summary = reschedule_timelines_for_batch(self.sub_batch.batch_id)
+        self.assertEqual(
+            summary[self.sub_batch.id],
+            {
+                "previous_end_date": datetime.datetime(2023, 5, 8, 13),
+                "end_date": datetime.datetime(2023, 5, 9, 13),
+                "shifted": True,
+            },
+        )
+        self.assertFalse(summary[other_sub_batch.id]["shifted"])
+        self.assertEqual(
+            InternDetail.objects.get(id=self.intern.id).expected_completion,
+            datetime.date(2023, 5, 9),
+        )
+        self.assertEqual(
+            SubBatchTaskTimeline.objects.filter(sub_batch=self.sub_batch).last().end_date,
+            datetime.datetime(2023, 5, 9, 13),
+        )
+
+
+class HolidayCalendarTest(BaseTestCase):
+    """
+    This class is responsible for testing the cached holiday calendar of the batches
+    """
+
+    def setUp(self):
+        """
+        This function will run before every test and makes sure required data are ready
+        """
+        super().setUp()
+        self.batch = baker.make("hubble.Batch")
+        self.holiday = baker.make(
+            "hubble.TraineeHoliday", batch=self.batch, date_of_holiday=datetime.date(2023, 5, 2)
+        )
+
+    def test_cached_calendar(self):
+        """
+        To makes sure that the calendar of a batch is queried once and survives the cache
+        """
+        self.assertEqual(
+            TraineeHoliday.objects.calendar(self.batch.id).holidays,
+            frozenset([datetime.date(2023, 5, 2)]),
+        )
+        with self.assertNumQueries(0):
+            calendar = TraineeHoliday.objects.calendar(self.batch.id)
+        self.assertEqual(
+            calendar.working_day(datetime.date(2023, 5, 2)), datetime.date(2023, 5, 3)
+        )
+
+    def test_invalidation(self):
+        """
+        To makes sure that saving, soft deleting, bulk creating and bulk
+        deleting a holiday moves the calendar of its batch on
+        """
+        TraineeHoliday.objects.calendar(self.batch.id)
+        self.holiday.date_of_holiday = datetime.date(2023, 5, 4)
+        self.holiday.save()
+        self.assertEqual(
+            TraineeHoliday.objects.calendar(self.batch.id).holidays,
+            frozenset([datetime.date(2023, 5, 4)]),
+        )
+        self.holiday.delete()
+        self.assertEqual(TraineeHoliday.objects.calendar(self.batch.id).holidays, frozenset())
+
+        TraineeHoliday.objects.bulk_create(
+            [
+                baker.prepare(
+                    "hubble.TraineeHoliday",
+                    batch=self.batch,
+                    date_of_holiday=datetime.date(2023, 5, 5),
+                    updated_by=self.holiday.updated_by,
+                )
+            ]
+        )
+        self.assertEqual(
+            TraineeHoliday.objects.calendar(self.batch.id).holidays,
+            frozenset([datetime.date(2023, 5, 5)]),
+        )
+        TraineeHoliday.bulk_delete({"batch_id": self.batch.id})
+        self.assertEqual(TraineeHoliday.objects.calendar(self.batch.id).holidays, frozenset())
+
+    def test_form_reads_calendar(self):
+        """
+        To makes sure that the trainee holiday form checks a taken date against
+        the cached calendar of the batch instead of querying the holidays
+        """
+        TraineeHoliday.objects.calendar(self.batch.id)
+        form = TraineeHolidayForm(
+            data={"batch_id": self.batch.id, "date_of_holiday": self.holiday.date_of_holiday}
+        )
+        form.cleaned_data = {"date_of_holiday": self.holiday.date_of_holiday}
+        with self.assertNumQueries(0):
+            with self.assertRaisesMessage(
+                ValidationError, "The date of holiday has already been taken."
+            ):
+                form.clean_date_of_holiday()
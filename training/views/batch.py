@@ -38,6 +38,7 @@ class BatchDataTable(LoginRequiredMixin, CustomDatatable):
     """
 
     model = Batch
+    search_value_seperator = "+"
 
     column_defs = [
         {"name": "id", "visible": False, "searchable": False},
@@ -8,7 +8,7 @@ import numpy as np
 import pandas as pd
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.db.models import Case, Count, Q, Value, When
+from django.db.models import Case, Count, Max, Q, Value, When
 from django.db.models.functions import Coalesce
 from django.http import JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
@@ -20,6 +20,7 @@ from core import template_utils
 from core.constants import (
     ABOVE_AVERAGE,
     AVERAGE,
+    COUNT_STRATEGY_CACHED,
     GOOD,
     MEET_EXPECTATION,
     NOT_YET_STARTED,
@@ -328,6 +329,9 @@ class SubBatchTraineesDataTable(LoginRequiredMixin, CustomDatatable):
     """
 
     model = InternDetail
+    search_value_seperator = "+"
+    keyset_pagination = True
+    count_strategy = COUNT_STRATEGY_CACHED
 
     column_defs = [
         {"name": "pk", "visible": False, "searchable": False},
@@ -408,6 +412,15 @@ class SubBatchTraineesDataTable(LoginRequiredMixin, CustomDatatable):
         request.trainee_performance = query
         return query
 
+    def get_count_version(self):
+        """
+        The grouped performance summary has a row per trainee, so its cached
+        total count is versioned by the plain trainee rows of the sub-batch
+        """
+        return InternDetail.objects.filter(
+            sub_batch_id=self.request.POST.get("sub_batch")
+        ).aggregate(count=Count("id"), updated_at=Max("updated_at"))
+
     def customize_row(self, row, obj):
         """
         The function customize_row customizes a row in a table by adding buttons and formatting the
@@ -119,7 +119,9 @@ def create_sub_batch_timeline(request, pk):
                     order += 1
                     task.order = order
                     task.save()
-            schedule_timeline_for_sub_batch(sub_batch, is_create=False)
+            schedule_timeline_for_sub_batch(
+                sub_batch, is_create=False, from_order=timeline_task.order
+            )
             response_data["status"] = "success"
         else:
             field_errors = form.errors.as_json()
@@ -164,7 +166,9 @@ def update_sub_batch_timeline(request, pk):
                 timeline_task.sub_batch = sub_batch
                 timeline_task.created_by = request.user
             form.save()
-            schedule_timeline_for_sub_batch(sub_batch=sub_batch, is_create=False)
+            schedule_timeline_for_sub_batch(
+                sub_batch=sub_batch, is_create=False, from_order=current_task.order
+            )
             return JsonResponse({"status": "success"})
         field_errors = form.errors.as_json()
         non_field_errors = form.non_field_errors().as_json()
@@ -198,12 +202,18 @@ def update_task_sequence(request):
     if check_valid_tasks == len(task_order):
         sub_batch_task = SubBatchTaskTimeline.objects.get(id=task_order[0])
         order = 0
+        first_moved_order = None  # The schedule is kept up to the first moved task
         for task_id in task_order:
             task = SubBatchTaskTimeline.objects.get(id=task_id)
             order += 1
-            task.order = order
-            task.save()
-        schedule_timeline_for_sub_batch(sub_batch_task.sub_batch, is_create=False)
+            if task.order != order:
+                first_moved_order = first_moved_order or order
+                task.order = order
+                task.save()
+        if first_moved_order:
+            schedule_timeline_for_sub_batch(
+                sub_batch_task.sub_batch, is_create=False, from_order=first_moved_order
+            )
         return JsonResponse({"status": "success"})
     return JsonResponse(
         {
@@ -240,7 +250,9 @@ def delete_sub_batch_timeline(request, pk):  # pylint: disable=unused-argument
                     order += 1
                     task.order = order
                     task.save()
-                schedule_timeline_for_sub_batch(sub_batch=sub_batch, is_create=False)
+                schedule_timeline_for_sub_batch(
+                    sub_batch=sub_batch, is_create=False, from_order=timeline.order
+                )
                 return JsonResponse({"message": "Task deleted succcessfully"})
             return JsonResponse(
                 {
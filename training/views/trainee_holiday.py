@@ -18,9 +18,9 @@ from core import template_utils
 from core.utils import (
     CustomDatatable,
     ValidateAuthorizationMixin,
-    schedule_timeline_for_sub_batch,
+    reschedule_timelines_for_batch,
 )
-from hubble.models import Batch, SubBatch, TraineeHoliday
+from hubble.models import Batch, TraineeHoliday
 from training.forms import TraineeHolidayForm
 
 
@@ -120,9 +120,7 @@ class TraineeHolidayCreateView(LoginRequiredMixin, ValidateAuthorizationMixin, V
             holiday.batch_id = pk
             holiday.updated_by_id = request.user.id
             holiday.save()
-            sub_batches = SubBatch.objects.filter(batch_id=pk)
-            for sub_batch in sub_batches:
-                schedule_timeline_for_sub_batch(sub_batch, is_create=False)
+            reschedule_timelines_for_batch(pk)
             return JsonResponse({"status": "success"})
         field_errors = form.errors.as_json()
         non_field_errors = form.non_field_errors().as_json()
@@ -179,9 +177,7 @@ class TraineeHolidayUpdateView(LoginRequiredMixin, ValidateAuthorizationMixin, V
             holiday = form.save(commit=False)
             holiday.updated_by_id = request.user.id
             holiday.save()
-            sub_batches = SubBatch.objects.filter(batch_id=trainee_holiday.batch_id)
-            for sub_batch in sub_batches:
-                schedule_timeline_for_sub_batch(sub_batch, is_create=False)
+            reschedule_timelines_for_batch(trainee_holiday.batch_id)
             return JsonResponse({"status": "success"})
         field_errors = form.errors.as_json()
         non_field_errors = form.non_field_errors().as_json()
@@ -216,9 +212,7 @@ class TraineeHolidayDeleteView(LoginRequiredMixin, ValidateAuthorizationMixin, V
         try:
             trainee_holiday = get_object_or_404(TraineeHoliday, id=pk)
             trainee_holiday.delete()
-            sub_batches = SubBatch.objects.filter(batch_id=trainee_holiday.batch_id)
-            for sub_batch in sub_batches:
-                schedule_timeline_for_sub_batch(sub_batch, is_create=False)
+            reschedule_timelines_for_batch(trainee_holiday.batch_id)
             return JsonResponse({"message": "Holiday deleted succcessfully"})
         except Exception as exception:
             logging.error(